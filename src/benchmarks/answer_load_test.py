@@ -0,0 +1,69 @@
+"""
+Load test /index/answer at increasing request concurrency. With the async LLM
+clients, throughput should scale with concurrency instead of serializing on
+each LLM call.
+
+    python -m benchmarks.mock_openai_server --latency-ms 200 &
+    OPENAI_API_URL=http://127.0.0.1:8090/v1 GENERATION_BACKEND=OPENAI EMBEDDING_BACKEND=OPENAI \\
+        uvicorn main:app --port 5000 &
+    python -m benchmarks.answer_load_test --project-id 1 --requests 200 --concurrency 1 8 32
+
+The project must already be indexed so that retrieval returns documents.
+"""
+import argparse
+import asyncio
+import httpx
+import time
+
+
+async def run(client: httpx.AsyncClient, url: str, total_requests: int, concurrency: int, query: str):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def send():
+        nonlocal failures
+        async with semaphore:
+            started_at = time.perf_counter()
+            response = await client.post(url, json={"text": query, "limit": 5})
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code != 200:
+                failures += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[send() for _ in range(total_requests)])
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "rps": total_requests / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "failures": failures,
+    }
+
+
+async def main(base_url: str, project_id: int, total_requests: int, concurrency_levels: list, query: str):
+    url = f"{base_url}/api/v1/nlp/index/answer/{project_id}"
+    limits = httpx.Limits(max_connections=max(concurrency_levels))
+
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        baseline = None
+        for concurrency in concurrency_levels:
+            result = await run(client, url, total_requests, concurrency, query)
+            baseline = baseline or result["rps"]
+            print(f"concurrency={concurrency:>3}: {result['rps']:.1f} req/s ({result['rps'] / baseline:.1f}x) "
+                  f"p50={result['p50'] * 1000:.0f}ms p95={result['p95'] * 1000:.0f}ms "
+                  f"failures={result['failures']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--project-id", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--query", default="How do I reset my password?")
+    args = parser.parse_args()
+
+    asyncio.run(main(base_url=args.base_url, project_id=args.project_id, total_requests=args.requests,
+                     concurrency_levels=args.concurrency, query=args.query))
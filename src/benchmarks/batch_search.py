@@ -0,0 +1,96 @@
+"""
+Compare sequential search_by_vector calls with one search_many call for a
+batch of queries on the configured vector DB backend.
+
+    python -m benchmarks.batch_search --rows 50000 --queries 1000 --limit 10
+
+Random unit vectors of EMBEDDING_MODEL_SIZE are written to a throwaway
+collection (the ANN index is built before timing) and the same query batch
+is searched both ways. Only the vector DB side is timed: the batch endpoint
+also replaces one embedding call per query with one call per
+SEARCH_BATCH_EMBEDDING_SIZE queries. The collection is dropped at the end.
+"""
+from helpers.config import get_settings
+from stores.vectordb.VectorDBEnums import VectorDBEnums
+from stores.vectordb.VectorDBProviderInterface import VectorDBProviderInterface
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+import numpy as np
+import argparse
+import asyncio
+import time
+
+BENCH_COLLECTION_NAME = "bench_batch_search"
+
+
+def generate_vectors(rng, rows: int, dim: int) -> list:
+    vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).tolist()
+
+
+async def main(rows: int, queries: int, limit: int, batch_size: int):
+    settings = get_settings()
+    provider = settings.VECTOR_DB_BACKEND
+    dim = settings.EMBEDDING_MODEL_SIZE
+    rng = np.random.default_rng(0)
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    vectordb_client = VectorDBProviderInterface(config=settings, db_client=db_client).create(provider=provider)
+    await vectordb_client.connect()
+
+    try:
+        await vectordb_client.create_collection(collection_name=BENCH_COLLECTION_NAME,
+                                                embedding_size=dim, do_reset=True)
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            # pgvector record ids reference chunks, leave them empty there
+            record_ids = ([None] * count if provider == VectorDBEnums.PGVECTOR.value
+                          else list(range(start, start + count)))
+            await vectordb_client.insert_many(collection_name=BENCH_COLLECTION_NAME,
+                                              texts=[f"row {row}" for row in range(start, start + count)],
+                                              vectors=generate_vectors(rng, count, dim),
+                                              record_ids=record_ids, batch_size=count)
+        await vectordb_client.end_bulk_ingest(collection_name=BENCH_COLLECTION_NAME)
+
+        query_vectors = generate_vectors(rng, queries, dim)
+
+        started_at = time.perf_counter()
+        sequential = [
+            await vectordb_client.search_by_vector(collection_name=BENCH_COLLECTION_NAME,
+                                                   vector=vector, limit=limit)
+            for vector in query_vectors
+        ]
+        sequential_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        batched = await vectordb_client.search_many(collection_name=BENCH_COLLECTION_NAME,
+                                                    vectors=query_vectors, limit=limit)
+        batched_elapsed = time.perf_counter() - started_at
+
+        same_order = sum(
+            [doc.text for doc in (single or [])] == [doc.text for doc in many]
+            for single, many in zip(sequential, batched)
+        )
+        print(f"{provider}: {rows} rows x {dim}, {queries} queries, top {limit}")
+        print(f"sequential: {sequential_elapsed:.2f}s -> {queries / sequential_elapsed:,.1f} queries/sec")
+        print(f"   batched: {batched_elapsed:.2f}s -> {queries / batched_elapsed:,.1f} queries/sec "
+              f"({sequential_elapsed / batched_elapsed:.1f}x)")
+        print(f"identical results for {same_order} of {queries} queries")
+    finally:
+        await vectordb_client.delete_collection(collection_name=BENCH_COLLECTION_NAME)
+        await vectordb_client.disconnect()
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, queries=args.queries, limit=args.limit, batch_size=args.batch_size))
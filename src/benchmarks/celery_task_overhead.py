@@ -0,0 +1,37 @@
+"""
+Measure fixed per-task overhead of the Celery workers by enqueueing many
+tiny tasks (clean_celery_executation_table) and timing them end to end.
+
+    python -m celery -A celery_app.celery_app worker --queues=default --concurrency=2 &
+    python -m benchmarks.celery_task_overhead --tasks 200
+
+Each task borrows the worker's shared engine, LLM clients and vector DB
+client, so after the first task per process the runtime is the cleanup
+query itself rather than connection setup.
+"""
+from celery import group # pyright: ignore[reportMissingImports]
+from tasks.maintenance import clean_celery_executation_table
+import argparse
+import time
+
+
+def main(total_tasks: int, timeout: float):
+    # Warm up every worker process so startup is not part of the measurement
+    clean_celery_executation_table.apply_async().get(timeout=timeout)
+
+    started_at = time.perf_counter()
+    result = group(clean_celery_executation_table.s() for _ in range(total_tasks)).apply_async()
+    result.get(timeout=timeout)
+    elapsed = time.perf_counter() - started_at
+
+    print(f"{total_tasks} tasks in {elapsed:.2f}s -> {total_tasks / elapsed:.1f} tasks/sec, "
+          f"{elapsed / total_tasks * 1000:.1f}ms per task (end to end)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    main(total_tasks=args.tasks, timeout=args.timeout)
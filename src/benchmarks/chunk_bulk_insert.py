@@ -0,0 +1,114 @@
+"""
+Measure chunk insert throughput of ChunkModel.insert_many_chunks against the
+previous ORM unit-of-work path (session.add_all).
+
+    python -m benchmarks.chunk_bulk_insert --chunks 1000000 --orm-chunks 50000
+
+Runs against the Postgres configured in .env under a throwaway project and
+asset which are removed at the end. The ORM path is timed on --orm-chunks
+only, it takes too long for a full million.
+"""
+from helpers.config import get_settings
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.ChunkModel import ChunkModel
+from models.db_schemas import Asset, DataChunk, Project
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+import argparse
+import asyncio
+import time
+
+BENCH_PROJECT_ID = 987654321
+CHUNK_TEXT = "The Nile is a major north-flowing river in northeastern Africa. " * 8
+
+
+def generate_chunks(count: int, asset_id: int):
+    # A generator, insert_many_chunks only holds one batch of rows at a time
+    for i in range(count):
+        yield DataChunk(
+            chunk_text=CHUNK_TEXT,
+            chunk_metadata={"page": i // 20},
+            chunk_order=i + 1,
+            chunk_project_id=BENCH_PROJECT_ID,
+            chunk_asset_id=asset_id
+        )
+
+
+async def run_orm(db_client, count: int, asset_id: int, batch_size: int):
+    started_at = time.perf_counter()
+    async with db_client() as session:
+        async with session.begin():
+            batch = []
+            for chunk in generate_chunks(count, asset_id):
+                batch.append(chunk)
+                if len(batch) == batch_size:
+                    session.add_all(batch)
+                    await session.flush()
+                    batch = []
+            if batch:
+                session.add_all(batch)
+    return time.perf_counter() - started_at
+
+
+async def run_bulk(chunk_model: ChunkModel, count: int, asset_id: int, batch_size: int):
+    started_at = time.perf_counter()
+    inserted = await chunk_model.insert_many_chunks(chunks=generate_chunks(count, asset_id),
+                                                    batch_size=batch_size)
+    assert inserted == count
+    return time.perf_counter() - started_at
+
+
+async def main(chunks: int, orm_chunks: int, batch_size: int):
+    settings = get_settings()
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    project_model = await ProjectModel.create_instance(db_client=db_client)
+    asset_model = await AssetModel.create_instance(db_client=db_client)
+    chunk_model = await ChunkModel.create_instance(db_client=db_client)
+
+    project = await project_model.get_project_or_create_one(project_id=BENCH_PROJECT_ID)
+    asset = await asset_model.create_asset(asset=Asset(
+        asset_project_id=project.project_id,
+        asset_type=AssetTypeEnum.File.value,
+        asset_name="bench_chunk_bulk_insert.txt",
+        asset_size=0
+    ))
+
+    try:
+        orm_rate = None
+        if orm_chunks:
+            elapsed = await run_orm(db_client, orm_chunks, asset.asset_id, batch_size)
+            orm_rate = orm_chunks / elapsed
+            print(f"   orm: {orm_chunks} chunks in {elapsed:.2f}s -> {orm_rate:,.0f} chunks/sec")
+            await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
+
+        elapsed = await run_bulk(chunk_model, chunks, asset.asset_id, batch_size)
+        bulk_rate = chunks / elapsed
+        print(f"  bulk: {chunks} chunks in {elapsed:.2f}s -> {bulk_rate:,.0f} chunks/sec")
+
+        if orm_rate:
+            print(f"speedup: {bulk_rate / orm_rate:.1f}x")
+    finally:
+        await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
+        async with db_client() as session:
+            async with session.begin():
+                await session.execute(delete(Asset).where(Asset.asset_project_id == project.project_id))
+                await session.execute(delete(Project).where(Project.project_id == project.project_id))
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=1000000)
+    parser.add_argument("--orm-chunks", type=int, default=50000,
+                        help="chunks timed through the ORM path, 0 to skip it")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(chunks=args.chunks, orm_chunks=args.orm_chunks, batch_size=args.batch_size))
@@ -0,0 +1,72 @@
+"""
+Measure load+split throughput of project files across process pool sizes.
+
+    python -m benchmarks.file_processing --files 200 --pages 20 --workers 1 2 4 8
+
+Generates synthetic PDFs under a throwaway project folder, runs
+load_and_split_file over all of them on a ProcessPoolExecutor of each size,
+and removes the folder at the end.
+"""
+from controllers.ProjectController import ProjectController
+from controllers.ProcessController import load_and_split_file
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import argparse
+import shutil
+import time
+import os
+import fitz # pyright: ignore[reportMissingImports]
+
+BENCH_PROJECT_ID = "bench_file_processing"
+
+
+def generate_pdfs(project_path: str, files: int, pages: int):
+    line = "The Nile is a major north-flowing river in northeastern Africa. "
+    for file_no in range(files):
+        document = fitz.open()
+        for page_no in range(pages):
+            page = document.new_page()
+            text = "\n".join(f"{file_no}-{page_no}-{i}: {line * 2}" for i in range(40))
+            page.insert_textbox(page.rect, text, fontsize=6)
+        document.save(os.path.join(project_path, f"bench_{file_no}.pdf"))
+        document.close()
+
+
+def run(file_ids: list, workers: int, chunk_size: int):
+    started_at = time.perf_counter()
+    total_chunks = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [
+            executor.submit(load_and_split_file, BENCH_PROJECT_ID, file_id, chunk_size, 0)
+            for file_id in file_ids
+        ]
+        for future in as_completed(futures):
+            total_chunks += len(future.result() or [])
+    return time.perf_counter() - started_at, total_chunks
+
+
+def main(files: int, pages: int, workers_levels: list, chunk_size: int):
+    project_path = ProjectController().get_project_path(project_id=BENCH_PROJECT_ID)
+    try:
+        generate_pdfs(project_path, files, pages)
+        file_ids = sorted(f for f in os.listdir(project_path) if f.endswith(".pdf"))
+
+        baseline = None
+        for workers in workers_levels:
+            elapsed, total_chunks = run(file_ids, workers, chunk_size)
+            baseline = baseline or elapsed
+            print(f"workers={workers:>2}: {len(file_ids)} files, {total_chunks} chunks in {elapsed:.2f}s "
+                  f"({baseline / elapsed:.1f}x)")
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    main(files=args.files, pages=args.pages, workers_levels=args.workers, chunk_size=args.chunk_size)
@@ -0,0 +1,117 @@
+"""
+Compare vector-only and hybrid (full-text + vector, RRF) retrieval of
+PGVectorProvider on the bundled FAQ eval set: recall@k and search latency.
+
+    python -m benchmarks.hybrid_search_eval --k 1 3 5 --repeats 20
+
+Documents and queries come from benchmarks/data/faq_eval.json. They are
+embedded with the embedding backend configured in .env and written to a
+throwaway collection in the configured Postgres, which is dropped at the end.
+A query counts as a hit at k when any of its relevant documents is in the
+top k.
+"""
+from helpers.config import get_settings
+from stores.llm.LLMEnums import DocumentTypeEnums
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums, SearchModeEnums
+from stores.vectordb.VectorDBProviderInterface import VectorDBProviderInterface
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+import argparse
+import asyncio
+import json
+import os
+import time
+
+EVAL_SET_PATH = os.path.join(os.path.dirname(__file__), "data", "faq_eval.json")
+BENCH_COLLECTION_NAME = "bench_hybrid_search_eval"
+
+
+async def search(vectordb_client, mode: str, query: str, vector: list, limit: int):
+    if mode == SearchModeEnums.HYBRID.value:
+        return await vectordb_client.search_hybrid(collection_name=BENCH_COLLECTION_NAME, text=query,
+                                                   vector=vector, limit=limit)
+    return await vectordb_client.search_by_vector(collection_name=BENCH_COLLECTION_NAME,
+                                                  vector=vector, limit=limit)
+
+
+async def evaluate(vectordb_client, mode: str, queries: list, query_vectors: list,
+                   document_ids: dict, k_levels: list, repeats: int):
+    hits = {k: 0 for k in k_levels}
+    timings = []
+
+    for query, vector in zip(queries, query_vectors):
+        for _ in range(repeats):
+            started_at = time.perf_counter()
+            results = await search(vectordb_client, mode, query["query"], vector, max(k_levels))
+            timings.append(time.perf_counter() - started_at)
+
+        ranked_ids = [document_ids.get(result.text) for result in results or []]
+        for k in k_levels:
+            if set(ranked_ids[:k]) & set(query["relevant"]):
+                hits[k] += 1
+
+    timings.sort()
+    return {
+        "recall": {k: hits[k] / len(queries) for k in k_levels},
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1000,
+    }
+
+
+async def main(k_levels: list, repeats: int):
+    settings = get_settings()
+
+    with open(EVAL_SET_PATH, "r", encoding="utf-8") as eval_file:
+        eval_set = json.load(eval_file)
+    documents, queries = eval_set["documents"], eval_set["queries"]
+    document_ids = {document["text"]: document["id"] for document in documents}
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+    embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                         embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    vectordb_client = VectorDBProviderInterface(config=settings, db_client=db_client).create(
+        provider=VectorDBEnums.PGVECTOR.value
+    )
+    await vectordb_client.connect()
+
+    try:
+        texts = [document["text"] for document in documents]
+        vectors = await embedding_client.aembed_text(text=texts,
+                                                     document_type=DocumentTypeEnums.DOCUMENT.value)
+        query_vectors = await embedding_client.aembed_text(text=[query["query"] for query in queries],
+                                                           document_type=DocumentTypeEnums.QUERY.value)
+
+        await vectordb_client.create_collection(collection_name=BENCH_COLLECTION_NAME,
+                                                embedding_size=settings.EMBEDDING_MODEL_SIZE,
+                                                do_reset=True)
+        await vectordb_client.insert_many(collection_name=BENCH_COLLECTION_NAME, texts=texts,
+                                          vectors=vectors, record_ids=[None] * len(texts))
+
+        print(f"{len(documents)} documents, {len(queries)} queries")
+        for mode in (SearchModeEnums.VECTOR.value, SearchModeEnums.HYBRID.value):
+            report = await evaluate(vectordb_client, mode, queries, query_vectors, document_ids,
+                                    k_levels, repeats)
+            recall = ", ".join(f"recall@{k} {value:.2f}" for k, value in report["recall"].items())
+            print(f"{mode:>6}: {recall} | p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms")
+    finally:
+        await vectordb_client.delete_collection(collection_name=BENCH_COLLECTION_NAME)
+        await vectordb_client.disconnect()
+        await llm_provider_factory.close()
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--repeats", type=int, default=20,
+                        help="timed searches per query and mode")
+    args = parser.parse_args()
+
+    asyncio.run(main(k_levels=sorted(args.k), repeats=args.repeats))
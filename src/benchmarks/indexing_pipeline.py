@@ -0,0 +1,92 @@
+"""
+Measure indexing throughput of the embedding pipeline at different
+INDEXING_EMBEDDING_CONCURRENCY values against a slow embedding endpoint.
+
+    python -m benchmarks.mock_openai_server --latency-ms 200 &
+    python -m benchmarks.indexing_pipeline --chunks 2000 --concurrency 1 4 8
+
+Embeddings go through the real OpenAIProvider pointed at the mock server, the
+vector DB write is simulated with a fixed delay so only the pipeline overlap
+is measured.
+"""
+from helpers.config import get_settings
+from stores.llm.LLMEnums import LLMEnums
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from controllers.NLPController import NLPController
+from tasks.data_indexing import _run_indexing_pipeline
+from types import SimpleNamespace
+import argparse
+import asyncio
+import time
+
+
+async def chunk_pages(total_chunks: int, page_size: int):
+    for start in range(0, total_chunks, page_size):
+        yield [
+            SimpleNamespace(chunk_id=i + 1, chunk_text=f"benchmark chunk {i}", chunk_metadata={})
+            for i in range(start, min(start + page_size, total_chunks))
+        ]
+
+
+async def run(nlp_controller, total_chunks: int, page_size: int, concurrency: int,
+              queue_size: int, write_latency: float):
+    async def write_page(page_chunks: list, vectors: list):
+        if len(vectors) != len(page_chunks):
+            raise Exception("Embedding count mismatch")
+        await asyncio.sleep(write_latency)
+
+    checkpoint = {"last_chunk_id": 0}
+    started_at = time.perf_counter()
+    inserted_items_count = await _run_indexing_pipeline(
+        chunk_pages=chunk_pages(total_chunks, page_size),
+        embed_page=nlp_controller.embed_chunks,
+        write_page=write_page,
+        checkpoint=checkpoint,
+        concurrency=concurrency,
+        queue_size=queue_size
+    )
+    elapsed = time.perf_counter() - started_at
+
+    assert checkpoint["last_chunk_id"] == total_chunks
+    return inserted_items_count / elapsed, elapsed
+
+
+async def main(total_chunks: int, page_size: int, concurrency_levels: list,
+               queue_size: int, api_url: str, write_latency_ms: float):
+    settings = get_settings()
+    settings.OPENAI_API_URL = api_url
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "mock"
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    embedding_client = llm_provider_factory.create(provider=LLMEnums.OPENAI.value)
+    embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                         embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    nlp_controller = NLPController(vectordb_client=None, generation_client=None,
+                                   template_parser=None, embedding_client=embedding_client)
+
+    baseline = None
+    try:
+        for concurrency in concurrency_levels:
+            chunks_per_sec, elapsed = await run(nlp_controller, total_chunks, page_size, concurrency,
+                                                queue_size, write_latency_ms / 1000)
+            baseline = baseline or chunks_per_sec
+            print(f"concurrency={concurrency:>2}: {total_chunks} chunks in {elapsed:.2f}s "
+                  f"-> {chunks_per_sec:,.0f} chunks/sec ({chunks_per_sec / baseline:.1f}x)")
+    finally:
+        await llm_provider_factory.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--api-url", default="http://127.0.0.1:8090/v1")
+    parser.add_argument("--write-latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(total_chunks=args.chunks, page_size=args.page_size,
+                     concurrency_levels=args.concurrency, queue_size=args.queue_size,
+                     api_url=args.api_url, write_latency_ms=args.write_latency_ms))
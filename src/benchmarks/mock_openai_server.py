@@ -0,0 +1,110 @@
+"""
+OpenAI-compatible mock server with a fixed artificial latency, for benchmarking
+the indexing and answer paths without hitting (or paying for) the real API.
+
+    python -m benchmarks.mock_openai_server --port 8090 --latency-ms 200
+
+Point the app at it with OPENAI_API_URL=http://localhost:8090/v1
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+import numpy as np
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import uvicorn
+
+app = FastAPI()
+
+LATENCY_SECONDS = float(os.environ.get("MOCK_OPENAI_LATENCY_MS", "200")) / 1000
+TOKEN_INTERVAL_SECONDS = float(os.environ.get("MOCK_OPENAI_TOKEN_INTERVAL_MS", "20")) / 1000
+MOCK_ANSWER = "This is a mock answer streamed one word at a time."
+EMBEDDING_SIZE = int(os.environ.get("MOCK_OPENAI_EMBEDDING_SIZE", "1536"))
+
+
+def fake_embedding(text: str, dim: int) -> list:
+    # Deterministic per text, so repeated runs embed to the same vectors
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).random(dim, dtype=np.float32).tolist()
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    inputs = body.get("input", [])
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    dim = body.get("dimensions") or EMBEDDING_SIZE
+
+    await asyncio.sleep(LATENCY_SECONDS)
+
+    return {
+        "object": "list",
+        "model": body.get("model"),
+        "data": [
+            {"object": "embedding", "index": i, "embedding": fake_embedding(text, dim)}
+            for i, text in enumerate(inputs)
+        ],
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+async def stream_completion(model: str):
+    # LATENCY_SECONDS to the first token, then one word per TOKEN_INTERVAL_SECONDS
+    await asyncio.sleep(LATENCY_SECONDS)
+    for idx, word in enumerate(MOCK_ANSWER.split(" ")):
+        if idx:
+            await asyncio.sleep(TOKEN_INTERVAL_SECONDS)
+        chunk = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": word if idx == 0 else f" {word}"}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+
+    if body.get("stream"):
+        return StreamingResponse(stream_completion(body.get("model")), media_type="text/event-stream")
+
+    await asyncio.sleep(LATENCY_SECONDS)
+
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": 0,
+        "model": body.get("model"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": MOCK_ANSWER},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--embedding-size", type=int, default=EMBEDDING_SIZE)
+    parser.add_argument("--token-interval-ms", type=float, default=TOKEN_INTERVAL_SECONDS * 1000)
+    args = parser.parse_args()
+
+    LATENCY_SECONDS = args.latency_ms / 1000
+    TOKEN_INTERVAL_SECONDS = args.token_interval_ms / 1000
+    EMBEDDING_SIZE = args.embedding_size
+
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,72 @@
+"""
+Measure exact top-k latency of the LOCAL_NUMPY vector provider.
+
+    python -m benchmarks.numpy_vector_search --rows 1000000 --dim 768 --queries 1 16
+
+Appends random unit vectors to a throwaway collection in batches, then times
+NumpyCollection.top_k for each query batch size. The matrix is read once
+before timing so the memory-mapped file is in the page cache. The
+collection is removed at the end.
+"""
+from stores.vectordb.providers.NumpyVectorProvider import NumpyCollection, NumpyVectorProvider
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums
+import numpy as np
+import argparse
+import shutil
+import tempfile
+import time
+import os
+
+
+def generate_vectors(rng, rows: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main(rows: int, dim: int, limit: int, query_batches: list, repeats: int, batch_size: int):
+    rng = np.random.default_rng(0)
+    bench_dir = tempfile.mkdtemp(prefix="bench_numpy_vector_search_")
+
+    try:
+        collection = NumpyCollection.create(os.path.join(bench_dir, "collection"), dim=dim,
+                                            distance_method=DistanceMethodEnums.COSINE.value)
+
+        started_at = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            collection.append(list(range(start, start + count)), [""] * count,
+                              generate_vectors(rng, count, dim), [None] * count)
+        elapsed = time.perf_counter() - started_at
+        print(f"append: {rows} x {dim} in {elapsed:.2f}s -> {rows / elapsed:,.0f} rows/sec")
+
+        # Warm the page cache
+        float(collection.vectors[:rows].sum())
+
+        for queries in query_batches:
+            query_vectors = generate_vectors(rng, queries, dim)
+            timings = []
+            for _ in range(repeats):
+                started_at = time.perf_counter()
+                collection.top_k(query_vectors, k=limit, block_rows=NumpyVectorProvider.SEARCH_BLOCK_ROWS)
+                timings.append(time.perf_counter() - started_at)
+
+            best = min(timings)
+            print(f"queries={queries:>4}: best {best * 1000:,.1f} ms, "
+                  f"median {sorted(timings)[len(timings) // 2] * 1000:,.1f} ms, "
+                  f"{queries / best:,.1f} queries/sec")
+    finally:
+        shutil.rmtree(bench_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    main(rows=args.rows, dim=args.dim, limit=args.limit, query_batches=args.queries,
+         repeats=args.repeats, batch_size=args.batch_size)
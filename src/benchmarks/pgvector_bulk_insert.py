@@ -0,0 +1,83 @@
+"""
+Compare pgvector ingest throughput of the parameterized INSERT path and the
+binary COPY path of PGVectorProvider.
+
+    python -m benchmarks.pgvector_bulk_insert --rows 100000 --dim 1536
+
+Runs against the Postgres configured in .env and uses a throwaway collection
+which is dropped at the end.
+"""
+from helpers.config import get_settings
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorInsertModeEnums
+from stores.vectordb.VectorDBProviderInterface import VectorDBProviderInterface
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+import numpy as np
+import argparse
+import asyncio
+import time
+
+
+async def run_mode(vectordb_client, collection_name: str, insert_mode: str,
+                   texts: list, vectors: np.ndarray, batch_size: int):
+    await vectordb_client.create_collection(collection_name=collection_name,
+                                            embedding_size=vectors.shape[1],
+                                            do_reset=True)
+    vectordb_client.insert_mode = insert_mode
+
+    started_at = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        await vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=texts[i:i + batch_size],
+            vectors=vectors[i:i + batch_size],
+            record_ids=[None] * len(texts[i:i + batch_size]),
+        )
+    elapsed = time.perf_counter() - started_at
+
+    return len(texts) / elapsed, elapsed
+
+
+async def main(rows: int, dim: int, batch_size: int):
+    settings = get_settings()
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    vectordb_client = VectorDBProviderInterface(config=settings, db_client=db_client).create(
+        provider=VectorDBEnums.PGVECTOR.value
+    )
+    # Keep the index out of the measurement
+    vectordb_client.index_threshold = rows + 1
+    await vectordb_client.connect()
+
+    collection_name = f"bench_bulk_insert_{dim}"
+    rng = np.random.default_rng(42)
+    vectors = rng.random((rows, dim), dtype=np.float32)
+    texts = [f"benchmark chunk {i}" for i in range(rows)]
+
+    try:
+        results = {}
+        for insert_mode in (PgVectorInsertModeEnums.INSERT.value, PgVectorInsertModeEnums.COPY.value):
+            rows_per_sec, elapsed = await run_mode(vectordb_client, collection_name, insert_mode,
+                                                   texts, vectors, batch_size)
+            results[insert_mode] = rows_per_sec
+            print(f"{insert_mode:>6}: {rows} rows in {elapsed:.2f}s -> {rows_per_sec:,.0f} rows/sec")
+
+        speedup = results[PgVectorInsertModeEnums.COPY.value] / results[PgVectorInsertModeEnums.INSERT.value]
+        print(f"speedup: {speedup:.1f}x")
+    finally:
+        await vectordb_client.delete_collection(collection_name=collection_name)
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="rows handed to insert_many per call (one indexing page)")
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, dim=args.dim, batch_size=args.batch_size))
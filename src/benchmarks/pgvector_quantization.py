@@ -0,0 +1,156 @@
+"""
+Compare pgvector storage layouts: float32 vector, halfvec, and binary
+quantized indexes (re-scored on the stored vectors) against the float32
+baseline. Reports table and index size, index build time, search latency
+and recall@k.
+
+    python -m benchmarks.pgvector_quantization --rows 200000 --queries 200 --limit 10
+
+The same vectors are written to one throwaway collection per layout in the
+configured Postgres. They are clustered random vectors of
+EMBEDDING_MODEL_SIZE, or real embeddings from --vectors (a .npy file).
+Ground truth is the exact top k computed with numpy on the float32 vectors.
+Collections are dropped at the end.
+"""
+from helpers.config import get_settings
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorStorageEnums, PgVectorQuantizationEnums
+from stores.vectordb.VectorDBProviderInterface import VectorDBProviderInterface
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import text as sql_text
+import numpy as np
+import argparse
+import asyncio
+import time
+
+LAYOUTS = [
+    (PgVectorStorageEnums.VECTOR.value, PgVectorQuantizationEnums.NONE.value),
+    (PgVectorStorageEnums.HALFVEC.value, PgVectorQuantizationEnums.NONE.value),
+    (PgVectorStorageEnums.VECTOR.value, PgVectorQuantizationEnums.BINARY.value),
+    (PgVectorStorageEnums.HALFVEC.value, PgVectorQuantizationEnums.BINARY.value),
+]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def generate_vectors(rng, rows: int, dim: int, clusters: int = 256) -> np.ndarray:
+    # Embeddings are far from uniform, points around a few hundred topics are closer to them
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    noise = rng.standard_normal((rows, dim), dtype=np.float32) * 0.6
+    return normalize(centers[rng.integers(0, clusters, rows)] + noise).astype(np.float32)
+
+
+async def get_sizes(db_client, table_name: str, index_name: str) -> tuple:
+    async with db_client() as session:
+        record = (await session.execute(sql_text("""
+            SELECT pg_table_size(to_regclass(:table_name)) AS table_size,
+                   COALESCE(pg_relation_size(to_regclass(:index_name)), 0) AS index_size
+        """), {"table_name": f'"{table_name}"', "index_name": index_name})).fetchone()
+    return record.table_size, record.index_size
+
+
+async def benchmark_layout(vectordb_client, db_client, collection_name: str, vectors: np.ndarray,
+                           query_vectors: np.ndarray, ground_truth: np.ndarray, limit: int,
+                           batch_size: int) -> dict:
+    texts = [str(row) for row in range(len(vectors))]
+    await vectordb_client.create_collection(collection_name=collection_name,
+                                            embedding_size=vectors.shape[1], do_reset=True)
+
+    # Keep the index out of the way while loading, then time its build alone
+    await vectordb_client.begin_bulk_ingest(collection_name=collection_name)
+    for start in range(0, len(vectors), batch_size):
+        await vectordb_client.insert_many(collection_name=collection_name,
+                                          texts=texts[start:start + batch_size],
+                                          vectors=vectors[start:start + batch_size],
+                                          record_ids=[None] * len(texts[start:start + batch_size]),
+                                          batch_size=batch_size)
+    await vectordb_client.end_bulk_ingest(collection_name=collection_name, build_index=False)
+
+    started_at = time.perf_counter()
+    await vectordb_client.create_vector_index(collection_name=collection_name)
+    build_seconds = time.perf_counter() - started_at
+
+    table_size, index_size = await get_sizes(
+        db_client, f"{vectordb_client.pgvector_table_prefix}{collection_name}",
+        vectordb_client.default_index_name(collection_name=collection_name)
+    )
+
+    timings, hits = [], 0
+    for query_vector, expected in zip(query_vectors.tolist(), ground_truth):
+        started_at = time.perf_counter()
+        results = await vectordb_client.search_by_vector(collection_name=collection_name,
+                                                         vector=query_vector, limit=limit)
+        timings.append(time.perf_counter() - started_at)
+        hits += len({int(result.text) for result in results or []} & set(expected.tolist()))
+
+    timings.sort()
+    return {
+        "table_mb": table_size / 2 ** 20,
+        "index_mb": index_size / 2 ** 20,
+        "build_s": build_seconds,
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1000,
+        "recall": hits / (len(query_vectors) * limit),
+    }
+
+
+async def main(rows: int, queries: int, limit: int, batch_size: int, vectors_path: str = None):
+    settings = get_settings()
+    rng = np.random.default_rng(0)
+
+    if vectors_path:
+        vectors = normalize(np.load(vectors_path).astype(np.float32))[:rows]
+        query_vectors = vectors[rng.choice(len(vectors), size=queries, replace=False)]
+        query_vectors = normalize(query_vectors + rng.standard_normal(query_vectors.shape, dtype=np.float32) * 0.01)
+    else:
+        vectors = generate_vectors(rng, rows, settings.EMBEDDING_MODEL_SIZE)
+        query_vectors = generate_vectors(rng, queries, settings.EMBEDDING_MODEL_SIZE)
+
+    # Exact float32 top k, the baseline every layout is measured against
+    ground_truth = np.argsort(-(query_vectors @ vectors.T), axis=1)[:, :limit]
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    vectordb_client = VectorDBProviderInterface(config=settings, db_client=db_client).create(
+        provider=VectorDBEnums.PGVECTOR.value
+    )
+    await vectordb_client.connect()
+
+    collection_names = []
+    try:
+        print(f"{len(vectors)} rows x {vectors.shape[1]}, {queries} queries, top {limit}, "
+              f"{settings.VECTOR_DB_PGVEC_INDEX_TYPE} index")
+        for storage, quantization in LAYOUTS:
+            collection_name = f"bench_{storage}_{quantization}"
+            collection_names.append(collection_name)
+            vectordb_client.collection_storage[collection_name] = {"storage": storage,
+                                                                   "quantization": quantization}
+
+            report = await benchmark_layout(vectordb_client, db_client, collection_name, vectors,
+                                            query_vectors, ground_truth, limit, batch_size)
+            print(f"{storage:>7} / {quantization:<6}: table {report['table_mb']:,.1f} MB, "
+                  f"index {report['index_mb']:,.1f} MB, build {report['build_s']:.1f}s | "
+                  f"p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms | "
+                  f"recall@{limit} {report['recall']:.3f}")
+    finally:
+        for collection_name in collection_names:
+            await vectordb_client.delete_collection(collection_name=collection_name)
+        await vectordb_client.disconnect()
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--vectors", default=None, help="optional .npy file of real embeddings")
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, queries=args.queries, limit=args.limit,
+                     batch_size=args.batch_size, vectors_path=args.vectors))
@@ -0,0 +1,74 @@
+"""
+Compare peak RSS of whole-file load+split with streaming page-by-page
+ingestion as the PDF grows.
+
+    python -m benchmarks.streaming_ingestion --pages 100 500 2000
+
+Generates one synthetic PDF per size under a throwaway project folder and
+splits it in a fresh process per mode, so each ru_maxrss reading covers
+that run only. The folder is removed at the end.
+"""
+from controllers.ProjectController import ProjectController
+from controllers.ProcessController import load_and_split_file, iter_file_chunk_batches
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import argparse
+import resource
+import shutil
+import time
+import os
+import fitz # pyright: ignore[reportMissingImports]
+
+BENCH_PROJECT_ID = "bench_streaming_ingestion"
+
+
+def generate_pdf(file_path: str, pages: int):
+    line = "The Nile is a major north-flowing river in northeastern Africa. "
+    document = fitz.open()
+    for page_no in range(pages):
+        page = document.new_page()
+        text = "\n".join(f"{page_no}-{i}: {line * 2}" for i in range(40))
+        page.insert_textbox(page.rect, text, fontsize=6)
+    document.save(file_path)
+    document.close()
+
+
+def run_whole(file_id: str, chunk_size: int):
+    started_at = time.perf_counter()
+    total_chunks = len(load_and_split_file(BENCH_PROJECT_ID, file_id, chunk_size, 0) or [])
+    return total_chunks, time.perf_counter() - started_at, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_streaming(file_id: str, chunk_size: int):
+    started_at = time.perf_counter()
+    total_chunks = 0
+    for batch in iter_file_chunk_batches(BENCH_PROJECT_ID, file_id, chunk_size, 0, batch_size=1000):
+        total_chunks += len(batch)
+    return total_chunks, time.perf_counter() - started_at, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main(pages_levels: list, chunk_size: int):
+    project_path = ProjectController().get_project_path(project_id=BENCH_PROJECT_ID)
+    context = multiprocessing.get_context("spawn")
+    try:
+        for pages in pages_levels:
+            file_id = f"bench_{pages}.pdf"
+            generate_pdf(os.path.join(project_path, file_id), pages)
+
+            for mode, run in (("whole", run_whole), ("stream", run_streaming)):
+                # A fresh process per measurement
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    total_chunks, elapsed, max_rss_kb = executor.submit(run, file_id, chunk_size).result()
+                print(f"pages={pages:>5} {mode:>6}: {total_chunks} chunks in {elapsed:.2f}s, "
+                      f"peak RSS {max_rss_kb / 1024:,.0f} MB")
+    finally:
+        shutil.rmtree(project_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    main(pages_levels=args.pages, chunk_size=args.chunk_size)
@@ -0,0 +1,80 @@
+"""
+Compare splitting throughput of the previous line-concatenation splitter
+(ProcessController.process_simpler_splitter) with TextSplitter.
+
+    python -m benchmarks.text_splitter --pages 2000 --chunk-size 1000 --overlap 200
+
+Splits synthetic English/Arabic pages twice, once with short lines and once
+with long paragraph lines, where repeated string concatenation goes
+quadratic. No database or files are needed.
+"""
+from controllers.ProcessController import ProcessController
+from controllers.TextSplitter import TextSplitter
+from models.enums.ProcessingEnums import TextSplitterLengthEnums
+import argparse
+import shutil
+import time
+
+BENCH_PROJECT_ID = "bench_text_splitter"
+
+ENGLISH = "The Nile is a major north-flowing river in northeastern Africa. It flows into the Mediterranean Sea. "
+ARABIC = "نهر النيل هو أطول نهر في أفريقيا. هل يصب في البحر المتوسط؟ نعم، يصب فيه. "
+
+
+def generate_pages(pages: int, long_lines: bool):
+    sentences = (ENGLISH + ARABIC) * 10
+    if long_lines:
+        return [sentences * 4 for _ in range(pages)]
+    return ["\n".join(sentences.split(". ")) * 4 for _ in range(pages)]
+
+
+def run_simpler(process_controller: ProcessController, pages: list, chunk_size: int, overlap: int):
+    started_at = time.perf_counter()
+    chunks = process_controller.process_simpler_splitter(texts=pages, metadatas=[{}] * len(pages),
+                                                         chunk_size=chunk_size)
+    return len(chunks), time.perf_counter() - started_at
+
+
+def run_text_splitter(length_unit: str, size_scale: int = 1):
+    def run(process_controller: ProcessController, pages: list, chunk_size: int, overlap: int):
+        text_splitter = TextSplitter(chunk_size=chunk_size // size_scale, chunk_overlap=overlap // size_scale,
+                                     length_unit=length_unit)
+        started_at = time.perf_counter()
+        chunks = sum(1 for _ in text_splitter.iter_chunks((page, {"page": i}) for i, page in enumerate(pages)))
+        return chunks, time.perf_counter() - started_at
+    return run
+
+
+def main(pages: int, chunk_size: int, overlap: int):
+    process_controller = ProcessController(project_id=BENCH_PROJECT_ID)
+    runners = (
+        ("simpler", run_simpler),
+        ("char", run_text_splitter(TextSplitterLengthEnums.CHAR.value)),
+        # About 5 characters per token, keeps the chunks comparable
+        ("token", run_text_splitter(TextSplitterLengthEnums.TOKEN.value, size_scale=5)),
+    )
+
+    try:
+        for long_lines in (False, True):
+            text_pages = generate_pages(pages, long_lines)
+            megabytes = sum(len(page.encode("utf-8")) for page in text_pages) / 1024 / 1024
+            print(f"{'long' if long_lines else 'short'} lines, {megabytes:.1f} MB:")
+
+            baseline = None
+            for name, run in runners:
+                chunks, elapsed = run(process_controller, text_pages, chunk_size, overlap)
+                baseline = baseline or elapsed
+                print(f"  {name:>8}: {chunks} chunks in {elapsed:.2f}s -> {megabytes / elapsed:,.1f} MB/s "
+                      f"({baseline / elapsed:.1f}x)")
+    finally:
+        shutil.rmtree(process_controller.project_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=200)
+    args = parser.parse_args()
+
+    main(pages=args.pages, chunk_size=args.chunk_size, overlap=args.overlap)
@@ -1,19 +1,30 @@
 from celery import Celery # pyright: ignore[reportMissingImports]
+from celery.signals import worker_process_init, worker_process_shutdown # pyright: ignore[reportMissingImports]
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderInterface import VectorDBProviderInterface
 from stores.llm.templates.template_parser import TemplateParser
+from controllers.ProcessController import shutdown_file_processing_executor
+from utils.collection_generations import RedisCollectionGenerations, get_collection_generations_url
 from sqlalchemy.ext.asyncio import create_async_engine ,AsyncSession
 from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import os
+import threading
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-async def get_setup_utils():
+async def create_setup_utils():
     settings = get_settings()
 
     # Postgres connection
     postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
-    db_engine = create_async_engine(postgres_conn)
+    db_engine = create_async_engine(postgres_conn,
+                                    pool_size=settings.CELERY_WORKER_DB_POOL_SIZE,
+                                    max_overflow=settings.CELERY_WORKER_DB_MAX_OVERFLOW,
+                                    pool_pre_ping=True)
     db_client = sessionmaker(
         db_engine , class_=AsyncSession , expire_on_commit=False
     )
@@ -47,6 +58,10 @@ async def get_setup_utils():
         model_id=settings.EMBEDDING_MODEL_ID,
         embedding_size=settings.EMBEDDING_MODEL_SIZE,
     )
+    embedding_client = llm_provider_factory.create_embedding_cache(
+        embedding_client=embedding_client,
+        db_client=db_client
+    )
 
     # Vector DB client
     vectordb_client = vectordb_provider_factory.create(
@@ -54,6 +69,13 @@ async def get_setup_utils():
     )
     await vectordb_client.connect()
 
+    # Collection changes made here invalidate the API processes' answer caches
+    generations_url = get_collection_generations_url(settings)
+    if generations_url:
+        vectordb_client.collection_cache.add_change_listener(
+            RedisCollectionGenerations(url=generations_url).bump
+        )
+
     template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG
@@ -71,6 +93,135 @@ async def get_setup_utils():
     )
 
 
+class WorkerResources:
+    """
+    Worker-process scoped resources shared by every task in the process:
+    one event loop running in a dedicated thread, one pooled async engine,
+    the LLM clients and a connected vector DB client. Sync task wrappers
+    submit their coroutines to the loop with run(), and tasks borrow the
+    resources through get_setup_utils() without disposing them.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.loop_thread = None
+        self.owner_pid = None
+        self.setup_utils = None
+        self.setup_lock = None
+        self.lock = threading.Lock()
+
+    def get_loop(self):
+        with self.lock:
+            # A loop inherited through fork has no thread behind it, start a fresh one
+            if self.loop is not None and self.owner_pid != os.getpid():
+                self.loop, self.loop_thread, self.setup_utils = None, None, None
+
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.setup_lock = None
+                self.owner_pid = os.getpid()
+                self.loop_thread = threading.Thread(target=self.run_loop, args=(self.loop,),
+                                                    name="celery-worker-loop", daemon=True)
+                self.loop_thread.start()
+
+            return self.loop
+
+    @staticmethod
+    def run_loop(loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    async def get_setup_utils(self):
+        if self.setup_lock is None:
+            self.setup_lock = asyncio.Lock()
+
+        async with self.setup_lock:
+            if self.setup_utils is None:
+                self.setup_utils = await create_setup_utils()
+                logger.info("Worker resources initialized")
+        return self.setup_utils
+
+    async def close(self):
+        if self.setup_utils is None:
+            return
+
+        (db_engine, db_client, llm_provider_factory,
+            vectordb_provider_factory, generation_client, embedding_client,
+            vectordb_client, template_parser) = self.setup_utils
+        self.setup_utils = None
+
+        try:
+            await vectordb_client.disconnect()
+            await llm_provider_factory.close()
+            await db_engine.dispose()
+        except Exception as e:
+            logger.error(f"Error in closing worker resources: {str(e)}")
+
+    @staticmethod
+    async def with_task_request(coro, task, request):
+        # Task.request is thread-local, expose the caller's request on the loop thread.
+        # Prefork runs one task per process at a time, so the stack top is this task.
+        task.request_stack.push(request)
+        try:
+            return await coro
+        finally:
+            task.request_stack.pop()
+
+    def run(self, coro, task=None):
+        if task is not None:
+            coro = self.with_task_request(coro, task, task.request)
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. soft time limit raised in the task thread, stop the coroutine too
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 30):
+        with self.lock:
+            loop, loop_thread = self.loop, self.loop_thread
+            if loop is None or self.owner_pid != os.getpid():
+                return
+            self.loop, self.loop_thread = None, None
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error in closing worker resources: {str(e)}")
+
+        # Let in-flight callbacks finish, then stop and close the loop
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+worker_resources = WorkerResources()
+
+async def get_setup_utils():
+    return await worker_resources.get_setup_utils()
+
+def run_async(coro, task=None):
+    """Run a task coroutine on the worker's long-lived event loop and wait for it.
+    Pass the bound task so update_state / request work inside the coroutine."""
+    return worker_resources.run(coro, task=task)
+
+@worker_process_init.connect
+def init_worker_resources(**kwargs):
+    # Connect up front so the first task does not pay for it
+    try:
+        worker_resources.run(worker_resources.get_setup_utils())
+    except Exception as e:
+        logger.error(f"Can not initialize worker resources, retrying on first task: {str(e)}")
+
+@worker_process_shutdown.connect
+def shutdown_worker_resources(**kwargs):
+    worker_resources.shutdown()
+    shutdown_file_processing_executor()
+
+
 # Create Celery application instance
 celery_app = Celery(
     'minirag',
@@ -109,7 +260,15 @@ celery_app.conf.update(
         'tasks.file_processing.process_project_files': {'queue': 'file_processing_queue'},
         'tasks.data_indexing.index_data_content': {'queue': 'data_indexing_queue'},
         'tasks.process_workflow.process_and_push_workflow': {'queue': 'file_processing_queue'},
+        'tasks.process_workflow.process_and_push_fanout_workflow': {'queue': 'file_processing_queue'},
+        'tasks.process_workflow.process_asset_batch': {'queue': 'file_processing_queue'},
+        'tasks.process_workflow.dispatch_indexing': {'queue': 'data_indexing_queue'},
+        'tasks.process_workflow.index_chunk_range': {'queue': 'data_indexing_queue'},
+        'tasks.process_workflow.finalize_workflow': {'queue': 'data_indexing_queue'},
+        'tasks.process_workflow.mark_workflow_failed': {'queue': 'data_indexing_queue'},
         'tasks.maintenance.clean_celery_executation_table': {'queue': 'default'},
+        'tasks.maintenance.migrate_vector_storage': {'queue': 'data_indexing_queue'},
+        'tasks.maintenance.clean_embedding_cache': {'queue': 'default'},
     },
 
     beat_schedule = {
@@ -117,6 +276,11 @@ celery_app.conf.update(
             'task': 'tasks.maintenance.clean_celery_executation_table',
             'schedule': 86400.0,  # every 24 hours
             'args': (),
+        },
+        'clean-embedding-cache': {
+            'task': 'tasks.maintenance.clean_embedding_cache',
+            'schedule': 86400.0,  # every 24 hours
+            'args': (),
         }
     },
 
@@ -1,21 +1,30 @@
 from .BaseController import BaseController
 from models.db_schemas import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnums
+from stores.vectordb.VectorDBEnums import SearchModeEnums
+from stores.vectordb.VectorSearchFilter import VectorSearchFilter
+from utils.metrics import LLM_TIME_TO_FIRST_TOKEN, RERANK_LATENCY, RAG_PROMPT_TOKENS
 from typing import List
+import asyncio
 import inspect
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class NLPController(BaseController):
-    def __init__(self, vectordb_client, generation_client, template_parser , embedding_client):
+    def __init__(self, vectordb_client, generation_client, template_parser , embedding_client,
+                 answer_cache=None, token_budget=None, reranker=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.answer_cache = answer_cache
+        self.token_budget = token_budget
+        self.reranker = reranker
 
     def create_collection_name(self, project_id: int):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
@@ -55,6 +64,29 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=default_serializer)
         )
     
+    async def embed_chunks(self, chunks: List[DataChunk]):
+        texts = [c.chunk_text for c in chunks]
+        return await self.embedding_client.aembed_text(text=texts, 
+                                                       document_type=DocumentTypeEnums.DOCUMENT.value)
+
+    async def insert_into_vector_db(self, project: Project,
+                                    chunk_ids: list[int],
+                                    chunks: List[DataChunk], vectors: list):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        if not vectors or len(vectors) != len(chunks):
+            logger.error(f"Embedding returned {len(vectors or [])} vectors for {len(chunks)} chunks")
+            return False
+
+        return await self.vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=[c.chunk_text for c in chunks],
+            vectors=vectors,
+            # asset_id rides along so stores without a chunks table can filter on it
+            metadata=[{**(c.chunk_metadata or {}), "asset_id": c.chunk_asset_id} for c in chunks],
+            record_ids=chunk_ids
+        )
+
     async def index_into_vector_db(self, project: Project,
                             chunk_ids: list[int],
                             chunks: List[DataChunk], do_reset: bool = False):
@@ -62,13 +94,8 @@ class NLPController(BaseController):
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
         
-        # step2: manage item 
-        texts = [c.chunk_text for c in chunks]
-        metadata = [c.chunk_metadata for c in chunks]
-
-        vectors = self.embedding_client.embed_text(text=texts, 
-                                            document_type=DocumentTypeEnums.DOCUMENT.value)
-
+        # step2: embed items
+        vectors = await self.embed_chunks(chunks=chunks)
 
         # step3: create collection if not exists
         _ = await self.vectordb_client.create_collection(
@@ -78,43 +105,28 @@ class NLPController(BaseController):
         )
 
         # step4: insert into vector db
-        _ = await self.vectordb_client.insert_many(
-            collection_name=collection_name,
-            texts= texts,
-            vectors=vectors,
-            metadata=metadata,
-            record_ids=chunk_ids
+        _ = await self.insert_into_vector_db(
+            project=project,
+            chunk_ids=chunk_ids,
+            chunks=chunks,
+            vectors=vectors
         )
 
         return True
     
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
-        collection_name = self.create_collection_name(project_id=project.project_id)
-
-        if not text or not text.strip():
-            raise ValueError("Search text is empty")
-        
-        collection_exists = await self.vectordb_client.is_collection_exist(collection_name)
-        if not collection_exists:
-            logger.warning(f"Collection '{collection_name}' does not exist")
-            return []
-
-        # Embed the query text
+    async def embed_query(self, text: str):
         try:
-            vector = self.embedding_client.embed_text(
+            vector = await self.embedding_client.aembed_text(
                 text=text,
                 document_type=DocumentTypeEnums.QUERY.value
             )
-            # Await if coroutine
-            if hasattr(vector, "__await__"):
-                vector = await vector
         except Exception as e:
             logger.exception("Failed to embed query text")
             raise
 
         if not vector:
             logger.error("Embedding returned empty vector")
-            return []
+            return None
 
         if isinstance(vector, list) and len(vector) > 0:
             # Check if it's nested (List[List[float]])
@@ -123,18 +135,58 @@ class NLPController(BaseController):
             # Now vector should be List[float]
             if len(vector) == 0:
                 logger.error("Embedding returned empty vector")
-                return []
+                return None
         else:
             logger.error("Invalid vector format")
+            return None
+
+        return vector
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          ef_search: int = None, probes: int = None,
+                                          vector: list = None, mode: str = None,
+                                          search_filter: VectorSearchFilter = None):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        if not text or not text.strip():
+            raise ValueError("Search text is empty")
+
+        mode = mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+        if mode not in [search_mode.value for search_mode in SearchModeEnums]:
+            raise ValueError(f"Unknown search mode: {mode}")
+        
+        collection_exists = await self.vectordb_client.is_collection_exist(collection_name)
+        if not collection_exists:
+            logger.warning(f"Collection '{collection_name}' does not exist")
             return []
 
-         # Perform semantic search
+        # Embed the query text, unless the caller already did
+        if vector is None:
+            vector = await self.embed_query(text=text)
+            if vector is None:
+                return []
+
+         # Perform semantic (or keyword + semantic) search
         try:
-            results = await self.vectordb_client.search_by_vector(
-                 collection_name=collection_name,
-                 vector=vector,
-                 limit=limit
-            )
+            if mode == SearchModeEnums.HYBRID.value:
+                results = await self.vectordb_client.search_hybrid(
+                     collection_name=collection_name,
+                     text=text,
+                     vector=vector,
+                     limit=limit,
+                     ef_search=ef_search,
+                     probes=probes,
+                     search_filter=search_filter
+                )
+            else:
+                results = await self.vectordb_client.search_by_vector(
+                     collection_name=collection_name,
+                     vector=vector,
+                     limit=limit,
+                     ef_search=ef_search,
+                     probes=probes,
+                     search_filter=search_filter
+                )
         except Exception as e:
             logger.exception("Vector DB search_by_vector failed")
             raise
@@ -149,53 +201,178 @@ class NLPController(BaseController):
             # Fallback: return raw results if transform fails
             return results
 
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
-       
-        answer, full_prompt, chat_history = None, None, None
+    async def embed_queries(self, texts: List[str]) -> list:
+        """One embedding call per SEARCH_BATCH_EMBEDDING_SIZE texts, vectors in text order."""
+        batch_size = self.app_settings.SEARCH_BATCH_EMBEDDING_SIZE
+        batches = await asyncio.gather(*[
+            self.embedding_client.aembed_text(text=texts[start:start + batch_size],
+                                              document_type=DocumentTypeEnums.QUERY.value)
+            for start in range(0, len(texts), batch_size)
+        ])
 
-        # step 1 : retrieve related documents
-        logger.info(f"Searching for documents related to query: {query}")
-        retrieved_documents = await self.search_vector_db_collection(project=project,
-                                                               text=query,
-                                                               limit=limit)
-        
-        if not retrieved_documents or len(retrieved_documents) == 0:
-            logger.warning("No documents retrieved from vector search")
-            return answer, full_prompt, chat_history
-        
-        logger.info(f"Retrieved {len(retrieved_documents)} documents")
-        
-        # Log the first few retrieved docs to check relevance
-        #for idx, doc in enumerate(retrieved_documents[:3]):
-         #   text_preview = str(doc.get("text", "") or doc.get("content", ""))[:200]
-          #  logger.debug(f"Doc {idx}: {text_preview}...")
-        
-        # step 2 : construct LLM prompt
+        vectors = [vector for batch in batches for vector in (batch or [])]
+        if len(vectors) != len(texts):
+            logger.error(f"Embedding returned {len(vectors)} vectors for {len(texts)} queries")
+            return None
+        return vectors
+
+    async def search_many_vector_db_collection(self, project: Project, texts: List[str], limit: int = 10,
+                                               ef_search: int = None, probes: int = None,
+                                               mode: str = None,
+                                               search_filter: VectorSearchFilter = None):
+        """Results for every text, in order, with one batched embedding and search round-trip."""
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        if not texts or any(not text or not text.strip() for text in texts):
+            raise ValueError("Search texts must be non empty")
+
+        if len(texts) > self.app_settings.SEARCH_BATCH_MAX_QUERIES:
+            raise ValueError(f"At most {self.app_settings.SEARCH_BATCH_MAX_QUERIES} queries per batch")
+
+        mode = mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+        if mode not in [search_mode.value for search_mode in SearchModeEnums]:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        if not await self.vectordb_client.is_collection_exist(collection_name):
+            logger.warning(f"Collection '{collection_name}' does not exist")
+            return [[] for _ in texts]
+
+        vectors = await self.embed_queries(texts=texts)
+        if vectors is None:
+            return None
+
+        if mode == SearchModeEnums.HYBRID.value:
+            # The keyword side has no batched form, hybrid queries still share the embedding call
+            results = []
+            for text, vector in zip(texts, vectors):
+                results.append(await self.vectordb_client.search_hybrid(
+                    collection_name=collection_name, text=text, vector=vector, limit=limit,
+                    ef_search=ef_search, probes=probes, search_filter=search_filter
+                ) or [])
+        else:
+            results = await self.vectordb_client.search_many(
+                collection_name=collection_name, vectors=vectors, limit=limit,
+                ef_search=ef_search, probes=probes, search_filter=search_filter
+            )
+
+        return json.loads(json.dumps(results, default=lambda x: x.__dict__))
+
+    async def rerank_documents(self, query: str, documents: list, top_n: int) -> list:
+        """Keep the top_n documents by reranker score, the retrieval score is kept alongside."""
+        if self.reranker is None or not documents:
+            return documents
+
+        started_at = time.perf_counter()
+        ranked = await asyncio.to_thread(
+            self.reranker.rerank, query,
+            [doc.get("text") or doc.get("content") or str(doc) for doc in documents],
+            top_n
+        )
+        RERANK_LATENCY.labels(reranker=self.reranker.name).observe(time.perf_counter() - started_at)
+
+        return [
+            {**documents[idx], "score": score, "retrieval_score": documents[idx].get("score")}
+            for idx, score in ranked
+        ]
+
+    async def retrieve_documents(self, project: Project, query: str, limit: int,
+                                 ef_search: int = None, probes: int = None,
+                                 vector: list = None, mode: str = None,
+                                 search_filter: VectorSearchFilter = None) -> list:
+        """Search the project collection, over-fetching candidates for the reranker when there is one."""
+        if self.reranker is None:
+            return await self.search_vector_db_collection(project=project, text=query, limit=limit,
+                                                          ef_search=ef_search, probes=probes,
+                                                          vector=vector, mode=mode,
+                                                          search_filter=search_filter)
+
+        top_n = min(limit, self.app_settings.RERANKER_TOP_N) if limit else self.app_settings.RERANKER_TOP_N
+        candidates = await self.search_vector_db_collection(project=project, text=query,
+                                                            limit=max(limit, self.app_settings.RERANKER_CANDIDATES),
+                                                            ef_search=ef_search, probes=probes,
+                                                            vector=vector, mode=mode,
+                                                            search_filter=search_filter)
+        return await self.rerank_documents(query=query, documents=candidates, top_n=top_n)
+
+    def use_answer_cache(self, search_filter: VectorSearchFilter = None) -> bool:
+        # Filters are not part of the answer cache key, filtered searches bypass it
+        return self.answer_cache is not None and (search_filter is None or search_filter.is_empty())
+
+    def get_answer_cache_params(self, limit: int, ef_search: int = None, probes: int = None,
+                                mode: str = None) -> tuple:
+        """Everything besides the query that changes the retrieved documents, part of the cache key."""
+        reranker = None
+        if self.reranker is not None:
+            reranker = (self.reranker.name, self.app_settings.RERANKER_TOP_N,
+                        self.app_settings.RERANKER_CANDIDATES)
+
+        return (limit, mode or self.app_settings.VECTOR_DB_SEARCH_MODE, ef_search, probes, reranker)
+
+    async def lookup_answer_cache(self, collection_name: str, query: str, params: tuple,
+                                  search_filter: VectorSearchFilter = None):
+        """Returns (cached_entry, cache_match, query_vector, generation); the query
+        vector is reused for retrieval on a miss, the generation goes to answer_cache.set."""
+        if not self.use_answer_cache(search_filter=search_filter):
+            return None, None, None, None
+
+        generation = await self.answer_cache.check_generation(collection_name=collection_name)
+
+        cached = self.answer_cache.get(collection_name=collection_name, query=query, params=params)
+        if cached is not None:
+            return cached, "exact", None, generation
+
+        query_vector = None
+        if query and query.strip():
+            query_vector = await self.embed_query(text=query)
+            if query_vector is not None:
+                cached = self.answer_cache.get_similar(collection_name=collection_name,
+                                                       vector=query_vector, params=params)
+                if cached is not None:
+                    return cached, "semantic", query_vector, generation
+
+        return None, None, query_vector, generation
+
+    def construct_rag_prompt(self, query: str, retrieved_documents: list):
         system_prompt = self.template_parser.get(
             "rag", "system_prompt"
         )
 
+        footer_prompt = self.template_parser.get(
+            "rag", "footer_prompt", {
+                "query" : query
+            }
+        )
+
+        document_texts = [
+            doc.get("text") or doc.get("content") or str(doc)
+            for doc in retrieved_documents
+        ]
+
+        if self.token_budget is not None:
+            # As many documents as fit the context window, in rank order
+            document_texts = self.token_budget.pack_documents(
+                texts=document_texts,
+                fixed_prompt="\n\n".join([system_prompt, footer_prompt]),
+                document_overhead=lambda doc_num: self.template_parser.get(
+                    "rag", "document_prompt", {"doc_num": doc_num, "chunk_text": ""}
+                )
+            )
+        else:
+            document_texts = [self.generation_client.process_text(text) for text in document_texts]
+
         document_prompt = "\n".join([
             self.template_parser.get(
                 "rag",
                 "document_prompt",
                 {
                     "doc_num": idx + 1,
-                    "chunk_text": self.generation_client.process_text(
-                        doc.get("text") or doc.get("content") or str(doc)
-                    )
+                    "chunk_text": text
                 },
             )
-            for idx, doc in enumerate(retrieved_documents)
+            for idx, text in enumerate(document_texts)
         ])
 
-        footer_prompt = self.template_parser.get(
-            "rag", "footer_prompt", {
-                "query" : query
-            }
-        )
-
-        # step3: Construct Generation Client Prompts
+        # Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
                 prompt=system_prompt,
@@ -204,17 +381,130 @@ class NLPController(BaseController):
         ]
 
         full_prompt = "\n\n".join([ document_prompt, footer_prompt ])
+
+        if self.token_budget is not None:
+            RAG_PROMPT_TOKENS.labels(reranker=self.reranker.name if self.reranker else "none").observe(
+                self.token_budget.count_tokens(system_prompt) + self.token_budget.count_tokens(full_prompt)
+            )
         
         logger.info(f"Constructed prompt with {len(full_prompt)} characters")
         logger.debug(f"Prompt preview: {full_prompt[:500]}...")
+
+        return full_prompt, chat_history
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  ef_search: int = None, probes: int = None, mode: str = None,
+                                  search_filter: VectorSearchFilter = None):
+        """Returns (answer, full_prompt, chat_history, cache_match) where cache_match
+        is "exact" / "semantic" for answers served from the answer cache, else None."""
+       
+        answer, full_prompt, chat_history = None, None, None
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # step 0 : answer cache, exact query first, then similar query embeddings
+        cache_params = self.get_answer_cache_params(limit=limit, ef_search=ef_search,
+                                                    probes=probes, mode=mode)
+        cached, cache_match, query_vector, generation = await self.lookup_answer_cache(
+            collection_name=collection_name, query=query, params=cache_params, search_filter=search_filter
+        )
+        if cached is not None:
+            logger.info(f"Answer cache hit ({cache_match}) for query: {query}")
+            return cached["answer"], cached["full_prompt"], cached["chat_history"], cache_match
+
+        # step 1 : retrieve related documents
+        logger.info(f"Searching for documents related to query: {query}")
+        retrieved_documents = await self.retrieve_documents(project=project,
+                                                            query=query,
+                                                            limit=limit,
+                                                            ef_search=ef_search,
+                                                            probes=probes,
+                                                            vector=query_vector,
+                                                            mode=mode,
+                                                            search_filter=search_filter)
+        
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            logger.warning("No documents retrieved from vector search")
+            return answer, full_prompt, chat_history, None
         
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
+        logger.info(f"Retrieved {len(retrieved_documents)} documents")
+        
+        # Log the first few retrieved docs to check relevance
+        #for idx, doc in enumerate(retrieved_documents[:3]):
+         #   text_preview = str(doc.get("text", "") or doc.get("content", ""))[:200]
+          #  logger.debug(f"Doc {idx}: {text_preview}...")
+        
+        # step 2 : construct LLM prompt
+        full_prompt, chat_history = self.construct_rag_prompt(query=query,
+                                                              retrieved_documents=retrieved_documents)
+        
+        # step3: Retrieve the Answer
+        answer = await self.generation_client.agenerate_text(
             prompt=full_prompt,
             chat_history=chat_history
         )
+
+        if answer and self.use_answer_cache(search_filter=search_filter):
+            self.answer_cache.set(collection_name=collection_name, query=query, params=cache_params,
+                                  vector=query_vector, generation=generation, answer=answer,
+                                  full_prompt=full_prompt, chat_history=chat_history)
         
-        return answer, full_prompt, chat_history
+        return answer, full_prompt, chat_history, None
+
+    async def stream_rag_answer(self, project: Project, query: str, limit: int = 10,
+                                ef_search: int = None, probes: int = None, mode: str = None,
+                                search_filter: VectorSearchFilter = None):
+        """
+        Async generator of (event, data) pairs: "retrieval" with the retrieved
+        documents, "token" for each generated text delta, then "done" with the
+        full answer. Time to first token is measured from the call.
+        """
+        started_at = time.perf_counter()
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        cache_params = self.get_answer_cache_params(limit=limit, ef_search=ef_search,
+                                                    probes=probes, mode=mode)
+        cached, cache_match, query_vector, generation = await self.lookup_answer_cache(
+            collection_name=collection_name, query=query, params=cache_params, search_filter=search_filter
+        )
+        if cached is not None:
+            yield "retrieval", {"documents": [], "cache_match": cache_match}
+            LLM_TIME_TO_FIRST_TOKEN.labels(cache_hit="true").observe(time.perf_counter() - started_at)
+            yield "token", {"text": cached["answer"]}
+            yield "done", {"answer": cached["answer"], "cache_hit": True, "cache_match": cache_match}
+            return
+
+        retrieved_documents = await self.retrieve_documents(project=project,
+                                                            query=query,
+                                                            limit=limit,
+                                                            ef_search=ef_search,
+                                                            probes=probes,
+                                                            vector=query_vector,
+                                                            mode=mode,
+                                                            search_filter=search_filter)
+        yield "retrieval", {"documents": retrieved_documents or [], "cache_match": None}
+
+        if not retrieved_documents:
+            logger.warning("No documents retrieved from vector search")
+            yield "done", {"answer": None, "cache_hit": False, "cache_match": None}
+            return
+
+        full_prompt, chat_history = self.construct_rag_prompt(query=query,
+                                                              retrieved_documents=retrieved_documents)
+
+        answer_parts = []
+        async for text in self.generation_client.astream_text(prompt=full_prompt,
+                                                              chat_history=chat_history):
+            if not answer_parts:
+                LLM_TIME_TO_FIRST_TOKEN.labels(cache_hit="false").observe(time.perf_counter() - started_at)
+            answer_parts.append(text)
+            yield "token", {"text": text}
+
+        answer = "".join(answer_parts) or None
+        if answer and self.use_answer_cache(search_filter=search_filter):
+            self.answer_cache.set(collection_name=collection_name, query=query, params=cache_params,
+                                  vector=query_vector, generation=generation, answer=answer,
+                                  full_prompt=full_prompt, chat_history=chat_history)
+
+        yield "done", {"answer": answer, "cache_hit": False, "cache_match": None}
 
 
-    
\ No newline at end of file
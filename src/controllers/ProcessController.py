@@ -1,17 +1,106 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 import os 
+import hashlib
 from langchain_community.document_loaders import TextLoader, PyMuPDFLoader 
 from models import ProcessingEnums
+from models.enums.ProcessingEnums import TextSplitterLengthEnums
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from .TextSplitter import TextSplitter
+from stores.llm.TokenBudgetService import create_tokenizer
 from typing import List
 from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import logging
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class Document:
     page_content: str
     metadata: dict
 
+_file_processing_executor = None
+_embedding_tokenizer = None
+
+def get_embedding_tokenizer(settings):
+    """Tokenizer of the embedding model, created once per process for token-sized chunks."""
+    global _embedding_tokenizer
+    if _embedding_tokenizer is None:
+        _embedding_tokenizer = create_tokenizer(provider=settings.EMBEDDING_BACKEND,
+                                                model_id=settings.EMBEDDING_MODEL_ID,
+                                                tokenizer_path=settings.EMBEDDING_TOKENIZER_PATH)
+    return _embedding_tokenizer
+
+def get_file_processing_executor(max_workers: int = None) -> Executor:
+    """
+    Process pool shared by every task in this process for CPU-bound load+split.
+    Falls back to a thread pool where child processes can not be started
+    (e.g. daemonic Celery pool workers).
+    """
+    global _file_processing_executor
+
+    if _file_processing_executor is None:
+        max_workers = max_workers or os.cpu_count() or 1
+        executor = None
+        try:
+            executor = ProcessPoolExecutor(max_workers=max_workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            # Children start lazily, make sure they can start at all
+            executor.submit(os.getpid).result(timeout=120)
+            _file_processing_executor = executor
+        except Exception as e:
+            logger.warning(f"Can not start a process pool, using threads for file processing: {str(e)}")
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            _file_processing_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                           thread_name_prefix="file-processing")
+
+    return _file_processing_executor
+
+def shutdown_file_processing_executor():
+    global _file_processing_executor
+
+    if _file_processing_executor is not None:
+        _file_processing_executor.shutdown(wait=True, cancel_futures=True)
+        _file_processing_executor = None
+
+def load_and_split_file(project_id: str, file_id: str, chunk_size: int, chunk_overlap: int):
+    """Load and split one file; module level so it can run in a process pool."""
+    process_controller = ProcessController(project_id=project_id)
+
+    file_content = process_controller.get_file_content(file_id=file_id)
+    if file_content is None:
+        return None
+
+    return process_controller.process_file_content(
+        file_content=file_content,
+        file_id=file_id,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+def iter_file_chunk_batches(project_id: str, file_id: str, chunk_size: int,
+                            chunk_overlap: int, batch_size: int = 1000):
+    """
+    Stream a file as lists of at most batch_size chunks. Pages are read lazily
+    and split incrementally, memory stays bounded by one page plus one batch.
+    """
+    process_controller = ProcessController(project_id=project_id)
+
+    batch = []
+    for chunk in process_controller.iter_file_chunks(file_id=file_id,
+                                                     chunk_size=chunk_size,
+                                                     chunk_overlap=chunk_overlap):
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
 class ProcessController(BaseController):
     def __init__(self, project_id: str):
         super().__init__()
@@ -23,6 +112,21 @@ class ProcessController(BaseController):
     def get_file_extension(self, file_id: str ) -> str:
         return os.path.splitext(file_id)[-1]
     
+    def get_file_path(self, file_id: str) -> str:
+        return os.path.join(self.project_path, file_id)
+
+    def get_file_hash(self, file_id: str, block_size: int = 1024 * 1024):
+        """sha256 of the stored file, None when the file is gone."""
+        file_path = self.get_file_path(file_id=file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                content_hash.update(block)
+        return content_hash.hexdigest()
+
     def get_file_loader(self, file_id: str):
         file_extension = self.get_file_extension(file_id=file_id)
         file_path = os.path.join(self.project_path, file_id)
@@ -42,6 +146,54 @@ class ProcessController(BaseController):
         loader = self.get_file_loader(file_id=file_id)
         return loader.load() if loader else None
     
+    def iter_file_pages(self, file_id: str, text_block_size: int = 1024 * 1024):
+        """Yield the file one page at a time, text files in blocks of whole lines."""
+        file_path = self.get_file_path(file_id=file_id)
+        if not os.path.exists(file_path):
+            return
+
+        if self.get_file_extension(file_id=file_id) == ProcessingEnums.TXT.value:
+            # Blocks drop their last newline, joining them back gives the file offsets
+            with open(file_path, encoding='utf-8') as f:
+                block = []
+                block_size = 0
+                for line in f:
+                    block.append(line)
+                    block_size += len(line)
+                    if block_size >= text_block_size:
+                        yield Document(page_content="".join(block).removesuffix("\n"),
+                                       metadata={"source": file_path, "page": 0})
+                        block = []
+                        block_size = 0
+                if block:
+                    yield Document(page_content="".join(block).removesuffix("\n"),
+                                   metadata={"source": file_path, "page": 0})
+            return
+
+        loader = self.get_file_loader(file_id=file_id)
+        if loader:
+            yield from loader.lazy_load()
+
+    def get_text_splitter(self, chunk_size: int, chunk_overlap: int) -> TextSplitter:
+        length_unit = self.app_settings.TEXT_SPLITTER_LENGTH_UNIT
+        token_counter = None
+        if length_unit == TextSplitterLengthEnums.TOKEN.value:
+            token_counter = get_embedding_tokenizer(self.app_settings).count
+
+        return TextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_unit=length_unit,
+            token_counter=token_counter
+        )
+
+    def iter_file_chunks(self, file_id: str, chunk_size: int = 100, chunk_overlap: int = 20):
+        text_splitter = self.get_text_splitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        pages = ((page.page_content, page.metadata) for page in self.iter_file_pages(file_id=file_id))
+
+        for chunk_text, chunk_metadata in text_splitter.iter_chunks(pages):
+            yield Document(page_content=chunk_text, metadata=chunk_metadata)
+
     def process_file_content(self, file_content: list, file_id: int,
                              chunk_size: int = 100, chunk_overlap: int = 20):
         # text_splitter = RecursiveCharacterTextSplitter(
@@ -51,21 +203,18 @@ class ProcessController(BaseController):
         #     separators=["\n\n", "\n", " ", ""]
         # )
 
-        file_content_texts = [rec.page_content for rec in file_content]
-        file_content_metadata = [rec.metadata for rec in file_content]
-
         # chunks = text_splitter.create_documents(
         #     file_content_texts,
         #     metadatas=file_content_metadata
         # )
-        
-        chunks = self.process_simpler_splitter(
-            texts=file_content_texts,
-            metadatas=file_content_metadata,
-            chunk_size=chunk_size,
-        )
 
-        return chunks
+        text_splitter = self.get_text_splitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        pages = ((rec.page_content, rec.metadata) for rec in file_content)
+
+        return [
+            Document(page_content=chunk_text, metadata=chunk_metadata)
+            for chunk_text, chunk_metadata in text_splitter.iter_chunks(pages)
+        ]
 
     def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
         
@@ -0,0 +1,206 @@
+from models.enums.ProcessingEnums import TextSplitterLengthEnums
+from typing import Callable, Iterable, Iterator, List, Tuple
+import bisect
+import re
+
+# Sentence ends for English and Arabic (؟ question mark, ۔ full stop), or a line break
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?؟۔])\s+|\s*\n\s*")
+# Words (Latin or Arabic script) and single punctuation marks
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+WHITESPACE = re.compile(r"\s")
+
+
+def count_tokens(text: str) -> int:
+    return sum(1 for _ in TOKEN_PATTERN.finditer(text))
+
+
+class TextSplitter:
+    """
+    Sentence-aware splitter with real overlap.
+
+    Text is cut into sentence units by their offsets. Only sentences longer
+    than chunk_size are split, at whitespace, into pieces of at most
+    chunk_size. Units are then packed greedily into chunks of at most
+    chunk_size characters or tokens. Each chunk starts with the previous
+    chunk's trailing whole sentences that fit in chunk_overlap. Chunks are
+    slices of the source text, so building them takes linear time.
+
+    Token lengths come from token_counter, e.g. the embedding model's
+    tokenizer, and default to the TOKEN_PATTERN approximation.
+
+    Pages are consumed lazily. A chunk can span a page break and records
+    its start and end page and its character offsets in the document. The
+    document is the pages joined by a newline.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int = 0,
+                 length_unit: str = TextSplitterLengthEnums.CHAR.value,
+                 token_counter: Callable[[str], int] = None):
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_overlap = max(0, min(chunk_overlap or 0, self.chunk_size - 1))
+        self.length_unit = length_unit
+        self.is_token_unit = length_unit == TextSplitterLengthEnums.TOKEN.value
+        self.token_counter = token_counter or count_tokens
+
+    def get_unit_size(self, text: str, start: int, end: int) -> int:
+        return self.token_counter(text[start:end]) if self.is_token_unit else end - start
+
+    def split_long_unit(self, text: str, start: int, end: int) -> List[Tuple[int, int, int]]:
+        units = []
+
+        if self.is_token_unit:
+            # Pieces are cut between words, a word costs its own token count
+            piece_start, piece_end, piece_tokens = None, None, 0
+            for match in TOKEN_PATTERN.finditer(text, start, end):
+                word_tokens = 1 if self.token_counter is count_tokens else self.token_counter(match.group())
+                if piece_start is not None and piece_tokens + word_tokens > self.chunk_size:
+                    units.append((piece_start, piece_end, piece_tokens))
+                    piece_start, piece_tokens = None, 0
+                if piece_start is None:
+                    piece_start = match.start()
+                piece_end = match.end()
+                piece_tokens += word_tokens
+            if piece_start is not None:
+                units.append((piece_start, piece_end, piece_tokens))
+            return units
+
+        while end - start > self.chunk_size:
+            # Last whitespace inside the window, hard cut when there is none
+            window_end = start + self.chunk_size
+            cut = text.rfind(" ", start + 1, window_end + 1)
+            if cut <= start:
+                cut = window_end
+
+            piece_end = cut
+            while piece_end > start and WHITESPACE.match(text, piece_end - 1):
+                piece_end -= 1
+            units.append((start, piece_end, piece_end - start))
+
+            start = cut
+            while start < end and WHITESPACE.match(text, start):
+                start += 1
+
+        if start < end:
+            units.append((start, end, end - start))
+        return units
+
+    def get_units(self, text: str) -> List[Tuple[int, int, int]]:
+        """(start, end, size) of every sentence unit of the text."""
+        units = []
+        start = 0
+        for boundary in list(SENTENCE_BOUNDARY.finditer(text)) + [None]:
+            end = boundary.start() if boundary else len(text)
+            while start < end and WHITESPACE.match(text, start):
+                start += 1
+            while end > start and WHITESPACE.match(text, end - 1):
+                end -= 1
+
+            if start < end:
+                size = self.get_unit_size(text, start, end)
+                if size > self.chunk_size:
+                    units.extend(self.split_long_unit(text, start, end))
+                else:
+                    units.append((start, end, size))
+
+            if boundary:
+                start = boundary.end()
+        return units
+
+    def pack_units(self, units: list, final: bool) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (first, last) unit index ranges of the chunks. Without final the
+        trailing units that can not fill a chunk yet are held back, and the
+        index of the first held back unit is returned through StopIteration.
+        """
+        # Prefix sums of the unit sizes for token lengths, characters use offsets
+        prefix = [0]
+        for _, _, size in units:
+            prefix.append(prefix[-1] + size)
+
+        def size_of(i: int, j: int) -> int:
+            if self.is_token_unit:
+                return prefix[j] - prefix[i]
+            return units[j - 1][1] - units[i][0]
+
+        i = 0
+        j = 0
+        count = len(units)
+        while i < count:
+            j = max(j, i + 1)
+            while j < count and size_of(i, j + 1) <= self.chunk_size:
+                j += 1
+
+            if j == count and not final:
+                return i
+
+            yield i, j
+            if j == count:
+                return count
+
+            # Step back over whole sentences while they fit in the overlap
+            # and still leave room for the next sentence
+            k = j
+            while (k - 1 > i and size_of(k - 1, j) <= self.chunk_overlap
+                   and size_of(k - 1, j + 1) <= self.chunk_size):
+                k -= 1
+            i = k
+
+        return count
+
+    def iter_chunks(self, pages: Iterable[Tuple[str, dict]]) -> Iterator[Tuple[str, dict]]:
+        """Consume (page_text, page_metadata) pairs, yield (chunk_text, chunk_metadata)."""
+        buffer = ""
+        buffer_offset = 0           # document offset of buffer[0]
+        document_length = 0
+        page_offsets = []           # document offset where each buffered page starts
+        page_numbers = []
+
+        def emit(final: bool):
+            nonlocal buffer, buffer_offset, page_offsets, page_numbers
+
+            units = self.get_units(buffer)
+            packer = self.pack_units(units, final=final)
+            while True:
+                try:
+                    first, last = next(packer)
+                except StopIteration as stop:
+                    consumed = stop.value
+                    break
+
+                start, end = units[first][0], units[last - 1][1]
+                doc_start, doc_end = buffer_offset + start, buffer_offset + end
+                yield buffer[start:end], {
+                    "page_start": page_numbers[bisect.bisect_right(page_offsets, doc_start) - 1],
+                    "page_end": page_numbers[bisect.bisect_right(page_offsets, doc_end - 1) - 1],
+                    "start_index": doc_start,
+                    "end_index": doc_end,
+                }
+
+            # Carry the held back text into the next page
+            carry_from = units[consumed][0] if consumed < len(units) else len(buffer)
+            buffer = buffer[carry_from:]
+            buffer_offset += carry_from
+
+            keep = max(0, bisect.bisect_right(page_offsets, buffer_offset) - 1)
+            page_offsets = page_offsets[keep:]
+            page_numbers = page_numbers[keep:]
+
+        for page_no, (page_text, page_metadata) in enumerate(pages):
+            if page_no:
+                # Pages are joined with a newline in document offsets
+                buffer += "\n"
+                document_length += 1
+
+            page_offsets.append(document_length)
+            page_numbers.append((page_metadata or {}).get("page", page_no))
+
+            buffer += page_text
+            document_length += len(page_text)
+
+            yield from emit(final=False)
+
+        if buffer:
+            yield from emit(final=True)
+
+    def split_text(self, text: str, metadata: dict = None) -> List[Tuple[str, dict]]:
+        return list(self.iter_chunks([(text, metadata or {})]))
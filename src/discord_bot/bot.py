@@ -7,6 +7,7 @@ import aiohttp
 import discord
 from discord.ext import commands
 import re
+import json
 
 load_dotenv()
 
@@ -20,10 +21,12 @@ LOG.setLevel(logging.INFO)
 # Constants
 API_TIMEOUT = 30
 MAX_DISCORD_MESSAGE_LENGTH = 1900
+STREAM_EDIT_INTERVAL = 1.0  # seconds between message edits while streaming
 
 # Environment variables
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 RAG_API_URL = os.getenv("RAG_API_URL", "http://127.0.0.1:8000/api/v1/nlp/index/answer")
+RAG_STREAM_API_URL = os.getenv("RAG_STREAM_API_URL", f"{RAG_API_URL}/stream")
 PROJECT_ID = os.getenv("RAG_PROJECT_ID", "15")
 DEFAULT_LIMIT = int(os.getenv("RAG_DEFAULT_LIMIT", "3"))
 COMMAND_PREFIX = os.getenv("DISCORD_PREFIX", "!")
@@ -70,6 +73,29 @@ async def fetch_rag_answer(question: str) -> Optional[dict]:
     
     return None
 
+async def stream_rag_answer(question: str):
+    """Yield (event, data) pairs from the RAG API server-sent events stream."""
+    url = f"{RAG_STREAM_API_URL}/{PROJECT_ID}"
+    payload = {"text": question, "limit": DEFAULT_LIMIT}
+
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=API_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.post(url, json=payload) as resp:
+            if resp.status != 200:
+                error_text = await resp.text()
+                LOG.error(f"RAG stream API error {resp.status}: {error_text}")
+                yield "error", {"error": f"API error: {resp.status}"}
+                return
+
+            event = "message"
+            async for raw_line in resp.content:
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    yield event, json.loads(line[len("data:"):].strip())
+                    event = "message"
+
 async def send_long_reply(ctx, text: str):
     """Send a long message split into multiple Discord replies if necessary."""
     if not text:
@@ -194,6 +220,51 @@ async def handle_question(ctx, question: str, show_full: bool = False):
         smart_answer = extract_smart_answer(answer_text, question)
         await send_long_reply(ctx, f"**💡 Answer:**\n{smart_answer}")
 
+async def handle_question_stream(ctx, question: str):
+    """Stream the full answer into one message, editing it as tokens arrive."""
+    message = None
+    answer_text = ""
+    last_edit = 0.0
+    loop = asyncio.get_running_loop()
+
+    try:
+        async with ctx.channel.typing():
+            async for event, data in stream_rag_answer(question):
+                if event == "error":
+                    await ctx.reply(f"❌ Error: {data.get('error', 'Unknown error')}")
+                    return
+
+                if event == "token":
+                    answer_text += data.get("text", "")
+                    header = f"**Full Answer:**\n{answer_text}"
+                    if len(header) <= MAX_DISCORD_MESSAGE_LENGTH and loop.time() - last_edit >= STREAM_EDIT_INTERVAL:
+                        if message is None:
+                            message = await ctx.reply(header)
+                        else:
+                            await message.edit(content=header)
+                        last_edit = loop.time()
+
+                if event == "done":
+                    answer_text = data.get("answer") or answer_text
+    except Exception as e:
+        LOG.warning("Streaming answer failed, falling back to the blocking API: %s", e)
+        if not answer_text:
+            await handle_question(ctx, question, show_full=True)
+            return
+
+    if not answer_text or "Could not generate" in answer_text:
+        await ctx.reply("❓ I couldn't find an answer in the available documents.")
+        return
+
+    full_text = f"**Full Answer:**\n{answer_text}"
+    if message is not None and len(full_text) <= MAX_DISCORD_MESSAGE_LENGTH:
+        await message.edit(content=full_text)
+    elif message is not None:
+        await message.edit(content=full_text[:MAX_DISCORD_MESSAGE_LENGTH])
+        await send_long_reply(ctx, full_text[MAX_DISCORD_MESSAGE_LENGTH:])
+    else:
+        await send_long_reply(ctx, full_text)
+
 @bot.event
 async def on_ready():
     LOG.info(f"✅ Bot logged in as {bot.user} (id: {bot.user.id})")
@@ -232,8 +303,8 @@ async def ask(ctx, *, question: str):
 
 @bot.command(name="ask_full", help="Ask a question with full context")
 async def ask_full(ctx, *, question: str):
-    """Get the full RAG answer with all context."""
-    await handle_question(ctx, question, show_full=True)
+    """Get the full RAG answer with all context, streamed as it is generated."""
+    await handle_question_stream(ctx, question)
 
 @bot.command(name="ping", help="Check bot latency")
 async def ping(ctx):
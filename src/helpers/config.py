@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List , Optional
+from typing import Dict, List , Optional
 
 class Settings(BaseSettings):
     APP_NAME: str
@@ -25,10 +25,48 @@ class Settings(BaseSettings):
     GENERATION_DEFAULT_MAX_TOKENS: int
     GENERATION_DEFAULT_TEMPERATURE: float
 
+    # Token budgeting
+    GENERATION_CONTEXT_WINDOW_TOKENS: int = 128000
+    GENERATION_TOKENIZER_PATH: Optional[str] = None  # tokenizer.json, tiktoken is used for OpenAI
+    EMBEDDING_TOKENIZER_PATH: Optional[str] = None
+    TOKEN_COUNT_CACHE_SIZE: int = 10000
+
+    # Shared async HTTP pool for LLM providers
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    LLM_HTTP_TIMEOUT: float = 60.0
+
+    # Embedding cache
+    EMBEDDING_CACHE_BACKEND: str = "postgres"
+    EMBEDDING_CACHE_LRU_MAX_MB: int = 64
+    EMBEDDING_CACHE_TTL_DAYS: int = 30
+    EMBEDDING_CACHE_SQLITE_PATH: str = "embedding_cache.db"
+
+    # RAG answer cache
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_TTL: float = 3600
+    ANSWER_CACHE_MAX_ENTRIES: int = 1000
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_REDIS_URL: Optional[str] = None
+
+    # Reranking between retrieval and prompt construction
+    RERANKER_BACKEND: str = "NONE"  # NONE, LEXICAL or ONNX
+    RERANKER_CANDIDATES: int = 30
+    RERANKER_TOP_N: int = 5
+    RERANKER_BATCH_SIZE: int = 16
+    RERANKER_ONNX_MODEL_DIR: Optional[str] = None
+    RERANKER_MAX_LENGTH: int = 512
+    RERANKER_NUM_THREADS: int = 0  # 0 -> onnxruntime default
+
     # Files
     FILE_ALLOWED_TYPES: List[str]
     FILE_MAX_SIZE_MB: int
     FILE_DEFAULT_CHUNK_SIZE: int
+    FILE_PROCESSING_POOL_SIZE: int = 0  # 0 -> one worker per CPU core
+    FILE_STREAMING_THRESHOLD_MB: int = 20  # 0 -> never stream
+    FILE_STREAMING_BATCH_SIZE: int = 1000
+    TEXT_SPLITTER_LENGTH_UNIT: str = "char"  # char or token
 
     # Mongo
     MONGO_URL: str
@@ -38,8 +76,39 @@ class Settings(BaseSettings):
     VECTOR_DB_BACKEND_LITERAL : Optional[List[str]] = None
     VECTOR_DB_BACKEND: str  
     VECTOR_DB_PATH: str 
+    VECTOR_DB_NUMPY_PATH: str = "numpy_db"
     VECTOR_DB_DISTANCE_METHOD: str 
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int
+    VECTOR_DB_COLLECTION_CACHE_TTL: float = 300
+    VECTOR_DB_PGVEC_HNSW_EF_SEARCH: Optional[int] = None
+    VECTOR_DB_PGVEC_IVFFLAT_PROBES: Optional[int] = None
+    VECTOR_DB_PGVEC_INSERT_MODE: str = "copy"
+    VECTOR_DB_PGVEC_COPY_BATCH_SIZE: int = 5000
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_IVFFLAT_LISTS: int = 100
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: Optional[str] = "512MB"
+    VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS: Optional[int] = 2
+    VECTOR_DB_PGVEC_INDEX_PROGRESS_INTERVAL: float = 5.0
+    VECTOR_DB_SEARCH_MODE: str = "vector"  # vector or hybrid
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIGS: List[str] = ["english", "arabic"]
+    VECTOR_DB_HYBRID_RRF_K: int = 60
+    VECTOR_DB_HYBRID_CANDIDATES: int = 50
+    VECTOR_DB_PGVEC_ITERATIVE_SCAN: str = "strict_order"  # off, strict_order or relaxed_order
+    VECTOR_DB_PGVEC_STORAGE: str = "vector"  # vector or halfvec
+    VECTOR_DB_PGVEC_QUANTIZATION: str = "none"  # none or binary
+    VECTOR_DB_PGVEC_BINARY_RESCORE_CANDIDATES: int = 100
+    VECTOR_DB_PGVEC_COLLECTION_STORAGE: Dict[str, Dict[str, str]] = {}
+
+    # Batch search
+    SEARCH_BATCH_MAX_QUERIES: int = 1000
+    SEARCH_BATCH_EMBEDDING_SIZE: int = 96
+
+    # Indexing
+    INDEXING_PAGE_SIZE: int = 50
+    INDEXING_EMBEDDING_CONCURRENCY: int = 4
+    INDEXING_QUEUE_SIZE: int = 8
 
     # Template 
     DEFAULT_LANG : str = "en"
@@ -60,6 +129,11 @@ class Settings(BaseSettings):
     CELERY_TASK_ACKS_LATE: bool
     CELERY_WORKER_CONCURRENCY: int
     CELERY_FLOWER_PASSWORD: str 
+    CELERY_WORKER_DB_POOL_SIZE: int = 5
+    CELERY_WORKER_DB_MAX_OVERFLOW: int = 5
+    WORKFLOW_FANOUT_ENABLED: bool = False
+    WORKFLOW_FANOUT_ASSETS_PER_TASK: int = 10
+    WORKFLOW_FANOUT_CHUNKS_PER_TASK: int = 5000
 
     class Config:
         env_file = ".env"
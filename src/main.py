@@ -4,11 +4,15 @@ from helpers.config import get_settings
 from motor.motor_asyncio import AsyncIOMotorClient  # pyright: ignore[reportMissingImports]
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderInterface import VectorDBProviderInterface
+from stores.vectordb.VectorDBEnums import VectorDBEnums
+from stores.reranker.RerankerProviderFactory import RerankerProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
 from sqlalchemy.ext.asyncio import create_async_engine ,AsyncSession
 from sqlalchemy.orm import sessionmaker
 import logging
 from utils.metrics import setup_metrics
+from utils.answer_cache import AnswerCache
+from utils.collection_generations import RedisCollectionGenerations, get_collection_generations_url
 
 app = FastAPI()
 
@@ -36,12 +40,12 @@ async def startup_span():
     )
 
     # Factories
-    llm_provider_factory = LLMProviderFactory(settings)
+    app.llm_provider_factory = LLMProviderFactory(settings)
     vectordb_provider_factory = VectorDBProviderInterface(config=settings,
                                                           db_client=app.db_client)
 
     # Generation client
-    app.generation_client = llm_provider_factory.create(
+    app.generation_client = app.llm_provider_factory.create(
         provider=settings.GENERATION_BACKEND
     )
 
@@ -51,9 +55,13 @@ async def startup_span():
     app.generation_client.set_generation_model(
         model_id=settings.GENERATION_MODEL_ID
     )
+    app.token_budget = app.llm_provider_factory.create_token_budget(
+        provider=settings.GENERATION_BACKEND,
+        model_id=settings.GENERATION_MODEL_ID
+    )
 
     # Embedding client
-    app.embedding_client = llm_provider_factory.create(
+    app.embedding_client = app.llm_provider_factory.create(
         provider=settings.EMBEDDING_BACKEND
     )
     
@@ -64,6 +72,10 @@ async def startup_span():
         model_id=settings.EMBEDDING_MODEL_ID,
         embedding_size=settings.EMBEDDING_MODEL_SIZE,
     )
+    app.embedding_client = app.llm_provider_factory.create_embedding_cache(
+        embedding_client=app.embedding_client,
+        db_client=app.db_client
+    )
 
     # Vector DB client
     app.vectordb_client = vectordb_provider_factory.create(
@@ -71,6 +83,34 @@ async def startup_span():
     )
     await app.vectordb_client.connect()
 
+    # Warn early if any collection search falls back to a sequential scan
+    if settings.VECTOR_DB_BACKEND == VectorDBEnums.PGVECTOR.value:
+        await app.vectordb_client.check_search_plans()
+
+    # Answer cache, dropped per collection whenever the collection is re-indexed or reset,
+    # here or (through the shared generation counters) in any other process
+    app.answer_cache = None
+    app.collection_generations = None
+    if settings.ANSWER_CACHE_ENABLED:
+        generations_url = get_collection_generations_url(settings)
+        if generations_url:
+            app.collection_generations = RedisCollectionGenerations(url=generations_url)
+            app.vectordb_client.collection_cache.add_change_listener(app.collection_generations.bump)
+        else:
+            app.logger.warning("No Redis for answer cache invalidation, changes made by workers "
+                               "only reach cached answers after ANSWER_CACHE_TTL")
+
+        app.answer_cache = AnswerCache(
+            ttl=settings.ANSWER_CACHE_TTL,
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            generations=app.collection_generations
+        )
+        app.vectordb_client.collection_cache.add_invalidation_listener(app.answer_cache.invalidate)
+
+    # Optional reranking of over-fetched candidates before the prompt is built
+    app.reranker = RerankerProviderFactory(settings).create(provider=settings.RERANKER_BACKEND)
+
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG
@@ -85,6 +125,9 @@ async def shutdown_span():
     # app.mongo_conn.close()
     await app.db_engine.dispose()
     await app.vectordb_client.disconnect()
+    await app.llm_provider_factory.close()
+    if app.collection_generations is not None:
+        await app.collection_generations.close()
 
 
 # -----------------------------
@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemas import Asset
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId  # pyright: ignore[reportMissingImports]
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
 
 class AssetModel(BaseDataModel):
     def __init__(self, db_client: object):
@@ -63,6 +63,46 @@ class AssetModel(BaseDataModel):
         #     for record in records
         # ]
     
+    async def get_assets_by_ids(self, asset_project_id: int, asset_ids: list):
+        async with self.db_client() as session:
+            stmt = select(Asset).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.asset_id.in_(asset_ids)
+            )
+            results = await session.execute(stmt)
+            records = results.scalars().all()
+        return records
+
+    async def get_asset_by_original_name(self, asset_project_id: int, asset_type: str,
+                                         original_filename: str):
+        async with self.db_client() as session:
+            stmt = select(Asset).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.asset_type == asset_type,
+                Asset.asset_config["original_filename"].astext == original_filename
+            ).order_by(Asset.asset_id.desc()).limit(1)
+
+            result = await session.execute(stmt)
+            record = result.scalar_one_or_none()
+        return record
+
+    async def update_asset(self, asset_id: int, **values):
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Asset).where(Asset.asset_id == asset_id).values(**values)
+                )
+
+    async def delete_assets(self, asset_ids: list):
+        if not asset_ids:
+            return 0
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    delete(Asset).where(Asset.asset_id.in_(asset_ids))
+                )
+        return result.rowcount
+
     async def get_asset_record(self, asset_project_id: str, asset_name: str):
         async with self.db_client() as session:
             stmt = select(Asset).where(
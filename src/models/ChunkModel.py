@@ -3,7 +3,9 @@ from .db_schemas import DataChunk
 from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId # pyright: ignore[reportMissingImports]
 from pymongo import InsertOne # pyright: ignore[reportMissingImports]
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, insert, delete, func
+from itertools import islice
+from typing import Iterable
 
 class ChunkModel(BaseDataModel):
     def __init__(self, db_client):
@@ -56,15 +58,46 @@ class ChunkModel(BaseDataModel):
         
         # return DataChunk(**result)
 
-    async def insert_many_chunks(self, chunks: list, batch_size: int = 100):
-        
+    @staticmethod
+    def get_chunk_row(chunk) -> dict:
+        if isinstance(chunk, dict):
+            return chunk
+        return {
+            "chunk_text": chunk.chunk_text,
+            "chunk_metadata": chunk.chunk_metadata,
+            "chunk_order": chunk.chunk_order,
+            "chunk_project_id": chunk.chunk_project_id,
+            "chunk_asset_id": chunk.chunk_asset_id,
+        }
+
+    async def insert_many_chunks(self, chunks: Iterable, batch_size: int = 1000,
+                                 return_ids: bool = False):
+        """
+        Bulk insert chunks (DataChunk objects or column dicts) with multi-row
+        INSERT statements of batch_size rows, all in one transaction. Only one
+        batch of rows is materialized at a time, so chunks can be a generator.
+        Returns the inserted count, or the new chunk ids in input order when return_ids.
+        """
+        stmt = insert(DataChunk)
+        if return_ids:
+            stmt = stmt.returning(DataChunk.chunk_id, sort_by_parameter_order=True)
+
+        inserted_count = 0
+        chunk_ids = []
+        chunks = iter(chunks)
         async with self.db_client() as session:
             async with session.begin():
-                for i in range(0, len(chunks), batch_size):
-                    batch = chunks[i:batch_size]
-                    session.add_all(batch)
-            await session.commit()
-        return len(chunks)
+                while True:
+                    batch = [self.get_chunk_row(chunk) for chunk in islice(chunks, batch_size)]
+                    if not batch:
+                        break
+
+                    result = await session.execute(stmt, batch)
+                    if return_ids:
+                        chunk_ids.extend(row.chunk_id for row in result)
+                    inserted_count += len(batch)
+
+        return chunk_ids if return_ids else inserted_count
     
         # for i in range(0, len(chunks), batch_size):
         #     batch = chunks[i:i+batch_size]
@@ -90,6 +123,31 @@ class ChunkModel(BaseDataModel):
 
         # return result.deleted_count
     
+    async def get_asset_chunk_ids(self, project_id: int, asset_ids: list) -> list:
+        if not asset_ids:
+            return []
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(DataChunk.chunk_id).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_asset_id.in_(asset_ids)
+                )
+            )
+            return [row.chunk_id for row in result]
+
+    async def delete_chunks_by_asset_ids(self, project_id: int, asset_ids: list) -> int:
+        if not asset_ids:
+            return 0
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    delete(DataChunk).where(
+                        DataChunk.chunk_project_id == project_id,
+                        DataChunk.chunk_asset_id.in_(asset_ids)
+                    )
+                )
+        return result.rowcount
+
     async def get_project_chunks(
         self,
         project_id: ObjectId,
@@ -111,15 +169,102 @@ class ChunkModel(BaseDataModel):
     
         # return [DataChunk(**rec) for rec in records]
     
-    async def get_total_chunks_count(self, project_id: ObjectId):
+    async def iter_project_chunks(
+        self,
+        project_id: int,
+        page_size: int = 50,
+        after_chunk_id: int = 0,
+        until_chunk_id: int = None,
+        asset_ids: list = None):
+        """Stream the project chunks page by page, ordered by chunk_id (keyset pagination).
+        Optionally stop at until_chunk_id (inclusive) and keep only the chunks of asset_ids."""
+        last_chunk_id = after_chunk_id or 0
+        while True:
+            async with self.db_client() as session:
+                stmt = (
+                    select(DataChunk)
+                    .where(
+                        DataChunk.chunk_project_id == project_id,
+                        DataChunk.chunk_id > last_chunk_id
+                    )
+                    .order_by(DataChunk.chunk_id)
+                    .limit(page_size)
+                )
+                if until_chunk_id is not None:
+                    stmt = stmt.where(DataChunk.chunk_id <= until_chunk_id)
+                if asset_ids is not None:
+                    stmt = stmt.where(DataChunk.chunk_asset_id.in_(asset_ids))
+                result = await session.execute(stmt)
+                records = result.scalars().all()
+
+            if not records:
+                break
+
+            yield records
+            last_chunk_id = records[-1].chunk_id
+    
+    async def get_total_chunks_count(self, project_id: ObjectId, after_chunk_id: int = 0,
+                                     until_chunk_id: int = None, asset_ids: list = None):
         total_count = 0
         async with self.db_client() as session:
-            count_sql = select(func.count(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            count_sql = select(func.count(DataChunk.chunk_id)).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_id > (after_chunk_id or 0)
+            )
+            if until_chunk_id is not None:
+                count_sql = count_sql.where(DataChunk.chunk_id <= until_chunk_id)
+            if asset_ids is not None:
+                count_sql = count_sql.where(DataChunk.chunk_asset_id.in_(asset_ids))
             record_count = await session.execute(count_sql)
             total_count = record_count.scalar()
 
         return total_count
 
+    async def get_max_chunk_id(self, project_id: int) -> int:
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(func.max(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            )
+            return result.scalar() or 0
+
+    async def get_chunk_id_ranges(self, project_id: int, after_chunk_id: int = 0,
+                                  range_size: int = 5000, asset_ids: list = None):
+        """Split the project chunks after after_chunk_id (only those of asset_ids, if given)
+        into consecutive (after_chunk_id, until_chunk_id] ranges of about range_size chunks each."""
+        chunk_filters = [
+            DataChunk.chunk_project_id == project_id,
+            DataChunk.chunk_id > (after_chunk_id or 0)
+        ]
+        if asset_ids is not None:
+            chunk_filters.append(DataChunk.chunk_asset_id.in_(asset_ids))
+
+        numbered = (
+            select(
+                DataChunk.chunk_id,
+                func.row_number().over(order_by=DataChunk.chunk_id).label("row_no"),
+                func.count().over().label("total_rows")
+            )
+            .where(*chunk_filters)
+            .subquery()
+        )
+        stmt = (
+            select(numbered.c.chunk_id)
+            .where((numbered.c.row_no % range_size == 0) | (numbered.c.row_no == numbered.c.total_rows))
+            .order_by(numbered.c.chunk_id)
+        )
+
+        async with self.db_client() as session:
+            result = await session.execute(stmt)
+            range_ends = [row.chunk_id for row in result]
+
+        ranges = []
+        range_start = after_chunk_id or 0
+        for range_end in range_ends:
+            if range_end > range_start:
+                ranges.append((range_start, range_end))
+                range_start = range_end
+        return ranges
+
 
 
     
\ No newline at end of file
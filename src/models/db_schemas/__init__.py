@@ -9,3 +9,4 @@
 
 from models.db_schemas.minirag.schemes import Project
 from models.db_schemas.minirag.schemes import Asset , DataChunk , RetrievedDocument
+from models.db_schemas.minirag.schemes import EmbeddingCacheEntry
@@ -0,0 +1,27 @@
+"""Add (chunk_project_id, chunk_id) index for keyset pagination
+
+Revision ID: 5f0c2a9e7d41
+Revises: be91c42d1b21
+Create Date: 2026-10-17 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0c2a9e7d41'
+down_revision: Union[str, Sequence[str], None] = 'be91c42d1b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_chunk_project_id_chunk_id', 'chunks', ['chunk_project_id', 'chunk_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_chunk_project_id_chunk_id', table_name='chunks')
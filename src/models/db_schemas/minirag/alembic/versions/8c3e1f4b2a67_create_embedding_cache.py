@@ -0,0 +1,38 @@
+"""Create embedding_cache table
+
+Revision ID: 8c3e1f4b2a67
+Revises: 5f0c2a9e7d41
+Create Date: 2026-10-17 14:03:52.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3e1f4b2a67'
+down_revision: Union[str, Sequence[str], None] = '5f0c2a9e7d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embedding_cache',
+    sa.Column('model_id', sa.String(length=255), nullable=False),
+    sa.Column('document_type', sa.String(length=20), nullable=False),
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('embedding', postgresql.ARRAY(sa.REAL()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('model_id', 'document_type', 'text_hash')
+    )
+    op.create_index('ix_embedding_cache_created_at', 'embedding_cache', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_embedding_cache_created_at', table_name='embedding_cache')
+    op.drop_table('embedding_cache')
@@ -0,0 +1,28 @@
+"""Generate chunks.chunk_uuid in the database
+
+Revision ID: a1d4e7c9b352
+Revises: 8c3e1f4b2a67
+Create Date: 2026-10-17 16:21:07.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d4e7c9b352'
+down_revision: Union[str, Sequence[str], None] = '8c3e1f4b2a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('chunks', 'chunk_uuid', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('chunks', 'chunk_uuid', server_default=None)
@@ -0,0 +1,57 @@
+"""Add a generated full-text column and GIN index to pgvector collections
+
+Revision ID: c7f2b9d4e1a8
+Revises: a1d4e7c9b352
+Create Date: 2026-10-17 18:42:13.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f2b9d4e1a8'
+down_revision: Union[str, Sequence[str], None] = 'a1d4e7c9b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Collections are created at runtime, so every existing pgvector_* table is altered.
+# Matches the default VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIGS (english, arabic).
+TSVECTOR_EXPRESSION = (
+    "to_tsvector('english'::regconfig, coalesce(text, '')) || "
+    "to_tsvector('arabic'::regconfig, coalesce(text, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text(f"""
+        DO $$
+        DECLARE table_name text;
+        BEGIN
+            FOR table_name IN SELECT tablename FROM pg_tables WHERE tablename LIKE 'pgvector\\_%' LOOP
+                EXECUTE format(
+                    'ALTER TABLE %I ADD COLUMN IF NOT EXISTS text_search tsvector '
+                    'GENERATED ALWAYS AS ({TSVECTOR_EXPRESSION.replace("'", "''")}) STORED',
+                    table_name
+                );
+                EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I USING gin (text_search)',
+                               table_name || '_text_search_idx', table_name);
+            END LOOP;
+        END $$;
+    """))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("""
+        DO $$
+        DECLARE table_name text;
+        BEGIN
+            FOR table_name IN SELECT tablename FROM pg_tables WHERE tablename LIKE 'pgvector\\_%' LOOP
+                EXECUTE format('ALTER TABLE %I DROP COLUMN IF EXISTS text_search', table_name);
+            END LOOP;
+        END $$;
+    """))
@@ -0,0 +1,46 @@
+"""Add a GIN index on metadata to pgvector collections for filtered search
+
+Revision ID: e3a8d5c1f720
+Revises: c7f2b9d4e1a8
+Create Date: 2026-10-17 21:05:37.618204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a8d5c1f720'
+down_revision: Union[str, Sequence[str], None] = 'c7f2b9d4e1a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Collections are created at runtime, so every existing pgvector_* table is indexed
+    op.execute(sa.text("""
+        DO $$
+        DECLARE table_name text;
+        BEGIN
+            FOR table_name IN SELECT tablename FROM pg_tables WHERE tablename LIKE 'pgvector\\_%' LOOP
+                EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I USING gin (metadata jsonb_path_ops)',
+                               table_name || '_metadata_idx', table_name);
+            END LOOP;
+        END $$;
+    """))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("""
+        DO $$
+        DECLARE table_name text;
+        BEGIN
+            FOR table_name IN SELECT tablename FROM pg_tables WHERE tablename LIKE 'pgvector\\_%' LOOP
+                EXECUTE format('DROP INDEX IF EXISTS %I', table_name || '_metadata_idx');
+            END LOOP;
+        END $$;
+    """))
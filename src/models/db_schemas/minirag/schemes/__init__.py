@@ -3,3 +3,4 @@ from .asset import Asset
 from .datachunk import DataChunk, RetrievedDocument
 from .project import Project
 from .celery_task_execution import CeleryTaskExecution
+from .embedding_cache import EmbeddingCacheEntry
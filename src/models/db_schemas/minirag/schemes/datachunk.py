@@ -1,17 +1,17 @@
 from .minirag_base import SQLAIchemyBase
 from sqlalchemy import Column, DateTime, ForeignKey, Index
-from sqlalchemy import Integer, String, func
+from sqlalchemy import Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
-import uuid
 
 class DataChunk(SQLAIchemyBase):
 
     __tablename__ = "chunks"
 
     chunk_id = Column(Integer, primary_key=True, autoincrement=True)
-    chunk_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+    # Generated by Postgres so bulk inserts need no per-row Python default
+    chunk_uuid = Column(UUID(as_uuid=True), server_default=text("gen_random_uuid()"), unique=True, nullable=False)
     
     chunk_text = Column(String, nullable=False)
     chunk_metadata = Column(JSONB, nullable=False)
@@ -28,7 +28,8 @@ class DataChunk(SQLAIchemyBase):
 
     __table_args__  = (
         Index("idx_chunk_project_id",chunk_project_id),
-        Index("idx_chunk_asset_id", chunk_asset_id)
+        Index("idx_chunk_asset_id", chunk_asset_id),
+        Index("idx_chunk_project_id_chunk_id", chunk_project_id, chunk_id)
     )
 
 class RetrievedDocument(BaseModel):
@@ -0,0 +1,21 @@
+from .minirag_base import SQLAIchemyBase
+from sqlalchemy import Column, DateTime, Index
+from sqlalchemy import String, REAL, func
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+class EmbeddingCacheEntry(SQLAIchemyBase):
+    __tablename__ = "embedding_cache"
+
+    # (model, document type, SHA-256 of the processed text) identifies an embedding
+    model_id = Column(String(255), primary_key=True)
+    document_type = Column(String(20), primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+
+    embedding = Column(ARRAY(REAL), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_embedding_cache_created_at', created_at),
+    )
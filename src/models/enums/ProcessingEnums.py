@@ -4,4 +4,8 @@ class ProcessingEnums(Enum):
 
     TXT= ".txt"
     PDF= ".pdf"
-    
\ No newline at end of file
+    
+class TextSplitterLengthEnums(Enum):
+
+    CHAR= "char"
+    TOKEN= "token"
@@ -8,6 +8,7 @@ class ResponseSingnals(Enum):
     FILE_VALIDATION_FAILED = "File validation failed."
     FILE_UPLOAD_SUCCESS = "File uploaded successfully."
     FILE_UPLOAD_FAILED = "File upload failed."
+    FILE_UPLOAD_UNCHANGED = "File already uploaded with the same content."
     PROCESSING_SUCCESS = "File processed successfully."
     PROCESSING_FAIELD = "File processing failed."
     NO_FILES_ERROR = "Not Found Files"
@@ -15,10 +16,13 @@ class ResponseSingnals(Enum):
     PROJECT_NOT_FOUND_ERROR = "Project not found"
     INSERT_INTO_VECTORDB_ERROR = "Insert into vector DB Error"
     INSERT_INTO_VECTORDB_SUCCESS = "Insert into vector DB Success"
+    VECTORDB_INDEX_BUILD_PROGRESS = "Vector DB index build in progress"
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "Vector DB Search Error"
     VECTOTDB_SEARCH_SUCCESS = "Vector DB Search Success"
     RAG_ANSWER_ERROR = "Rag answer error"
     RAG_ANSWER_SUCCESS = "Rag answer success"
     DATA_PUSH_TASK_READY = "Data push task is ready"
-    PROCESS_AND_PUSH_WORKFLOW_STARTED = "Process and push workflow started"
\ No newline at end of file
+    PROCESS_AND_PUSH_WORKFLOW_STARTED = "Process and push workflow started"
+    WORKFLOW_NOT_FOUND_ERROR = "Workflow not found"
+    WORKFLOW_STATUS_RETRIEVED = "Workflow status retrieved"
\ No newline at end of file
@@ -5,6 +5,8 @@ from controllers import DataController, ProjectController, ProcessController
 from models import ResponseSingnals
 import aiofiles
 import os
+import uuid
+import hashlib
 import logging
 from .schemas.data import ProcessRequest
 from models.ProjectModel import ProjectModel
@@ -14,7 +16,9 @@ from models.AssetModel import AssetModel
 from models.enums.AssetTypeEnum import AssetTypeEnum
 from controllers import NLPController
 from tasks.file_processing import process_project_files
-from tasks.process_workflow import process_and_push_workflow
+from tasks.process_workflow import process_and_push_workflow, process_and_push_fanout_workflow
+from tasks.process_workflow import FANOUT_WORKFLOW_TASK_NAME
+from utils.idempotency_manager import IdempotencyManager
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -28,6 +32,7 @@ async def upload_data(
     request: Request,
     project_id: int,
     file : UploadFile,
+    replace: bool = False,
     settings: Settings = Depends(get_settings)):
 
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -53,12 +58,14 @@ async def upload_data(
         project_id=project_id
     )
 
+    content_hash = hashlib.sha256()
     try:
         async with aiofiles.open(file_path, 'wb') as f:
             while True:
                 chunk = await file.read(settings.FILE_DEFAULT_CHUNK_SIZE)
                 if not chunk:
                     break
+                content_hash.update(chunk)
                 await f.write(chunk)
     except Exception as e:
         logger.error(f"File upload failed: {e}")
@@ -73,12 +80,59 @@ async def upload_data(
     asset_model = await AssetModel.create_instance(
         db_client=request.app.db_client
     )
- 
+
+    # With ?replace=true re-uploading a file under the same name replaces that
+    # asset's content (and file_id), processing then only re-chunks assets whose
+    # content_hash changed. Otherwise every upload is a new asset
+    original_filename = data_controller.get_clean_file_name(original_filename=file.filename)
+    asset_config = {
+        "content_hash": content_hash.hexdigest(),
+        "original_filename": original_filename
+    }
+
+    asset_record = None
+    if replace:
+        asset_record = await asset_model.get_asset_by_original_name(
+            asset_project_id=project.project_id,
+            asset_type=AssetTypeEnum.File.value,
+            original_filename=original_filename
+        )
+
+    if asset_record is not None:
+        previous_config = asset_record.asset_config or {}
+
+        if previous_config.get("content_hash") == asset_config["content_hash"]:
+            os.remove(file_path)
+            return JSONResponse(
+                content={
+                    "signal": ResponseSingnals.FILE_UPLOAD_UNCHANGED.value,
+                    "file_id": str(asset_record.asset_id),
+                }
+            )
+
+        previous_file_path = os.path.join(project_dir_path, asset_record.asset_name)
+        await asset_model.update_asset(
+            asset_id=asset_record.asset_id,
+            asset_name=file_id,
+            asset_size=os.path.getsize(file_path),
+            asset_config={**previous_config, **asset_config}
+        )
+        if os.path.exists(previous_file_path):
+            os.remove(previous_file_path)
+
+        return JSONResponse(
+            content={
+                "signal": ResponseSingnals.FILE_UPLOAD_SUCCESS.value,
+                "file_id": str(asset_record.asset_id),
+            }
+        )
+
     asset_resource = Asset(
         asset_project_id=project.project_id,
         asset_type=AssetTypeEnum.File.value,
         asset_name=file_id,
-        asset_size=os.path.getsize(file_path)
+        asset_size=os.path.getsize(file_path),
+        asset_config=asset_config
     )
 
     asset_record = await asset_model.create_asset(
@@ -239,12 +293,34 @@ async def process_data(request: Request,project_id: int,process_request: Process
 
 
 @data_router.post("/process-and-push/{project_id}")
-async def process_and_push_endpoint(request: Request,project_id: int, process_request: ProcessRequest = Body(...)):
+async def process_and_push_endpoint(request: Request,project_id: int, process_request: ProcessRequest = Body(...),
+                                    settings: Settings = Depends(get_settings)):
 
     chunk_size = process_request.chunk_size
     chunk_overlap = process_request.overlap_size
     do_reset = process_request.do_reset
 
+    fanout = process_request.fanout
+    if fanout is None:
+        fanout = settings.WORKFLOW_FANOUT_ENABLED
+
+    # A single file gains nothing from fan-out
+    if fanout and not process_request.file_id:
+        workflow_task = process_and_push_fanout_workflow.delay(
+            project_id=project_id,
+            overlap_size=chunk_overlap,
+            chunk_size=chunk_size,
+            do_reset=do_reset
+        )
+
+        return JSONResponse(
+            content={
+                "signal": ResponseSingnals.PROCESS_AND_PUSH_WORKFLOW_STARTED.value,
+                "workflow_task_id": workflow_task.id,
+                "fanout": True
+            }
+        )
+
     workflow_task = process_and_push_workflow.delay(
         project_id=project_id,
         file_id=process_request.file_id,
@@ -259,3 +335,31 @@ async def process_and_push_endpoint(request: Request,project_id: int, process_re
             "workflow_task_id": workflow_task.id
         }
     )
+
+
+@data_router.get("/workflow/{workflow_task_id}")
+async def get_workflow_status(request: Request, workflow_task_id: uuid.UUID):
+
+    idempotency_manager = IdempotencyManager(db_client=request.app.db_client,
+                                             db_engine=request.app.db_engine)
+    workflow_record = await idempotency_manager.get_task_record_by_celery_id(
+        task_name=FANOUT_WORKFLOW_TASK_NAME,
+        celery_task_id=str(workflow_task_id)
+    )
+
+    if workflow_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSingnals.WORKFLOW_NOT_FOUND_ERROR.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSingnals.WORKFLOW_STATUS_RETRIEVED.value,
+            "workflow_id": workflow_record.execution_id,
+            "status": workflow_record.status,
+            "progress": workflow_record.result or {}
+        }
+    )
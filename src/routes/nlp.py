@@ -1,12 +1,14 @@
 from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from .schemas.nlp import PushRequest, SearchRequest
+from fastapi.responses import JSONResponse, StreamingResponse
+from .schemas.nlp import PushRequest, SearchRequest, BatchSearchRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from models import ResponseSingnals
 from controllers import NLPController
+from stores.vectordb.VectorSearchFilter import VectorSearchFilter
 import logging
 import inspect
+import json
 from tqdm.auto import tqdm
 from tasks.data_indexing import index_data_content
 
@@ -157,6 +159,11 @@ async def get_project_index_info(request: Request, project_id: int):
         }
     )
 
+def get_search_filter(search_request):
+    if search_request.filter is None:
+        return None
+    return VectorSearchFilter(**search_request.filter.model_dump())
+
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: int, search_request: SearchRequest):
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -179,7 +186,11 @@ async def search_index(request: Request, project_id: int, search_request: Search
         results = await nlp_controller.search_vector_db_collection(
             project=project,
             text=search_request.text,
-            limit=search_request.limit or 10
+            limit=search_request.limit or 10,
+            ef_search=search_request.ef_search,
+            probes=search_request.probes,
+            mode=search_request.mode,
+            search_filter=get_search_filter(search_request)
         )
     except Exception as exc:
         request.app.logger.exception("Vector DB search failed")
@@ -201,6 +212,59 @@ async def search_index(request: Request, project_id: int, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, project_id: int, search_request: BatchSearchRequest):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSingnals.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser
+    )
+
+    try:
+        results = await nlp_controller.search_many_vector_db_collection(
+            project=project,
+            texts=search_request.texts,
+            limit=search_request.limit or 10,
+            ef_search=search_request.ef_search,
+            probes=search_request.probes,
+            mode=search_request.mode,
+            search_filter=get_search_filter(search_request)
+        )
+    except ValueError as exc:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSingnals.VECTORDB_SEARCH_ERROR.value, "error": str(exc)}
+        )
+    except Exception as exc:
+        request.app.logger.exception("Vector DB batch search failed")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"signal": ResponseSingnals.VECTORDB_SEARCH_ERROR.value, "error": str(exc)}
+        )
+
+    if results is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSingnals.VECTORDB_SEARCH_ERROR.value}
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSingnals.VECTOTDB_SEARCH_SUCCESS.value,
+            "results": results
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -216,13 +280,20 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        token_budget=request.app.token_budget,
+        reranker=request.app.reranker
     )
 
-    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
+    answer, full_prompt, chat_history, cache_match = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
-        limit=search_request.limit
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+        mode=search_request.mode,
+        search_filter=get_search_filter(search_request)
     )
 
     if not answer:
@@ -236,6 +307,57 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
                 "signal": ResponseSingnals.RAG_ANSWER_SUCCESS.value,
                 "answer": answer,
                 "full_prompt" : full_prompt,
-                "chat_history" : chat_history 
+                "chat_history" : chat_history,
+                "cache_hit" : cache_match is not None,
+                "cache_match" : cache_match
                 }
-        )
\ No newline at end of file
+        )
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(request: Request, project_id: int, search_request: SearchRequest):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSingnals.PROJECT_NOT_FOUND_ERROR.value}
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        token_budget=request.app.token_budget,
+        reranker=request.app.reranker
+    )
+
+    async def event_stream():
+        try:
+            async for event, data in nlp_controller.stream_rag_answer(
+                project=project,
+                query=search_request.text,
+                limit=search_request.limit,
+                ef_search=search_request.ef_search,
+                probes=search_request.probes,
+                mode=search_request.mode,
+                search_filter=get_search_filter(search_request)
+            ):
+                if event == "done":
+                    data["signal"] = (ResponseSingnals.RAG_ANSWER_SUCCESS.value if data.get("answer")
+                                      else ResponseSingnals.RAG_ANSWER_ERROR.value)
+                yield format_sse(event, data)
+        except Exception:
+            logger.exception(f"Streaming answer failed for project {project_id}")
+            yield format_sse("error", {"signal": ResponseSingnals.RAG_ANSWER_ERROR.value})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -6,5 +6,6 @@ class ProcessRequest(BaseModel):
     chunk_size: Optional[int] = 100
     overlap_size: Optional[int] = 20
     do_reset: Optional[int] = 0
+    fanout: Optional[bool] = None  # None -> WORKFLOW_FANOUT_ENABLED
     
      
\ No newline at end of file
@@ -1,10 +1,29 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
+class SearchFilter(BaseModel):
+    asset_ids: Optional[List[int]] = None
+    metadata: Dict[str, Any] = {}
+    metadata_ranges: Dict[str, List[Optional[float]]] = {}  # key -> [min, max]
+    chunk_id_min: Optional[int] = None
+    chunk_id_max: Optional[int] = None
+
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 0
-    
\ No newline at end of file
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    mode: Optional[str] = None  # None -> VECTOR_DB_SEARCH_MODE
+    
+    filter: Optional[SearchFilter] = None
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 0
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    mode: Optional[str] = None
+    filter: Optional[SearchFilter] = None
@@ -0,0 +1,284 @@
+from .LLMEnums import DocumentTypeEnums
+from models.db_schemas import EmbeddingCacheEntry
+from utils.metrics import EMBEDDING_CACHE_LOOKUPS, EMBEDDING_CACHE_HIT_RATIO
+from sqlalchemy import select, delete, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, List, Union
+import numpy as np
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+
+class PostgresEmbeddingCacheStore:
+
+    def __init__(self, db_client):
+        self.db_client = db_client
+
+    async def get_many(self, model_id: str, document_type: str, text_hashes: List[str]) -> Dict[str, list]:
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding).where(
+                    EmbeddingCacheEntry.model_id == model_id,
+                    EmbeddingCacheEntry.document_type == document_type,
+                    EmbeddingCacheEntry.text_hash.in_(text_hashes)
+                )
+            )
+            return {row.text_hash: list(row.embedding) for row in result}
+
+    async def put_many(self, model_id: str, document_type: str, embeddings: Dict[str, list]):
+        if not embeddings:
+            return
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    pg_insert(EmbeddingCacheEntry).values([
+                        {
+                            "model_id": model_id,
+                            "document_type": document_type,
+                            "text_hash": text_hash,
+                            "embedding": embedding
+                        }
+                        for text_hash, embedding in embeddings.items()
+                    ]).on_conflict_do_nothing()
+                )
+
+    async def delete_expired(self, model_id: str, max_age_days: int) -> int:
+        # Entries of other models can never hit again, old ones are dropped after the TTL
+        expired = EmbeddingCacheEntry.model_id != model_id
+        if max_age_days > 0:
+            expired = or_(expired, EmbeddingCacheEntry.created_at < func.now() - timedelta(days=max_age_days))
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(delete(EmbeddingCacheEntry).where(expired))
+        return result.rowcount
+
+
+class SQLiteEmbeddingCacheStore:
+
+    def __init__(self, db_path: str):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "model_id TEXT NOT NULL, document_type TEXT NOT NULL, text_hash TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, created_at REAL NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (model_id, document_type, text_hash))"
+        )
+        try:
+            # Cache files created before created_at existed
+            self.connection.execute("ALTER TABLE embedding_cache ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+        self.connection.commit()
+
+    def _get_many(self, model_id: str, document_type: str, text_hashes: List[str]) -> Dict[str, list]:
+        placeholders = ",".join("?" * len(text_hashes))
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT text_hash, embedding FROM embedding_cache "
+                f"WHERE model_id = ? AND document_type = ? AND text_hash IN ({placeholders})",
+                [model_id, document_type, *text_hashes]
+            ).fetchall()
+        return {text_hash: np.frombuffer(blob, dtype=np.float32).tolist() for text_hash, blob in rows}
+
+    def _put_many(self, model_id: str, document_type: str, embeddings: Dict[str, list]):
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO embedding_cache "
+                "(model_id, document_type, text_hash, embedding, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model_id, document_type, text_hash,
+                     np.asarray(embedding, dtype=np.float32).tobytes(), time.time())
+                    for text_hash, embedding in embeddings.items()
+                ]
+            )
+            self.connection.commit()
+
+    def _delete_expired(self, model_id: str, max_age_days: int) -> int:
+        cutoff = time.time() - max_age_days * 86400 if max_age_days > 0 else 0
+        with self.lock:
+            cursor = self.connection.execute(
+                "DELETE FROM embedding_cache WHERE model_id != ? OR created_at < ?",
+                [model_id, cutoff]
+            )
+            self.connection.commit()
+        return cursor.rowcount
+
+    async def get_many(self, model_id: str, document_type: str, text_hashes: List[str]) -> Dict[str, list]:
+        return await asyncio.to_thread(self._get_many, model_id, document_type, text_hashes)
+
+    async def put_many(self, model_id: str, document_type: str, embeddings: Dict[str, list]):
+        if embeddings:
+            await asyncio.to_thread(self._put_many, model_id, document_type, embeddings)
+
+    async def delete_expired(self, model_id: str, max_age_days: int) -> int:
+        return await asyncio.to_thread(self._delete_expired, model_id, max_age_days)
+
+
+class CachedEmbeddingClient:
+    """
+    Wraps an embedding client so only cache misses reach the provider.
+
+    Lookups go to the persistent store in one batch; misses are embedded in
+    one provider call and written back in one batch. Query embeddings are also
+    kept in an in-process LRU of float32 arrays bounded by lru_max_bytes;
+    documents are embedded once per upload and would only churn it.
+    Everything else is delegated to the wrapped client.
+    """
+
+    def __init__(self, embedding_client, store=None, lru_max_bytes: int = 64 * 2 ** 20):
+        self.embedding_client = embedding_client
+        self.store = store
+        self.lru_max_bytes = lru_max_bytes
+        self.lru_bytes = 0
+        self.lru = OrderedDict()
+
+        self.hits = 0
+        self.lookups = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        if name == "embedding_client":
+            raise AttributeError(name)
+        return getattr(self.embedding_client, name)
+
+    def get_cache_key(self, text: str, document_type: str):
+        # Hash exactly what the provider receives, so inputs it would alter differently never collide
+        text_hash = hashlib.sha256(self.embedding_client.get_embedding_input(text).encode("utf-8")).hexdigest()
+        return (self.embedding_client.embedding_model_id,
+                document_type or DocumentTypeEnums.DOCUMENT.value,
+                text_hash)
+
+    def uses_lru(self, key) -> bool:
+        return key[1] == DocumentTypeEnums.QUERY.value
+
+    def lru_get(self, key):
+        if not self.uses_lru(key):
+            return None
+        embedding = self.lru.get(key)
+        if embedding is None:
+            return None
+        self.lru.move_to_end(key)
+        return embedding.tolist()
+
+    def lru_put(self, key, embedding: list):
+        if not self.uses_lru(key):
+            return
+        embedding = np.asarray(embedding, dtype=np.float32)
+        if embedding.nbytes > self.lru_max_bytes:
+            return
+
+        previous = self.lru.pop(key, None)
+        if previous is not None:
+            self.lru_bytes -= previous.nbytes
+        self.lru[key] = embedding
+        self.lru_bytes += embedding.nbytes
+
+        while self.lru_bytes > self.lru_max_bytes:
+            _, evicted = self.lru.popitem(last=False)
+            self.lru_bytes -= evicted.nbytes
+
+    def record_lookups(self, tier: str, hits: int, misses: int):
+        if hits:
+            EMBEDDING_CACHE_LOOKUPS.labels(tier=tier, result="hit").inc(hits)
+        if misses:
+            EMBEDDING_CACHE_LOOKUPS.labels(tier=tier, result="miss").inc(misses)
+
+    def record_ratio(self, total: int, hits: int):
+        self.lookups += total
+        self.hits += hits
+        if self.lookups:
+            EMBEDDING_CACHE_HIT_RATIO.set(self.hits / self.lookups)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if isinstance(text, str):
+            text = [text]
+
+        keys = [self.get_cache_key(t, document_type) for t in text]
+        embeddings = {key: self.lru_get(key) for key in dict.fromkeys(keys)}
+
+        missing = [key for key, embedding in embeddings.items() if embedding is None]
+        if keys and self.uses_lru(keys[0]):
+            self.record_lookups("lru", hits=len(embeddings) - len(missing), misses=len(missing))
+
+        if missing and self.store is not None:
+            model_id, doc_type, _ = missing[0]
+            try:
+                stored = await self.store.get_many(model_id, doc_type, [key[2] for key in missing])
+            except Exception as e:
+                self.logger.warning(f"Embedding cache lookup failed: {e}")
+                stored = {}
+
+            for key in missing:
+                embedding = stored.get(key[2])
+                if embedding is not None:
+                    embeddings[key] = embedding
+                    self.lru_put(key, embedding)
+
+            store_hits = len(stored)
+            self.record_lookups("store", hits=store_hits, misses=len(missing) - store_hits)
+            missing = [key for key in missing if embeddings[key] is None]
+
+        if missing:
+            # One provider call for the distinct texts that missed every tier
+            texts_by_key = {}
+            for key, t in zip(keys, text):
+                texts_by_key.setdefault(key, t)
+
+            vectors = await self.embedding_client.aembed_text(
+                text=[texts_by_key[key] for key in missing],
+                document_type=document_type
+            )
+
+            if not vectors or len(vectors) != len(missing):
+                self.logger.error("Embedding provider returned an unexpected number of vectors, not caching")
+                return vectors if len(text) == len(missing) else None
+
+            for key, vector in zip(missing, vectors):
+                embeddings[key] = vector
+                self.lru_put(key, vector)
+
+            if self.store is not None:
+                model_id, doc_type, _ = missing[0]
+                try:
+                    await self.store.put_many(model_id, doc_type,
+                                              {key[2]: embeddings[key] for key in missing})
+                except Exception as e:
+                    self.logger.warning(f"Embedding cache write failed: {e}")
+
+        self.record_ratio(total=len(embeddings), hits=len(embeddings) - len(missing))
+
+        return [embeddings[key] for key in keys]
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        # The persistent store is async, the sync path only uses the LRU (queries)
+        if isinstance(text, str):
+            text = [text]
+
+        keys = [self.get_cache_key(t, document_type) for t in text]
+        if not keys or not self.uses_lru(keys[0]):
+            return self.embedding_client.embed_text(text=text, document_type=document_type)
+
+        cached = [self.lru_get(key) for key in keys]
+        if all(embedding is not None for embedding in cached):
+            self.record_lookups("lru", hits=len(keys), misses=0)
+            self.record_ratio(total=len(keys), hits=len(keys))
+            return cached
+
+        vectors = self.embedding_client.embed_text(text=text, document_type=document_type)
+        if vectors and len(vectors) == len(keys):
+            for key, vector in zip(keys, vectors):
+                self.lru_put(key, vector)
+
+        self.record_lookups("lru", hits=0, misses=len(keys))
+        self.record_ratio(total=len(keys), hits=0)
+        return vectors
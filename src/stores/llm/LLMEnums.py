@@ -17,6 +17,11 @@ class CohereEnums(Enum):
     DOCUMENT = "search_document"
     QUERY = "search_query"
 
+class EmbeddingCacheEnums(Enum):
+    POSTGRES = "postgres"
+    SQLITE = "sqlite"
+    NONE = "none"
+
 class DocumentTypeEnums(Enum):
     DOCUMENT = "document" 
     QUERY = "query"
\ No newline at end of file
@@ -14,10 +14,28 @@ class LLMInterface(ABC):
     def generate_text(self, prompt: str,chat_history: list= [] , max_output_tokens: int = None, temperature: float = None):
         pass
 
+    @abstractmethod
+    async def agenerate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None, temperature: float = None):
+        pass
+
+    @abstractmethod
+    def astream_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None, temperature: float = None):
+        """Async generator yielding text deltas as the model produces them."""
+        pass
+
     @abstractmethod
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    async def aembed_text(self, text: str, document_type: str = None):
+        pass
+
+    @abstractmethod
+    def get_embedding_input(self, text: str) -> str:
+        """The exact text sent to the embedding endpoint for text."""
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
@@ -1,10 +1,32 @@
-from ..llm.LLMEnums import LLMEnums
+from ..llm.LLMEnums import LLMEnums, EmbeddingCacheEnums
 from ..llm.providers import OpenAIProvider , CohereProvider
+from ..llm.EmbeddingCache import CachedEmbeddingClient, PostgresEmbeddingCacheStore, SQLiteEmbeddingCacheStore
+from ..llm.TokenBudgetService import TokenBudgetService, create_tokenizer
+import httpx
 
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
         self.config = config
+        self.http_client = None
+
+    def get_http_client(self):
+        # One pool for every provider created by this factory
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=self.config.LLM_HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(self.config.LLM_HTTP_TIMEOUT)
+            )
+        return self.http_client
+
+    async def close(self):
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
 
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
@@ -13,7 +35,8 @@ class LLMProviderFactory:
                 api_url=self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.DEFAULT_INPUT_MAX_CHARACTERS,
                 default_generation_max_output_token=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_client=self.get_http_client()
             )
 
         if provider == LLMEnums.CHOHERE.value:
@@ -21,7 +44,33 @@ class LLMProviderFactory:
                 api_key=self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.DEFAULT_INPUT_MAX_CHARACTERS,
                 default_generation_max_output_token=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_client=self.get_http_client()
             )
 
-        return None
\ No newline at end of file
+        return None
+
+    def create_embedding_cache(self, embedding_client, db_client=None):
+        backend = self.config.EMBEDDING_CACHE_BACKEND
+
+        if backend == EmbeddingCacheEnums.POSTGRES.value:
+            store = PostgresEmbeddingCacheStore(db_client=db_client)
+        elif backend == EmbeddingCacheEnums.SQLITE.value:
+            store = SQLiteEmbeddingCacheStore(db_path=self.config.EMBEDDING_CACHE_SQLITE_PATH)
+        else:
+            return embedding_client
+
+        return CachedEmbeddingClient(
+            embedding_client=embedding_client,
+            store=store,
+            lru_max_bytes=self.config.EMBEDDING_CACHE_LRU_MAX_MB * 2 ** 20
+        )
+
+    def create_token_budget(self, provider: str, model_id: str):
+        return TokenBudgetService(
+            tokenizer=create_tokenizer(provider=provider, model_id=model_id,
+                                       tokenizer_path=self.config.GENERATION_TOKENIZER_PATH),
+            context_window=self.config.GENERATION_CONTEXT_WINDOW_TOKENS,
+            max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+            cache_size=self.config.TOKEN_COUNT_CACHE_SIZE
+        )
@@ -0,0 +1,158 @@
+from .LLMEnums import LLMEnums
+from collections import OrderedDict
+from typing import Callable, List
+import logging
+import re
+
+try:
+    import tiktoken  # pyright: ignore[reportMissingImports]
+except ImportError:
+    tiktoken = None
+
+try:
+    from tokenizers import Tokenizer  # pyright: ignore[reportMissingImports]
+except ImportError:
+    Tokenizer = None
+
+logger = logging.getLogger(__name__)
+
+# Words (Latin or Arabic script) and single punctuation marks
+APPROXIMATE_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class RegexTokenizer:
+    """Dependency free approximation, used when no model tokenizer is available."""
+
+    def count(self, text: str) -> int:
+        return sum(1 for _ in APPROXIMATE_TOKEN_PATTERN.finditer(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        starts = [match.start() for match in APPROXIMATE_TOKEN_PATTERN.finditer(text)]
+        if len(starts) <= max_tokens:
+            return text
+        return text[:starts[max_tokens]].rstrip()
+
+
+class TiktokenTokenizer:
+
+    def __init__(self, model_id: str):
+        try:
+            self.encoding = tiktoken.encoding_for_model(model_id)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+class HuggingFaceTokenizer:
+    """Any tokenizer.json, e.g. the one Cohere publishes for its models."""
+
+    def __init__(self, tokenizer_path: str):
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+
+    def count(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        encoding = self.tokenizer.encode(text, add_special_tokens=False)
+        if len(encoding.ids) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        return text[:encoding.offsets[max_tokens - 1][1]]
+
+
+def create_tokenizer(provider: str, model_id: str = None, tokenizer_path: str = None):
+    """
+    tiktoken for OpenAI models, the tokenizer.json at tokenizer_path for any
+    other provider (Cohere), else the regex approximation.
+    """
+    if tokenizer_path:
+        if Tokenizer is not None:
+            return HuggingFaceTokenizer(tokenizer_path=tokenizer_path)
+        logger.warning("tokenizers is not installed, falling back to approximate token counts")
+
+    elif provider == LLMEnums.OPENAI.value:
+        if tiktoken is not None:
+            return TiktokenTokenizer(model_id=model_id)
+        logger.warning("tiktoken is not installed, falling back to approximate token counts")
+
+    return RegexTokenizer()
+
+
+class TokenBudgetService:
+    """
+    Fits retrieved documents into the generation model's context window.
+
+    The prompt budget is context_window minus the reserved output tokens. The
+    fixed parts of the prompt are counted first, then documents are added in
+    rank order while they fit. Token counts are kept in an LRU keyed by the
+    chunk text, so documents retrieved again cost no tokenization.
+    """
+
+    def __init__(self, tokenizer, context_window: int, max_output_tokens: int,
+                 cache_size: int = 10000):
+        self.tokenizer = tokenizer
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    def count_tokens(self, text: str) -> int:
+        count = self.cache.get(text)
+        if count is not None:
+            self.cache.move_to_end(text)
+            return count
+
+        count = self.tokenizer.count(text)
+        self.cache[text] = count
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return count
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return self.tokenizer.truncate(text, max_tokens)
+
+    @property
+    def prompt_budget(self) -> int:
+        return max(0, self.context_window - self.max_output_tokens)
+
+    def pack_documents(self, texts: List[str], fixed_prompt: str = "",
+                       document_overhead: Callable[[int], str] = None) -> List[str]:
+        """
+        Texts (in rank order) that fit the prompt budget next to fixed_prompt.
+        document_overhead(idx) gives the template text wrapped around each
+        document, counted once per document. When not even the first document
+        fits, it is truncated to the remaining budget.
+        """
+        remaining = self.prompt_budget - self.count_tokens(fixed_prompt)
+
+        packed = []
+        for idx, text in enumerate(texts):
+            overhead = self.count_tokens(document_overhead(idx + 1)) if document_overhead else 0
+            needed = self.count_tokens(text) + overhead
+
+            if needed <= remaining:
+                packed.append(text)
+                remaining -= needed
+            elif not packed and remaining > overhead:
+                packed.append(self.truncate(text, remaining - overhead))
+                remaining = 0
+
+            if remaining <= 0:
+                break
+
+        if len(packed) < len(texts):
+            logger.info(f"Packed {len(packed)} of {len(texts)} retrieved documents into "
+                        f"{self.prompt_budget} prompt tokens")
+        return packed
+
+    def get_token_counter(self) -> Callable[[str], int]:
+        return self.tokenizer.count
@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CohereEnums, DocumentTypeEnums
 import cohere  # pyright: ignore[reportMissingImports]
+import httpx
 import logging
 from typing import Optional, List, Union
 
@@ -10,7 +11,8 @@ class CohereProvider(LLMInterface):
     def __init__(self, api_key: str,
                  default_input_max_characters: int = 1000,
                  default_generation_max_output_token: int = 1000,
-                 default_generation_temperature: float = 0.1):
+                 default_generation_temperature: float = 0.1,
+                 http_client: httpx.AsyncClient = None):
 
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
@@ -23,8 +25,11 @@ class CohereProvider(LLMInterface):
 
         # ensure attribute exists even if client creation fails
         self.client = None
+        self.async_client = None
         try:
             self.client = cohere.ClientV2(api_key=self.api_key)
+            # Async client for the event loop, shares the factory connection pool
+            self.async_client = cohere.AsyncClientV2(api_key=self.api_key, httpx_client=http_client)
         except Exception as e:
             logging.getLogger(__name__).warning("Failed to initialize Cohere client: %s", e)
 
@@ -43,12 +48,11 @@ class CohereProvider(LLMInterface):
             text = str(text)
         return text[: self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: Optional[list] = None,
-                      max_output_tokens: int = None, temperature: float = None):
-        if not self.client:
-            self.logger.error("Cohere client was not initialized")
-            return None
+    def get_embedding_input(self, text: str) -> str:
+        return self.process_text(text)
 
+    def build_generation_request(self, prompt: str, chat_history: Optional[list] = None,
+                                 max_output_tokens: int = None, temperature: float = None):
         if not self.generation_model_id:
             self.logger.error("Generation model for Cohere was not set")
             return None
@@ -59,19 +63,16 @@ class CohereProvider(LLMInterface):
         # make sure messages are a list of dicts
         messages = []
         messages.extend(chat_history)
-        messages.append({"role": "user", "content": self.process_text(prompt)})
+        messages.append({"role": "user", "content": prompt})
 
-        try:
-            response = self.client.chat(
-                model=self.generation_model_id,
-                messages=messages,
-                temperature=temperature or self.default_generation_temperature,
-                max_tokens=max_output_tokens or self.default_generation_max_output_token
-            )
-        except Exception as e:
-            self.logger.error("Cohere chat call failed: %s", e)
-            return None
+        return {
+            "model": self.generation_model_id,
+            "messages": messages,
+            "temperature": temperature or self.default_generation_temperature,
+            "max_tokens": max_output_tokens or self.default_generation_max_output_token
+        }
 
+    def extract_generated_text(self, response):
         # tolerant extraction
         try:
             if hasattr(response, "message") and getattr(response.message, "content", None):
@@ -92,11 +93,7 @@ class CohereProvider(LLMInterface):
         self.logger.error("Unexpected response shape from Cohere chat: %r", response)
         return None
 
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None) -> Optional[List[float]]:
-        if not self.client:
-            self.logger.error("Cohere client was not initialized")
-            return None
-
+    def build_embedding_request(self, text: Union[str, List[str]], document_type: str = None):
         if isinstance(text, str):
             text = [text]
 
@@ -104,30 +101,26 @@ class CohereProvider(LLMInterface):
             self.logger.error("Embedding model for Cohere was not set")
             return None
 
-        input_type = CohereEnums.DOCUMENT
-        if document_type == DocumentTypeEnums.QUERY:
-            input_type = CohereEnums.QUERY
+        input_type = CohereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnums.QUERY.value:
+            input_type = CohereEnums.QUERY.value
 
         # FIX 1: process each text individually
-        processed = [self.process_text(t) for t in text]
+        processed = [self.get_embedding_input(t) for t in text]
         processed = [p for p in processed if p]  
 
         if not processed:
             self.logger.error("Empty text after processing")
             return None
 
-        try:
-            response = self.client.embed(
-                model=self.embedding_model_id,
-                texts=processed,  
-                input_type=input_type,
-                embedding_types=["float"],
-            )
-            self.logger.debug("Cohere embed response: %r", response)
-        except Exception as e:
-            self.logger.error("Cohere embed call failed: %s", e)
-            return None
+        return {
+            "model": self.embedding_model_id,
+            "texts": processed,
+            "input_type": input_type,
+            "embedding_types": ["float"],
+        }
 
+    def extract_embeddings(self, response):
         # tolerant extraction of embedding vector
         try:
             if hasattr(response, "embeddings"):
@@ -154,6 +147,104 @@ class CohereProvider(LLMInterface):
 
         self.logger.error("Unexpected response shape from Cohere embed: %r", response)
         return None
+
+    def generate_text(self, prompt: str, chat_history: Optional[list] = None,
+                      max_output_tokens: int = None, temperature: float = None):
+        if not self.client:
+            self.logger.error("Cohere client was not initialized")
+            return None
+
+        request = self.build_generation_request(prompt=prompt, chat_history=chat_history,
+                                                max_output_tokens=max_output_tokens,
+                                                temperature=temperature)
+        if request is None:
+            return None
+
+        try:
+            response = self.client.chat(**request)
+        except Exception as e:
+            self.logger.error("Cohere chat call failed: %s", e)
+            return None
+
+        return self.extract_generated_text(response)
+
+    async def agenerate_text(self, prompt: str, chat_history: Optional[list] = None,
+                             max_output_tokens: int = None, temperature: float = None):
+        if not self.async_client:
+            self.logger.error("Cohere async client was not initialized")
+            return None
+
+        request = self.build_generation_request(prompt=prompt, chat_history=chat_history,
+                                                max_output_tokens=max_output_tokens,
+                                                temperature=temperature)
+        if request is None:
+            return None
+
+        try:
+            response = await self.async_client.chat(**request)
+        except Exception as e:
+            self.logger.error("Cohere chat call failed: %s", e)
+            return None
+
+        return self.extract_generated_text(response)
+
+    async def astream_text(self, prompt: str, chat_history: Optional[list] = None,
+                           max_output_tokens: int = None, temperature: float = None):
+        if not self.async_client:
+            self.logger.error("Cohere async client was not initialized")
+            return
+
+        request = self.build_generation_request(prompt=prompt, chat_history=chat_history,
+                                                max_output_tokens=max_output_tokens,
+                                                temperature=temperature)
+        if request is None:
+            return
+
+        async for event in self.async_client.chat_stream(**request):
+            if getattr(event, "type", None) != "content-delta":
+                continue
+            try:
+                text = event.delta.message.content.text
+            except AttributeError:
+                continue
+            if text:
+                yield text
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None) -> Optional[List[float]]:
+        if not self.client:
+            self.logger.error("Cohere client was not initialized")
+            return None
+
+        request = self.build_embedding_request(text=text, document_type=document_type)
+        if request is None:
+            return None
+
+        try:
+            response = self.client.embed(**request)
+            self.logger.debug("Cohere embed response: %r", response)
+        except Exception as e:
+            self.logger.error("Cohere embed call failed: %s", e)
+            return None
+
+        return self.extract_embeddings(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None) -> Optional[List[float]]:
+        if not self.async_client:
+            self.logger.error("Cohere async client was not initialized")
+            return None
+
+        request = self.build_embedding_request(text=text, document_type=document_type)
+        if request is None:
+            return None
+
+        try:
+            response = await self.async_client.embed(**request)
+            self.logger.debug("Cohere embed response: %r", response)
+        except Exception as e:
+            self.logger.error("Cohere embed call failed: %s", e)
+            return None
+
+        return self.extract_embeddings(response)
     
     def construct_prompt(self, prompt: str, role: str):
         return {
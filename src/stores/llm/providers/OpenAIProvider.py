@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface 
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import httpx
 import logging
 from typing import List, Union
 
@@ -9,7 +10,8 @@ class OpenAIProvider(LLMInterface):
     def __init__(self,api_key : str , api_url: str = None,
                  default_input_max_characters: int = 1000,
                  default_generation_max_output_token: int=1000,
-                 default_generation_temperature: float=0.1):
+                 default_generation_temperature: float=0.1,
+                 http_client: httpx.AsyncClient = None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -27,6 +29,13 @@ class OpenAIProvider(LLMInterface):
             base_url=self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        # Async client for the event loop, shares the factory connection pool
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url if self.api_url and len(self.api_url) else None,
+            http_client=http_client
+        )
+
         self.logger = logging.getLogger(__name__)
         self.enums = OpenAIEnums
 
@@ -42,11 +51,11 @@ class OpenAIProvider(LLMInterface):
             text = str(text)
         return text[: self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str,chat_history: list= [] , max_output_tokens: int = None, temperature: float = None):
-        if not self.client:
-            self.logger.error("OpenAI was not set")
-            return None
-        
+    def get_embedding_input(self, text: str) -> str:
+        return self.process_text(text)
+
+    def build_generation_request(self, prompt: str, chat_history: list = None,
+                                 max_output_tokens: int = None, temperature: float = None):
         if not self.generation_model_id:
             self.logger.error("Generation model for OpenAI was not set")
             return None 
@@ -61,41 +70,113 @@ class OpenAIProvider(LLMInterface):
             self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
         )
 
-        response = self.client.chat.completions.create(
-            model=self.generation_model_id,
-            messages=chat_history,
-            max_tokens=max_output_tokens,
-            temperature=temperature
-        )
+        return {
+            "model": self.generation_model_id,
+            "messages": chat_history,
+            "max_tokens": max_output_tokens,
+            "temperature": temperature
+        }
 
+    def extract_generated_text(self, response):
         if not response or not response.choices or len(response.choices) == 0:
             self.logger.error("Invalid response from OpenAI")
             return None
 
         return response.choices[0].message.content
 
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
-        if not self.client:
-            self.logger.error("OpenAI was not set")
-            return None
-        
+    def build_embedding_request(self, text: Union[str, List[str]]):
         if isinstance(text, str):
             text = [text]
         
         if not self.embedding_model_id:
             self.logger.error("Embedding model for OpenAI was not set")
             return None
-        
-        response = self.client.embeddings.create(
-            model=self.embedding_model_id,
-            input=text
-        )
 
+        return {
+            "model": self.embedding_model_id,
+            "input": [self.get_embedding_input(t) for t in text]
+        }
+
+    def extract_embeddings(self, response):
         if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
             self.logger.error("Embedding response is empty or invalid")
             return None
         
         return [ rec.embedding for rec in response.data ]
+
+    def generate_text(self, prompt: str,chat_history: list= [] , max_output_tokens: int = None, temperature: float = None):
+        if not self.client:
+            self.logger.error("OpenAI was not set")
+            return None
+
+        request = self.build_generation_request(prompt=prompt, chat_history=chat_history,
+                                                max_output_tokens=max_output_tokens,
+                                                temperature=temperature)
+        if request is None:
+            return None
+
+        response = self.client.chat.completions.create(**request)
+
+        return self.extract_generated_text(response)
+
+    async def agenerate_text(self, prompt: str, chat_history: list = None,
+                             max_output_tokens: int = None, temperature: float = None):
+        if not self.async_client:
+            self.logger.error("OpenAI was not set")
+            return None
+
+        request = self.build_generation_request(prompt=prompt, chat_history=chat_history,
+                                                max_output_tokens=max_output_tokens,
+                                                temperature=temperature)
+        if request is None:
+            return None
+
+        response = await self.async_client.chat.completions.create(**request)
+
+        return self.extract_generated_text(response)
+
+    async def astream_text(self, prompt: str, chat_history: list = None,
+                           max_output_tokens: int = None, temperature: float = None):
+        if not self.async_client:
+            self.logger.error("OpenAI was not set")
+            return
+
+        request = self.build_generation_request(prompt=prompt, chat_history=chat_history,
+                                                max_output_tokens=max_output_tokens,
+                                                temperature=temperature)
+        if request is None:
+            return
+
+        stream = await self.async_client.chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.client:
+            self.logger.error("OpenAI was not set")
+            return None
+
+        request = self.build_embedding_request(text=text)
+        if request is None:
+            return None
+        
+        response = self.client.embeddings.create(**request)
+
+        return self.extract_embeddings(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("OpenAI was not set")
+            return None
+
+        request = self.build_embedding_request(text=text)
+        if request is None:
+            return None
+
+        response = await self.async_client.embeddings.create(**request)
+
+        return self.extract_embeddings(response)
     
 
     def construct_prompt(self, prompt: str, role: str):
@@ -104,5 +185,3 @@ class OpenAIProvider(LLMInterface):
             "content" : prompt
         }
 
-
-
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class RerankerEnums(Enum):
+    NONE = "NONE"           # Prompt gets the top ANN hits as they are
+    LEXICAL = "LEXICAL"     # BM25 over the candidates, no dependencies
+    ONNX = "ONNX"           # Cross-encoder on CPU through onnxruntime
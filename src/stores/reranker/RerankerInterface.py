@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+class RerankerInterface(ABC):
+
+    @abstractmethod
+    def rerank(self, query: str, documents: List[str], top_n: int) -> List[Tuple[int, float]]:
+        """(index in documents, score) of the top_n most relevant documents, best first."""
+        pass
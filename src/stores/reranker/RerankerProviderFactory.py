@@ -0,0 +1,21 @@
+from .RerankerEnums import RerankerEnums
+from .providers import LexicalReranker, OnnxCrossEncoderReranker
+
+
+class RerankerProviderFactory:
+    def __init__(self, config: dict):
+        self.config = config
+
+    def create(self, provider: str):
+        if provider == RerankerEnums.LEXICAL.value:
+            return LexicalReranker()
+
+        if provider == RerankerEnums.ONNX.value:
+            return OnnxCrossEncoderReranker(
+                model_dir=self.config.RERANKER_ONNX_MODEL_DIR,
+                batch_size=self.config.RERANKER_BATCH_SIZE,
+                max_length=self.config.RERANKER_MAX_LENGTH,
+                num_threads=self.config.RERANKER_NUM_THREADS
+            )
+
+        return None
@@ -0,0 +1,57 @@
+from ..RerankerInterface import RerankerInterface
+from collections import Counter
+from typing import List, Tuple
+import math
+import re
+
+# Words in Latin or Arabic script, case folded
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class LexicalReranker(RerankerInterface):
+    """
+    BM25 of the query terms over the candidate set, a zero dependency
+    fallback for the cross-encoder. Term statistics come from the candidates
+    only, so exact keyword hits (error codes, product names) rise above
+    loosely related semantic neighbours. Ties keep the retrieval order.
+    """
+
+    name = "lexical"
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return WORD_PATTERN.findall(text.casefold())
+
+    def rerank(self, query: str, documents: List[str], top_n: int) -> List[Tuple[int, float]]:
+        if not documents:
+            return []
+
+        query_terms = set(self.tokenize(query))
+        term_counts = [Counter(self.tokenize(document)) for document in documents]
+
+        lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = sum(lengths) / len(lengths) or 1
+        document_frequency = {
+            term: sum(1 for counts in term_counts if term in counts) for term in query_terms
+        }
+
+        scores = []
+        for counts, length in zip(term_counts, lengths):
+            score = 0.0
+            for term in query_terms:
+                frequency = counts.get(term, 0)
+                if not frequency:
+                    continue
+                idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5)
+                               / (document_frequency[term] + 0.5))
+                score += idf * frequency * (self.k1 + 1) / (
+                    frequency + self.k1 * (1 - self.b + self.b * length / average_length)
+                )
+            scores.append(score)
+
+        ranked = sorted(range(len(documents)), key=lambda idx: (-scores[idx], idx))
+        return [(idx, scores[idx]) for idx in ranked[:top_n]]
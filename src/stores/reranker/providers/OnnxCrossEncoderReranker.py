@@ -0,0 +1,75 @@
+from ..RerankerInterface import RerankerInterface
+from typing import List, Tuple
+import numpy as np
+import os
+
+try:
+    import onnxruntime  # pyright: ignore[reportMissingImports]
+except ImportError:
+    onnxruntime = None
+
+try:
+    from tokenizers import Tokenizer  # pyright: ignore[reportMissingImports]
+except ImportError:
+    Tokenizer = None
+
+
+class OnnxCrossEncoderReranker(RerankerInterface):
+    """
+    Cross-encoder (e.g. an ONNX export of cross-encoder/ms-marco-MiniLM-L-6-v2
+    or a multilingual one for Arabic) scored on CPU with onnxruntime.
+
+    model_dir holds model.onnx and its tokenizer.json. (query, document)
+    pairs are tokenized together and scored batch_size at a time, the
+    relevance logit is squashed with a sigmoid.
+    """
+
+    name = "onnx"
+    MODEL_FILE = "model.onnx"
+    TOKENIZER_FILE = "tokenizer.json"
+
+    def __init__(self, model_dir: str, batch_size: int = 16, max_length: int = 512,
+                 num_threads: int = 0):
+        if onnxruntime is None or Tokenizer is None:
+            raise ImportError("onnxruntime and tokenizers are required for the ONNX reranker")
+
+        self.batch_size = max(1, batch_size)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, self.TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        session_options = onnxruntime.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(os.path.join(model_dir, self.MODEL_FILE),
+                                                    sess_options=session_options,
+                                                    providers=["CPUExecutionProvider"])
+        # Some exports take no token_type_ids
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def score_batch(self, query: str, documents: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch([(query, document) for document in documents])
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        logits = self.session.run(None, {name: value for name, value in inputs.items()
+                                         if name in self.input_names})[0]
+
+        # (batch, 1) relevance logit, or (batch, 2) where the last column is "relevant"
+        logits = logits.reshape(len(documents), -1)[:, -1]
+        return 1 / (1 + np.exp(-logits))
+
+    def rerank(self, query: str, documents: List[str], top_n: int) -> List[Tuple[int, float]]:
+        if not documents:
+            return []
+
+        scores = np.concatenate([
+            self.score_batch(query, documents[start:start + self.batch_size])
+            for start in range(0, len(documents), self.batch_size)
+        ])
+
+        ranked = np.argsort(-scores, kind="stable")[:top_n]
+        return [(int(idx), float(scores[idx])) for idx in ranked]
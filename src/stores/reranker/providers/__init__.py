@@ -0,0 +1,2 @@
+from .LexicalReranker import LexicalReranker
+from .OnnxCrossEncoderReranker import OnnxCrossEncoderReranker
@@ -0,0 +1,72 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+import time
+
+
+class CollectionMetadataCache:
+    """
+    Per-process cache of vector DB collection metadata
+    (existence, embedding size, index presence).
+
+    Entries expire after `ttl` seconds as a safety net, providers invalidate
+    them explicitly whenever they change a collection. Invalidation listeners
+    run for every invalidation, including ones relayed from other processes;
+    change listeners only run for changes made by this process.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self.entries: Dict[str, dict] = {}
+        self.invalidation_listeners: List[Callable[[Optional[str]], Any]] = []
+        self.change_listeners: List[Callable[[Optional[str]], Awaitable[Any]]] = []
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, collection_name: str, key: str) -> Any:
+        """Return the cached value or None when unknown / expired."""
+        entry = self.entries.get(collection_name)
+        if entry is None:
+            return None
+
+        if self.ttl and time.monotonic() - entry["cached_at"] > self.ttl:
+            self.entries.pop(collection_name, None)
+            return None
+
+        return entry.get(key)
+
+    def set(self, collection_name: str, **values):
+        entry = self.entries.get(collection_name)
+        if entry is None or (self.ttl and time.monotonic() - entry["cached_at"] > self.ttl):
+            entry = {}
+            self.entries[collection_name] = entry
+
+        entry.update(values)
+        entry["cached_at"] = time.monotonic()
+
+    def invalidate(self, collection_name: Optional[str] = None):
+        """Drop one collection (or everything when collection_name is None)."""
+        if collection_name is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(collection_name, None)
+
+        for listener in self.invalidation_listeners:
+            try:
+                listener(collection_name)
+            except Exception as e:
+                self.logger.warning(f"Collection cache invalidation listener failed: {str(e)}")
+
+    async def changed(self, collection_name: Optional[str] = None):
+        """Invalidate after this process changed one collection (or every collection)."""
+        self.invalidate(collection_name=collection_name)
+
+        for listener in self.change_listeners:
+            try:
+                await listener(collection_name)
+            except Exception as e:
+                self.logger.warning(f"Collection change listener failed: {str(e)}")
+
+    def add_invalidation_listener(self, listener: Callable[[Optional[str]], Any]):
+        self.invalidation_listeners.append(listener)
+
+    def add_change_listener(self, listener: Callable[[Optional[str]], Awaitable[Any]]):
+        self.change_listeners.append(listener)
@@ -3,17 +3,23 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    LOCAL_NUMPY = "LOCAL_NUMPY"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
 
+class SearchModeEnums(Enum):
+    VECTOR = "vector"       # Embedding similarity only
+    HYBRID = "hybrid"       # Full-text keyword + vector, fused with reciprocal rank fusion
+
 class PgVectorTableSchemeEnums(Enum):
     ID = "id"
     TEXT = "text"
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    TEXT_SEARCH = "text_search"
     _PREFIX = "pgvector"
 
 class PgVectorDistanceMethodEnums(Enum):
@@ -22,8 +28,31 @@ class PgVectorDistanceMethodEnums(Enum):
     VECTOR_IP_OPS = "vector_ip_ops"              # For inner product
     VECTOR_L1_OPS = "vector_l1_ops"              # For L1 distance (0.7.0+)
 
+class PgVectorDistanceOperatorEnums(Enum):
+    # Keyed by the PgVectorDistanceMethodEnums name so the ORDER BY operator
+    # always matches the opclass the index was built with
+    VECTOR_L2_OPS = "<->"
+    VECTOR_COSINE_OPS = "<=>"
+    VECTOR_IP_OPS = "<#>"
+    VECTOR_L1_OPS = "<+>"
+
+class PgVectorChannelEnums(Enum):
+    COLLECTION_CACHE = "pgvector_collection_cache"   # LISTEN/NOTIFY channel for cache invalidation
+
+class PgVectorInsertModeEnums(Enum):
+    COPY = "copy"           # Binary COPY through asyncpg (bulk ingest)
+    INSERT = "insert"       # Parameterized INSERT batches
+
 class PgVectorIndexTypeEnums(Enum):
     HNSW = "hnsw"           # Hierarchical Navigable Small World (default, fastest)
     IVFFLAT = "ivfflat"     # Inverted File with Flat compression (memory efficient)
 
 
+
+class PgVectorStorageEnums(Enum):
+    VECTOR = "vector"       # float32 column
+    HALFVEC = "halfvec"     # float16 column, half the table and index size (0.7.0+)
+
+class PgVectorQuantizationEnums(Enum):
+    NONE = "none"           # Index over the stored vectors
+    BINARY = "binary"       # bit index over binary_quantize(vector), candidates re-scored on the stored vectors
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import List, Any, Callable
 from models.db_schemas import RetrievedDocument
+from .VectorSearchFilter import VectorSearchFilter
 
 class VectorDBInterface(ABC):
 
@@ -49,11 +50,43 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str,
-                            vector: Any,
-                            limit: int) -> List[RetrievedDocument]:
+    def delete_by_record_ids(self, collection_name: str, record_ids: list) -> int:
         pass
 
+    @abstractmethod
+    def begin_bulk_ingest(self, collection_name: str, drop_index: bool = True) -> bool:
+        pass
 
+    @abstractmethod
+    def end_bulk_ingest(self, collection_name: str, build_index: bool = True,
+                        progress_callback: Callable[[dict], Any] = None) -> bool:
+        pass
 
+    @abstractmethod
+    def search_by_vector(self, collection_name: str,
+                            vector: Any,
+                            limit: int,
+                            ef_search: int = None,
+                            probes: int = None,
+                            search_filter: VectorSearchFilter = None) -> List[RetrievedDocument]:
+        pass
 
+    @abstractmethod
+    def search_hybrid(self, collection_name: str,
+                      text: str,
+                      vector: Any,
+                      limit: int,
+                      ef_search: int = None,
+                      probes: int = None,
+                      search_filter: VectorSearchFilter = None) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_many(self, collection_name: str,
+                    vectors: List[Any],
+                    limit: int,
+                    ef_search: int = None,
+                    probes: int = None,
+                    search_filter: VectorSearchFilter = None) -> List[List[RetrievedDocument]]:
+        """Top-k for every query vector in one round-trip, results in query order."""
+        pass
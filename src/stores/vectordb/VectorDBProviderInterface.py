@@ -1,5 +1,6 @@
 from .providers.QdrantDBProvider import QdrantDBProvider
 from .providers.PGVectorProvider import PGVectorProvider
+from .providers.NumpyVectorProvider import NumpyVectorProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
@@ -19,7 +20,8 @@ class VectorDBProviderInterface:
                 db_client=qdrant_db_client ,
                 default_vector_size = self.config.EMBEDDING_MODEL_SIZE  ,
                 distance_method = self.config.VECTOR_DB_DISTANCE_METHOD ,
-                index_threshold =  self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD
+                index_threshold =  self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                collection_cache_ttl = self.config.VECTOR_DB_COLLECTION_CACHE_TTL
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
@@ -27,8 +29,39 @@ class VectorDBProviderInterface:
                 db_client = self.db_client,
                 default_vector_size = self.config.EMBEDDING_MODEL_SIZE  ,
                 distance_method = self.config.VECTOR_DB_DISTANCE_METHOD ,
-                index_threshold =  self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD
+                index_threshold =  self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                hnsw_ef_search = self.config.VECTOR_DB_PGVEC_HNSW_EF_SEARCH,
+                ivfflat_probes = self.config.VECTOR_DB_PGVEC_IVFFLAT_PROBES,
+                insert_mode = self.config.VECTOR_DB_PGVEC_INSERT_MODE,
+                copy_batch_size = self.config.VECTOR_DB_PGVEC_COPY_BATCH_SIZE,
+                index_type = self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+                hnsw_m = self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction = self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                ivfflat_lists = self.config.VECTOR_DB_PGVEC_IVFFLAT_LISTS,
+                maintenance_work_mem = self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                max_parallel_maintenance_workers = self.config.VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS,
+                index_progress_interval = self.config.VECTOR_DB_PGVEC_INDEX_PROGRESS_INTERVAL,
+                text_search_configs = self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIGS,
+                hybrid_rrf_k = self.config.VECTOR_DB_HYBRID_RRF_K,
+                hybrid_candidates = self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                iterative_scan = self.config.VECTOR_DB_PGVEC_ITERATIVE_SCAN,
+                storage = self.config.VECTOR_DB_PGVEC_STORAGE,
+                quantization = self.config.VECTOR_DB_PGVEC_QUANTIZATION,
+                binary_rescore_candidates = self.config.VECTOR_DB_PGVEC_BINARY_RESCORE_CANDIDATES,
+                collection_storage = self.config.VECTOR_DB_PGVEC_COLLECTION_STORAGE,
+                collection_cache_ttl = self.config.VECTOR_DB_COLLECTION_CACHE_TTL
             )
-         
+
+        if provider == VectorDBEnums.LOCAL_NUMPY.value:
+            numpy_db_path = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_NUMPY_PATH)
+
+            return NumpyVectorProvider(
+                db_client = numpy_db_path,
+                default_vector_size = self.config.EMBEDDING_MODEL_SIZE,
+                distance_method = self.config.VECTOR_DB_DISTANCE_METHOD,
+                index_threshold = self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                collection_cache_ttl = self.config.VECTOR_DB_COLLECTION_CACHE_TTL
+            )
+
         return None
 
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class VectorSearchFilter:
+    """
+    Restricts a vector search to matching records, applied inside the vector
+    DB query rather than on the returned rows.
+
+    asset_ids        records of chunks from any of these assets
+    metadata         exact key/value matches on the record metadata
+    metadata_ranges  key -> [min, max] on numeric metadata values, either end may be None
+                     (e.g. {"page_start": [0, 10]})
+    chunk_id_min/max inclusive range of the record chunk ids
+    """
+    asset_ids: Optional[List[int]] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata_ranges: Dict[str, List[Optional[float]]] = field(default_factory=dict)
+    chunk_id_min: Optional[int] = None
+    chunk_id_max: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        return (self.asset_ids is None and not self.metadata and not self.metadata_ranges
+                and self.chunk_id_min is None and self.chunk_id_max is None)
+
+    def matches(self, chunk_id: Optional[int], metadata: Optional[dict]) -> bool:
+        """Evaluate the filter in Python, for stores without a query language."""
+        metadata = metadata or {}
+
+        if self.asset_ids is not None and metadata.get("asset_id") not in self.asset_ids:
+            return False
+
+        if any(metadata.get(key) != value for key, value in self.metadata.items()):
+            return False
+
+        for key, (range_min, range_max) in self.metadata_ranges.items():
+            value = metadata.get(key)
+            if not isinstance(value, (int, float)):
+                return False
+            if (range_min is not None and value < range_min) or (range_max is not None and value > range_max):
+                return False
+
+        if self.chunk_id_min is not None or self.chunk_id_max is not None:
+            if not isinstance(chunk_id, int):
+                return False
+            if (self.chunk_id_min is not None and chunk_id < self.chunk_id_min) \
+                    or (self.chunk_id_max is not None and chunk_id > self.chunk_id_max):
+                return False
+
+        return True
@@ -0,0 +1,484 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..CollectionMetadataCache import CollectionMetadataCache
+from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorSearchFilter import VectorSearchFilter
+from models.db_schemas import RetrievedDocument
+from typing import List, Optional, Any, Callable
+import numpy as np
+import asyncio
+import logging
+import fcntl
+import json
+import os
+import shutil
+import uuid
+
+
+class NumpyCollection:
+    """
+    One collection stored as files under its own directory:
+
+        vectors.npy    float32 (capacity, dim) matrix, memory-mapped, rows [0, count) are live
+        records.jsonl  one {"id", "text", "metadata"} line per row, in row order
+        meta.json      dim, count, capacity and records_size, replaced last on every
+                       write so a half-written append is ignored on the next load
+
+    Appends write only the new rows and lines. The matrix grows by doubling
+    its capacity, so the copies are amortized. Other processes pick appends
+    up incrementally, a new generation (after a reset or compaction) makes
+    them load the collection again.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    RECORDS_FILE = "records.jsonl"
+    META_FILE = "meta.json"
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self.vectors = None
+        self.ids = []
+        self.offsets = []
+        self.metadata = []
+        self.meta = {}
+        self.meta_mtime = None
+
+    def file_path(self, file_name: str) -> str:
+        return os.path.join(self.path, file_name)
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    @property
+    def dim(self) -> int:
+        return self.meta["dim"]
+
+    @classmethod
+    def create(cls, path: str, dim: int, distance_method: str) -> "NumpyCollection":
+        os.makedirs(path, exist_ok=True)
+        collection = cls(path)
+        collection.meta = {"dim": dim, "distance_method": distance_method, "count": 0,
+                           "capacity": cls.INITIAL_CAPACITY, "records_size": 0,
+                           "generation": uuid.uuid4().hex}
+
+        np.lib.format.open_memmap(collection.file_path(cls.VECTORS_FILE), mode="w+", dtype=np.float32,
+                                  shape=(cls.INITIAL_CAPACITY, dim)).flush()
+        open(collection.file_path(cls.RECORDS_FILE), "wb").close()
+        collection.write_meta()
+        collection.open_vectors()
+        return collection
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyCollection":
+        collection = cls(path)
+        collection.read_meta()
+        collection.open_vectors()
+        collection.read_records(from_offset=0)
+        return collection
+
+    def read_records(self, from_offset: int):
+        # Only the lines covered by meta.json, anything after is a crashed append
+        offset = from_offset
+        with open(self.file_path(self.RECORDS_FILE), "rb") as records_file:
+            records_file.seek(offset)
+            while offset < self.meta["records_size"]:
+                line = records_file.readline()
+                record = json.loads(line)
+                self.ids.append(record["id"])
+                self.metadata.append(record["metadata"])
+                self.offsets.append(offset)
+                offset += len(line)
+
+    def refresh(self) -> bool:
+        """Catch up with appends made by another process, False when it has to be loaded again."""
+        previous = self.meta
+        self.read_meta()
+        if self.meta["generation"] != previous["generation"]:
+            return False
+
+        if self.meta["capacity"] != previous["capacity"]:
+            self.open_vectors()
+        self.read_records(from_offset=previous["records_size"])
+        return True
+
+    def read_meta(self):
+        meta_path = self.file_path(self.META_FILE)
+        with open(meta_path, "r") as meta_file:
+            self.meta = json.load(meta_file)
+        self.meta_mtime = os.stat(meta_path).st_mtime_ns
+
+    def write_meta(self):
+        meta_path = self.file_path(self.META_FILE)
+        with open(f"{meta_path}.tmp", "w") as meta_file:
+            json.dump(self.meta, meta_file)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        self.meta_mtime = os.stat(meta_path).st_mtime_ns
+
+    def is_stale(self) -> bool:
+        """True when another process changed the collection since it was loaded."""
+        try:
+            return os.stat(self.file_path(self.META_FILE)).st_mtime_ns != self.meta_mtime
+        except FileNotFoundError:
+            return True
+
+    def open_vectors(self):
+        self.vectors = np.load(self.file_path(self.VECTORS_FILE), mmap_mode="r+")
+
+    def grow(self, min_capacity: int):
+        capacity = max(min_capacity, self.meta["capacity"] * 2)
+        vectors_path = self.file_path(self.VECTORS_FILE)
+
+        grown = np.lib.format.open_memmap(f"{vectors_path}.tmp", mode="w+", dtype=np.float32,
+                                          shape=(capacity, self.dim))
+        grown[:self.count] = self.vectors[:self.count]
+        grown.flush()
+        del grown
+
+        self.vectors = None
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+        self.meta["capacity"] = capacity
+        self.open_vectors()
+
+    def append(self, record_ids: list, texts: list, vectors: np.ndarray, metadata: list):
+        start, end = self.count, self.count + len(texts)
+        if end > self.meta["capacity"]:
+            self.grow(min_capacity=end)
+
+        self.vectors[start:end] = vectors
+        self.vectors.flush()
+
+        offset = self.meta["records_size"]
+        offsets = []
+        with open(self.file_path(self.RECORDS_FILE), "r+b") as records_file:
+            records_file.seek(offset)
+            records_file.truncate()
+            for record_id, text, record_metadata in zip(record_ids, texts, metadata):
+                line = (json.dumps({"id": record_id, "text": text, "metadata": record_metadata},
+                                   ensure_ascii=False) + "\n").encode("utf-8")
+                records_file.write(line)
+                offsets.append(offset)
+                offset += len(line)
+            records_file.flush()
+            os.fsync(records_file.fileno())
+
+        self.ids.extend(record_ids)
+        self.metadata.extend(metadata)
+        self.offsets.extend(offsets)
+        self.meta["count"] = end
+        self.meta["records_size"] = offset
+        self.write_meta()
+
+    def delete(self, record_ids: list) -> int:
+        """Drop the rows of record_ids by rewriting the collection without them."""
+        targets = set(record_ids)
+        keep = [row for row, record_id in enumerate(self.ids) if record_id not in targets]
+        deleted = self.count - len(keep)
+        if not deleted:
+            return 0
+
+        kept_vectors = np.array(self.vectors[keep], dtype=np.float32)
+        kept_records = self.get_records(keep)
+
+        compacted_path = f"{self.path}.compact"
+        shutil.rmtree(compacted_path, ignore_errors=True)
+        compacted = NumpyCollection.create(compacted_path, self.dim, self.meta["distance_method"])
+        if keep:
+            compacted.append([record["id"] for record in kept_records],
+                             [record["text"] for record in kept_records],
+                             kept_vectors,
+                             [record["metadata"] for record in kept_records])
+
+        # This instance is stale from here on, callers load the collection again
+        compacted.vectors = None
+        self.vectors = None
+        shutil.rmtree(self.path)
+        os.replace(compacted_path, self.path)
+        return deleted
+
+    def get_records(self, rows) -> List[dict]:
+        records = []
+        with open(self.file_path(self.RECORDS_FILE), "rb") as records_file:
+            for row in rows:
+                records_file.seek(self.offsets[row])
+                records.append(json.loads(records_file.readline()))
+        return records
+
+    def get_filter_mask(self, search_filter: VectorSearchFilter, count: int) -> np.ndarray:
+        return np.fromiter(
+            (search_filter.matches(record_id, metadata)
+             for record_id, metadata in zip(self.ids[:count], self.metadata[:count])),
+            dtype=bool
+        )
+
+    def top_k(self, queries: np.ndarray, k: int, block_rows: int, mask: np.ndarray = None):
+        """
+        Exact top-k rows by inner product for every query row. Scores are
+        computed block by block, each block keeps its own k best through
+        argpartition and only those candidates are sorted at the end.
+        Rows outside mask never make the top-k.
+        Returns (rows, scores), both (len(queries), k).
+        """
+        # A concurrent append may swap the matrix, search the current snapshot
+        vectors, count = self.vectors, self.count
+        if mask is not None:
+            count = min(count, len(mask))
+        k = min(k, count if mask is None else int(mask[:count].sum()))
+        if k == 0:
+            return np.empty((len(queries), 0), dtype=np.int64), np.empty((len(queries), 0), dtype=np.float32)
+        candidate_rows, candidate_scores = [], []
+
+        for start in range(0, count, block_rows):
+            block = vectors[start:min(start + block_rows, count)]
+            scores = queries @ block.T
+            if mask is not None:
+                scores = np.where(mask[start:start + len(block)], scores, -np.inf)
+
+            if scores.shape[1] > k:
+                rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, rows, axis=1)
+            else:
+                rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+
+            candidate_rows.append(rows + start)
+            candidate_scores.append(scores)
+
+        rows = np.concatenate(candidate_rows, axis=1)
+        scores = np.concatenate(candidate_scores, axis=1)
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+class NumpyVectorProvider(VectorDBInterface):
+    """
+    In-process exact search over memory-mapped float32 matrices, one per
+    collection under db_client (a directory in assets/database). Needs no
+    database server, meant for tests, development and small projects.
+
+    Cosine vectors are normalized once when inserted so every search is a
+    plain inner product.
+    """
+
+    SEARCH_BLOCK_ROWS = 262144
+
+    def __init__(self, db_client: str, default_vector_size: int = 786,
+                 distance_method: str = None,
+                 index_threshold: int = 100,
+                 collection_cache_ttl: float = 300):
+
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+        self.index_threshold = index_threshold
+        self.collections = {}
+        self.write_lock = asyncio.Lock()
+        self.logger = logging.getLogger("uvicorn")
+        self.collection_cache = CollectionMetadataCache(ttl=collection_cache_ttl)
+
+    def get_collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_client, collection_name)
+
+    def get_collection(self, collection_name: str) -> Optional[NumpyCollection]:
+        path = self.get_collection_path(collection_name)
+        if not os.path.exists(os.path.join(path, NumpyCollection.META_FILE)):
+            self.collections.pop(collection_name, None)
+            return None
+
+        collection = self.collections.get(collection_name)
+        if collection is not None and (not collection.is_stale() or collection.refresh()):
+            return collection
+
+        collection = NumpyCollection.load(path)
+        self.collections[collection_name] = collection
+        return collection
+
+    def locked_write(self, collection_name: str, write: Callable[[NumpyCollection], Any]):
+        """Run write on the up to date collection under a file lock, workers in other processes write too."""
+        with open(f"{self.get_collection_path(collection_name)}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                return write(self.get_collection(collection_name))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def prepare_vectors(self, vectors: Any) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+
+        if self.distance_method == DistanceMethodEnums.COSINE.value:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        return vectors
+
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+
+    async def disconnect(self):
+        self.collections = {}
+
+    async def is_collection_exist(self, collection_name: str) -> bool:
+        is_exist = self.collection_cache.get(collection_name, "exists")
+        if is_exist is None:
+            is_exist = os.path.exists(os.path.join(self.get_collection_path(collection_name),
+                                                   NumpyCollection.META_FILE))
+            self.collection_cache.set(collection_name, exists=is_exist)
+        return is_exist
+
+    async def list_all_collections(self) -> List:
+        return sorted(
+            name for name in os.listdir(self.db_client)
+            if os.path.exists(os.path.join(self.db_client, name, NumpyCollection.META_FILE))
+        )
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        return {
+            "path": collection.path,
+            "embedding_size": collection.dim,
+            "distance_method": collection.meta["distance_method"],
+            "record_count": collection.count,
+            "capacity": collection.meta["capacity"]
+        }
+
+    async def delete_collection(self, collection_name: str):
+        async with self.write_lock:
+            self.collections.pop(collection_name, None)
+            path = self.get_collection_path(collection_name)
+            if not os.path.exists(path):
+                return None
+
+            self.logger.info(f"Deleting collection: {collection_name}")
+            shutil.rmtree(path)
+            await self.collection_cache.changed(collection_name=collection_name)
+            return True
+
+    async def create_collection(self, collection_name: str, embedding_size: int,
+                                do_reset: bool = False) -> bool:
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_exist(collection_name=collection_name):
+            return False
+
+        async with self.write_lock:
+            self.logger.info(f"Creating new NumPy collection: {collection_name}")
+            self.collections[collection_name] = NumpyCollection.create(
+                self.get_collection_path(collection_name), dim=embedding_size,
+                distance_method=self.distance_method
+            )
+            await self.collection_cache.changed(collection_name=collection_name)
+            self.collection_cache.set(collection_name, exists=True, embedding_size=embedding_size)
+        return True
+
+    async def insert_one(self, collection_name: str, text: str, vector: Any,
+                         metadata: Optional[dict] = None,
+                         record_id: Optional[str] = None) -> bool:
+        return await self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                                      metadata=[metadata], record_ids=[record_id])
+
+    async def insert_many(self, collection_name: str, texts: List[str], vectors: List[Any],
+                          metadata: Optional[List[dict]] = None,
+                          record_ids: Optional[List[str]] = None,
+                          batch_size: int = 50) -> bool:
+        if not await self.is_collection_exist(collection_name=collection_name):
+            self.logger.error(f"Can not insert new record to non-existed collection {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        vectors = self.prepare_vectors(vectors)
+        async with self.write_lock:
+            try:
+                # One append for the whole call, batch_size only matters for remote stores
+                await asyncio.to_thread(
+                    self.locked_write, collection_name,
+                    lambda collection: collection.append(list(record_ids), list(texts), vectors, list(metadata))
+                )
+            except Exception as e:
+                self.logger.error(f"Error while inserting records: {e}")
+                self.collections.pop(collection_name, None)
+                return False
+
+        return True
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list) -> int:
+        if not record_ids or not await self.is_collection_exist(collection_name=collection_name):
+            return 0
+
+        async with self.write_lock:
+            deleted = await asyncio.to_thread(
+                self.locked_write, collection_name, lambda collection: collection.delete(record_ids)
+            )
+            self.collections.pop(collection_name, None)
+
+        await self.collection_cache.changed(collection_name=collection_name)
+        return deleted
+
+    async def begin_bulk_ingest(self, collection_name: str, drop_index: bool = True) -> bool:
+        # Exact search, there is no index to defer
+        return True
+
+    async def end_bulk_ingest(self, collection_name: str, build_index: bool = True,
+                              progress_callback: Callable[[dict], Any] = None) -> bool:
+        await self.collection_cache.changed(collection_name=collection_name)
+        return True
+
+    def search_vectors(self, collection: NumpyCollection, vectors: Any, limit: int,
+                       search_filter: VectorSearchFilter = None) -> List[List[RetrievedDocument]]:
+        mask = None
+        if search_filter is not None and not search_filter.is_empty():
+            mask = collection.get_filter_mask(search_filter, count=collection.count)
+
+        rows, scores = collection.top_k(self.prepare_vectors(vectors), k=limit,
+                                        block_rows=self.SEARCH_BLOCK_ROWS, mask=mask)
+        return [
+            [
+                RetrievedDocument(text=record["text"], score=float(score))
+                for record, score in zip(collection.get_records(query_rows), query_scores)
+            ]
+            for query_rows, query_scores in zip(rows.tolist(), scores.tolist())
+        ]
+
+    async def search_by_vector(self, collection_name: str, vector: Any, limit: int = 5,
+                               ef_search: int = None, probes: int = None,
+                               search_filter: VectorSearchFilter = None):
+        # ef_search / probes tune approximate indexes, the search here is exact
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not search non-existed collection {collection_name}")
+            return []
+
+        if collection.count == 0 or limit <= 0:
+            return []
+
+        results = await asyncio.to_thread(self.search_vectors, collection, vector, limit, search_filter)
+        return results[0]
+
+    async def search_many(self, collection_name: str, vectors: List[Any], limit: int = 5,
+                          ef_search: int = None, probes: int = None,
+                          search_filter: VectorSearchFilter = None):
+        # top_k already scores a whole query matrix per block
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not search non-existed collection {collection_name}")
+            return [[] for _ in vectors]
+
+        if len(vectors) == 0 or collection.count == 0 or limit <= 0:
+            return [[] for _ in vectors]
+
+        return await asyncio.to_thread(self.search_vectors, collection, vectors, limit, search_filter)
+
+    async def search_hybrid(self, collection_name: str, text: str, vector: Any, limit: int = 5,
+                            ef_search: int = None, probes: int = None,
+                            search_filter: VectorSearchFilter = None):
+        # No full-text index here, hybrid requests are served by the vector search
+        return await self.search_by_vector(collection_name=collection_name, vector=vector, limit=limit,
+                                           ef_search=ef_search, probes=probes,
+                                           search_filter=search_filter)
@@ -1,15 +1,47 @@
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums, PgVectorDistanceMethodEnums, PgVectorTableSchemeEnums, PgVectorIndexTypeEnums
-from typing import List, Optional, Any
+from ..CollectionMetadataCache import CollectionMetadataCache
+from ..VectorDBEnums import (DistanceMethodEnums, PgVectorDistanceMethodEnums, PgVectorTableSchemeEnums,
+                             PgVectorIndexTypeEnums, PgVectorDistanceOperatorEnums, PgVectorInsertModeEnums,
+                             PgVectorChannelEnums, PgVectorStorageEnums, PgVectorQuantizationEnums)
+from typing import List, Optional, Any, Callable
 from models.db_schemas import RetrievedDocument
+from ..VectorSearchFilter import VectorSearchFilter
 import logging
+import asyncio
 from sqlalchemy.sql import text as sql_text
+from pgvector.asyncpg import register_vector
+import numpy as np
+import asyncpg
 import json
+import re
 
 class PGVectorProvider(VectorDBInterface):
+    # pgvector default of hnsw.ef_search
+    HNSW_DEFAULT_EF_SEARCH = 40
+
     def __init__(self, db_client, default_vector_size: int = 786, 
                 distance_method: str = None,
-                index_threshold: int=100):
+                index_threshold: int=100,
+                hnsw_ef_search: int = None,
+                ivfflat_probes: int = None,
+                insert_mode: str = PgVectorInsertModeEnums.COPY.value,
+                copy_batch_size: int = 5000,
+                index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+                hnsw_m: int = 16,
+                hnsw_ef_construction: int = 64,
+                ivfflat_lists: int = 100,
+                maintenance_work_mem: str = None,
+                max_parallel_maintenance_workers: int = None,
+                index_progress_interval: float = 5.0,
+                text_search_configs: List[str] = None,
+                hybrid_rrf_k: int = 60,
+                hybrid_candidates: int = 50,
+                iterative_scan: str = "strict_order",
+                storage: str = PgVectorStorageEnums.VECTOR.value,
+                quantization: str = PgVectorQuantizationEnums.NONE.value,
+                binary_rescore_candidates: int = 100,
+                collection_storage: dict = None,
+                collection_cache_ttl: float = 300):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
@@ -23,10 +55,62 @@ class PGVectorProvider(VectorDBInterface):
       
         self.pgvector_table_prefix = PgVectorTableSchemeEnums._PREFIX.value
         self.distance_method = distance_method
+        self.distance_operator = PgVectorDistanceOperatorEnums[
+            PgVectorDistanceMethodEnums(distance_method).name
+        ].value
+
+        # Default per-query ANN tuning, can be overridden on each search call
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfflat_probes = ivfflat_probes
+
+        self.insert_mode = insert_mode
+        self.copy_batch_size = copy_batch_size
+        # Binary COPY runs on its own asyncpg connection, the only one with the pgvector
+        # binary codecs, so pooled connections keep binding vectors as text literals
+        self.copy_connection = None
+        self.copy_lock = asyncio.Lock()
+
+        # Index build parameters
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.ivfflat_lists = ivfflat_lists
+        self.maintenance_work_mem = maintenance_work_mem
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
+        self.index_progress_interval = index_progress_interval
+        # Collections being bulk ingested in this process, their index is built at the end
+        self.bulk_ingest_collections = set()
+
+        # Full-text search configurations (e.g. english, arabic) of the generated tsvector
+        # column, they are interpolated into DDL so only plain identifiers are accepted
+        self.text_search_configs = [
+            config for config in (text_search_configs or ["english", "arabic"])
+            if re.fullmatch(r"[a-z_]+", config)
+        ] or ["simple"]
+        self.hybrid_rrf_k = hybrid_rrf_k
+        self.hybrid_candidates = hybrid_candidates
+
+        # pgvector 0.8+ keeps scanning the ANN index until filtered queries have
+        # enough rows, the extension version is checked on connect
+        self.iterative_scan = iterative_scan
+        self.supports_iterative_scan = False
+
+        # Storage of new collections and quantization of their index, overridable per
+        # collection. halfvec and binary_quantize need pgvector 0.7+, checked on connect
+        self.storage = storage
+        self.quantization = quantization
+        self.binary_rescore_candidates = binary_rescore_candidates
+        self.collection_storage = collection_storage or {}
+        self.supports_halfvec = False
+
+        # Catalog lookups cache, kept in sync across processes with LISTEN/NOTIFY
+        self.collection_cache = CollectionMetadataCache(ttl=collection_cache_ttl)
+        self.listener_connection = None
         # self.logger = logging.getLogger("uvicorn")
         self.logger = logging.getLogger("app.indexer")
         self.logger.setLevel(logging.INFO)
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.text_search_index_name = lambda table_name: f"{table_name}_{PgVectorTableSchemeEnums.TEXT_SEARCH.value}_idx"
 
 
     async def connect(self):
@@ -53,13 +137,78 @@ class PGVectorProvider(VectorDBInterface):
                 await session.execute(sql_text(
                     "CREATE EXTENSION IF NOT EXISTS vector"
                 ))
+                extension_version = (await session.execute(sql_text(
+                    "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+                ))).scalar_one_or_none()
             self.logger.info("pgvector extension initialized successfully")
+
+        self.supports_halfvec = self.is_version_at_least(extension_version, (0, 7))
+        self.supports_iterative_scan = self.is_version_at_least(extension_version, (0, 8))
+        if not self.supports_iterative_scan:
+            self.logger.warning(f"pgvector {extension_version} has no iterative index scans, "
+                                f"filtered searches may return fewer than limit rows")
+
+        await self.listen_collection_changes()
+
+    @staticmethod
+    def is_version_at_least(version: Optional[str], minimum: tuple) -> bool:
+        try:
+            return tuple(int(part) for part in version.split(".")[:len(minimum)]) >= minimum
+        except (AttributeError, ValueError):
+            return False
                 
     async def disconnect(self):
-        pass
+        if self.copy_connection is not None:
+            try:
+                await self.copy_connection.close()
+            finally:
+                self.copy_connection = None
+
+        if self.listener_connection is None:
+            return
+        try:
+            await self.listener_connection.close()
+        finally:
+            self.listener_connection = None
+
+    def get_dsn(self) -> str:
+        """asyncpg DSN of the SQLAlchemy engine, for connections kept outside the pool."""
+        db_engine = self.db_client.kw["bind"]
+        return db_engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    async def listen_collection_changes(self):
+        """Invalidate the local collection cache when another process changes a collection."""
+        try:
+            self.listener_connection = await asyncpg.connect(self.get_dsn())
+            await self.listener_connection.add_listener(
+                PgVectorChannelEnums.COLLECTION_CACHE.value,
+                self.on_collection_change
+            )
+        except Exception as e:
+            self.listener_connection = None
+            self.logger.warning(f"Can not listen for collection changes, relying on cache TTL: {str(e)}")
+
+    def on_collection_change(self, connection, pid, channel, payload):
+        # Not changed(), the process that made the change already notified the change listeners
+        self.collection_cache.invalidate(collection_name=payload or None)
+
+    async def invalidate_collection_cache(self, session, collection_name: str):
+        """Invalidate locally and notify other processes once the transaction commits."""
+        await self.collection_cache.changed(collection_name=collection_name)
+        await session.execute(
+            sql_text("SELECT pg_notify(:channel, :collection_name)"),
+            {
+                "channel": PgVectorChannelEnums.COLLECTION_CACHE.value,
+                "collection_name": collection_name
+            }
+        )
 
     async def is_collection_exist(self, collection_name: str) -> bool:
         """Check if a collection (table) exists in the database."""
+        is_exist = self.collection_cache.get(collection_name, "exists")
+        if is_exist is not None:
+            return is_exist
+
         table_name = f"{self.pgvector_table_prefix}{collection_name}"
         async with self.db_client() as session:
             async with session.begin():
@@ -68,8 +217,102 @@ class PGVectorProvider(VectorDBInterface):
                 results = await session.execute(list_tbl, {"collection_name" : table_name})
                 record = results.scalar_one_or_none()
 
+        self.collection_cache.set(collection_name, exists=record is not None)
         return record is not None
+
+    async def get_collection_embedding_size(self, collection_name: str) -> Optional[int]:
+        """Dimension of the collection vector column, read from the catalog."""
+        embedding_size = self.collection_cache.get(collection_name, "embedding_size")
+        if embedding_size is not None:
+            return embedding_size
+
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        async with self.db_client() as session:
+            # atttypmod holds the declared dimension of vector(n) columns
+            dim_sql = sql_text("""
+                SELECT atttypmod FROM pg_attribute
+                WHERE attrelid = to_regclass(:table_name)
+                AND attname = :column_name
+            """)
+            result = await session.execute(dim_sql, {
+                "table_name": f'"{table_name}"',
+                "column_name": PgVectorTableSchemeEnums.VECTOR.value
+            })
+            embedding_size = result.scalar_one_or_none()
+
+        if embedding_size is not None and embedding_size > 0:
+            self.collection_cache.set(collection_name, embedding_size=embedding_size)
+            return embedding_size
+
+        return None
     
+    def get_storage_settings(self, collection_name: str) -> tuple:
+        """Configured (storage, quantization) of the collection, per collection overrides first."""
+        overrides = self.collection_storage.get(collection_name, {})
+        storage = overrides.get("storage", self.storage)
+        quantization = overrides.get("quantization", self.quantization)
+
+        if storage not in [item.value for item in PgVectorStorageEnums]:
+            raise ValueError(f"Unknown pgvector storage: {storage}")
+        if quantization not in [item.value for item in PgVectorQuantizationEnums]:
+            raise ValueError(f"Unknown pgvector quantization: {quantization}")
+
+        if not self.supports_halfvec and (storage, quantization) != (PgVectorStorageEnums.VECTOR.value,
+                                                                     PgVectorQuantizationEnums.NONE.value):
+            self.logger.warning(f"pgvector < 0.7 has no halfvec / binary_quantize, "
+                                f"collection '{collection_name}' uses float32 vectors")
+            return PgVectorStorageEnums.VECTOR.value, PgVectorQuantizationEnums.NONE.value
+
+        return storage, quantization
+
+    async def get_collection_layout(self, collection_name: str) -> Optional[dict]:
+        """
+        Column type, dimension and index quantization of an existing collection.
+        Read from the catalog rather than the settings, which may have changed
+        since the collection was created.
+        """
+        layout = self.collection_cache.get(collection_name, "layout")
+        if layout is not None:
+            return layout
+
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        async with self.db_client() as session:
+            layout_sql = sql_text("""
+                SELECT types.typname AS storage, attributes.atttypmod AS embedding_size,
+                       (SELECT indexdef FROM pg_indexes
+                        WHERE tablename = :table_name AND indexname = :index_name) AS index_definition
+                FROM pg_attribute AS attributes
+                JOIN pg_type AS types ON types.oid = attributes.atttypid
+                WHERE attributes.attrelid = to_regclass(:quoted_table_name)
+                AND attributes.attname = :column_name
+            """)
+            record = (await session.execute(layout_sql, {
+                "table_name": table_name,
+                "quoted_table_name": f'"{table_name}"',
+                "index_name": self.default_index_name(collection_name=collection_name),
+                "column_name": PgVectorTableSchemeEnums.VECTOR.value
+            })).fetchone()
+
+        if record is None:
+            return None
+
+        is_binary = bool(record.index_definition) and "binary_quantize" in record.index_definition
+        layout = {
+            "storage": record.storage,
+            "embedding_size": record.embedding_size,
+            "quantization": (PgVectorQuantizationEnums.BINARY.value if is_binary
+                             else PgVectorQuantizationEnums.NONE.value),
+        }
+        self.collection_cache.set(collection_name, layout=layout)
+        return layout
+
+    async def get_search_layout(self, collection_name: str) -> dict:
+        return await self.get_collection_layout(collection_name=collection_name) or {
+            "storage": PgVectorStorageEnums.VECTOR.value,
+            "embedding_size": None,
+            "quantization": PgVectorQuantizationEnums.NONE.value,
+        }
+
     async def list_all_collections(self) -> List:
         """List all collection (tables) with the pgvector prefix in the database."""
         records = []
@@ -125,6 +368,7 @@ class PGVectorProvider(VectorDBInterface):
                 self.logger.info(f"Deleting collection: {collection_name}")
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE')
                 await session.execute(delete_sql)
+                await self.invalidate_collection_cache(session=session, collection_name=collection_name)
 
         return True
     
@@ -133,6 +377,7 @@ class PGVectorProvider(VectorDBInterface):
                                       do_reset: bool = False):
         """Create a new collection (table) with vector support."""
         table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        storage, _ = self.get_storage_settings(collection_name=collection_name)
         async with self.db_client() as session:
             async with session.begin():
                 # Drop table if do_reset is True
@@ -145,16 +390,62 @@ class PGVectorProvider(VectorDBInterface):
                         {PgVectorTableSchemeEnums.TEXT.value} TEXT,
                         {PgVectorTableSchemeEnums.CHUNK_ID.value} INTEGER,
                         {PgVectorTableSchemeEnums.METADATA.value} JSONB DEFAULT '{{}}'::jsonb,
-                        {PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}),
+                        {PgVectorTableSchemeEnums.VECTOR.value} {storage}({int(embedding_size)}),
+                        {PgVectorTableSchemeEnums.TEXT_SEARCH.value} tsvector
+                            GENERATED ALWAYS AS ({self.get_tsvector_expression()}) STORED,
                         FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)
                     )
                 """)
                 await session.execute(create_sql)
-                self.logger.info(f"Created collection '{collection_name}' with embedding size {embedding_size}")
+                # Lookup by chunk for incremental re-processing deletes
+                await session.execute(sql_text(
+                    f'CREATE INDEX IF NOT EXISTS "{table_name}_{PgVectorTableSchemeEnums.CHUNK_ID.value}_idx" '
+                    f'ON "{table_name}" ({PgVectorTableSchemeEnums.CHUNK_ID.value})'
+                ))
+                # Filtered searches, metadata @> containment
+                await session.execute(sql_text(
+                    f'CREATE INDEX IF NOT EXISTS "{table_name}_{PgVectorTableSchemeEnums.METADATA.value}_idx" '
+                    f'ON "{table_name}" USING gin ({PgVectorTableSchemeEnums.METADATA.value} jsonb_path_ops)'
+                ))
+                # Keyword side of hybrid search
+                await session.execute(sql_text(
+                    f'CREATE INDEX IF NOT EXISTS "{self.text_search_index_name(table_name)}" '
+                    f'ON "{table_name}" USING gin ({PgVectorTableSchemeEnums.TEXT_SEARCH.value})'
+                ))
+                await self.invalidate_collection_cache(session=session, collection_name=collection_name)
+                self.logger.info(f"Created collection '{collection_name}' with embedding size {embedding_size} ({storage})")
 
+        self.collection_cache.set(collection_name, exists=True)
         return True
     
+    async def is_text_search_enabled(self, collection_name: str) -> bool:
+        """Whether the collection has the tsvector column, tables created before hybrid search lack it."""
+        has_text_search = self.collection_cache.get(collection_name, "has_text_search")
+        if has_text_search is not None:
+            return has_text_search
+
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        async with self.db_client() as session:
+            column_sql = sql_text("""
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = to_regclass(:table_name)
+                AND attname = :column_name
+                AND NOT attisdropped
+            """)
+            result = await session.execute(column_sql, {
+                "table_name": f'"{table_name}"',
+                "column_name": PgVectorTableSchemeEnums.TEXT_SEARCH.value
+            })
+            has_text_search = result.scalar_one_or_none() is not None
+
+        self.collection_cache.set(collection_name, has_text_search=has_text_search)
+        return has_text_search
+
     async def is_index_existed(self, collection_name: str) -> bool:
+        has_index = self.collection_cache.get(collection_name, "has_index")
+        if has_index is not None:
+            return has_index
+
         index_name = self.default_index_name(collection_name=collection_name)
         table_name = f"{self.pgvector_table_prefix}{collection_name}"
 
@@ -173,21 +464,71 @@ class PGVectorProvider(VectorDBInterface):
                         "index_name": index_name
                     }
                 )
+                has_index = bool(results.scalar_one_or_none())
 
-                return bool(results.scalar_one_or_none())
+        self.collection_cache.set(collection_name, has_index=has_index)
+        return has_index
             
+    def get_binary_expression(self, layout: dict) -> str:
+        # Must match the index expression for the bit index to serve the ORDER BY
+        return f"binary_quantize({PgVectorTableSchemeEnums.VECTOR.value})::bit({int(layout['embedding_size'])})"
+
+    def get_create_index_sql(self, collection_name: str, index_type: str, layout: dict,
+                             concurrently: bool = False) -> str:
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        index_name = self.default_index_name(collection_name=collection_name)
+
+        if layout["quantization"] == PgVectorQuantizationEnums.BINARY.value:
+            index_expression = f"({self.get_binary_expression(layout)}) bit_hamming_ops"
+        elif layout["storage"] == PgVectorStorageEnums.HALFVEC.value:
+            index_expression = f"{PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method.replace('vector_', 'halfvec_', 1)}"
+        else:
+            index_expression = f"{PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method}"
+
+        if index_type == PgVectorIndexTypeEnums.HNSW.value:
+            index_params = f"m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)}"
+        else:
+            index_params = f"lists = {int(self.ivfflat_lists)}"
+
+        return (
+            f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS {index_name} '
+            f'ON "{table_name}" '
+            f'USING {index_type} ({index_expression}) '
+            f'WITH ({index_params})'
+        )
+
+    async def set_maintenance_params(self, connection, is_local: bool = True):
+        """Tune memory and parallel workers used by the index build."""
+        for name, value in (
+            ("maintenance_work_mem", self.maintenance_work_mem),
+            ("max_parallel_maintenance_workers", self.max_parallel_maintenance_workers),
+        ):
+            if value is None:
+                continue
+            await connection.execute(
+                sql_text("SELECT set_config(:name, :value, :is_local)"),
+                {"name": name, "value": str(value), "is_local": is_local}
+            )
+
     async def create_vector_index(self,collection_name: str,
-                                    index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+                                    index_type: str = None,
+                                    concurrently: bool = False,
+                                    progress_callback: Callable[[dict], Any] = None):
         
+        index_type = index_type or self.index_type
         table_name = f"{self.pgvector_table_prefix}{collection_name}"
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
         if is_index_existed:
             self.logger.info(f"Index already exists for collection: {collection_name}")
             return False
+
+        # The stored column type with the configured quantization
+        _, quantization = self.get_storage_settings(collection_name=collection_name)
+        layout = {**await self.get_search_layout(collection_name=collection_name), "quantization": quantization}
         
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {table_name}')
+                count_sql = sql_text(f'SELECT COUNT(*) FROM "{table_name}"')
                 result = await session.execute(count_sql)
                 records_count = result.scalar_one()
 
@@ -197,34 +538,222 @@ class PGVectorProvider(VectorDBInterface):
                     f"for collection: {collection_name}"
                     )
                     return False
-                
-                self.logger.info(f"START: Creating vector index for collection: {collection_name}")
-                index_name = self.default_index_name(collection_name=collection_name)
-                create_idx_sql = sql_text(
-                    f'CREATE INDEX {index_name} ON "{table_name}" '
-                    f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
-                )
 
-                self.logger.info(f"Creating index with SQL: {create_idx_sql}")
+                if not concurrently:
+                    self.logger.info(f"START: Creating vector index for collection: {collection_name}")
+                    create_idx_sql = sql_text(self.get_create_index_sql(collection_name=collection_name,
+                                                                        index_type=index_type,
+                                                                        layout=layout))
 
-                await session.execute(create_idx_sql)
+                    self.logger.info(f"Creating index with SQL: {create_idx_sql}")
 
-                self.logger.info(f"END: Created vector index for collection: {collection_name}")
+                    await self.set_maintenance_params(connection=session)
+                    await session.execute(create_idx_sql)
+                    await self.invalidate_collection_cache(session=session, collection_name=collection_name)
+
+                    self.logger.info(f"END: Created vector index for collection: {collection_name}")
+
+        if concurrently:
+            await self.build_index_concurrently(collection_name=collection_name,
+                                                index_type=index_type,
+                                                layout=layout,
+                                                progress_callback=progress_callback)
         
         return True
+
+    async def build_index_concurrently(self, collection_name: str, index_type: str, layout: dict,
+                                       progress_callback: Callable[[dict], Any] = None):
+        """Build the index with CREATE INDEX CONCURRENTLY and report its progress while it runs."""
+        build_task = asyncio.create_task(
+            self.execute_concurrent_index_build(collection_name=collection_name,
+                                                index_type=index_type,
+                                                layout=layout)
+        )
+
+        while not build_task.done():
+            await asyncio.wait({build_task}, timeout=self.index_progress_interval)
+            if progress_callback is None or build_task.done():
+                continue
+
+            try:
+                progress = await self.get_index_build_progress(collection_name=collection_name)
+                if progress:
+                    progress_callback(progress)
+            except Exception as e:
+                self.logger.warning(f"Can not read index build progress for collection: {collection_name}: {str(e)}")
+
+        return build_task.result()
+
+    async def execute_concurrent_index_build(self, collection_name: str, index_type: str, layout: dict):
+        index_name = self.default_index_name(collection_name=collection_name)
+        create_idx_sql = sql_text(self.get_create_index_sql(collection_name=collection_name,
+                                                            index_type=index_type,
+                                                            layout=layout,
+                                                            concurrently=True))
+
+        async with self.db_client() as session:
+            # CREATE INDEX CONCURRENTLY can not run inside a transaction block
+            connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            await self.set_maintenance_params(connection=connection, is_local=False)
+
+            self.logger.info(f"START: Creating vector index concurrently for collection: {collection_name}")
+            try:
+                await connection.execute(create_idx_sql)
+            except Exception:
+                # A failed concurrent build leaves an INVALID index behind
+                invalid_sql = sql_text(
+                    "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index_name)"
+                )
+                is_invalid = (await connection.execute(invalid_sql, {"index_name": index_name})).scalar_one_or_none()
+                if is_invalid:
+                    await connection.execute(sql_text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+                raise
+            finally:
+                await connection.execute(sql_text("RESET maintenance_work_mem"))
+                await connection.execute(sql_text("RESET max_parallel_maintenance_workers"))
+
+            await self.invalidate_collection_cache(session=connection, collection_name=collection_name)
+            self.logger.info(f"END: Created vector index concurrently for collection: {collection_name}")
+
+        return True
+
+    async def get_index_build_progress(self, collection_name: str) -> Optional[dict]:
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+
+        async with self.db_client() as session:
+            progress_sql = sql_text("""
+                SELECT phase, blocks_total, blocks_done, tuples_total, tuples_done
+                FROM pg_stat_progress_create_index
+                WHERE relid = to_regclass(:table_name)
+            """)
+            result = await session.execute(progress_sql, {"table_name": f'"{table_name}"'})
+            record = result.fetchone()
+
+        if record is None:
+            return None
+
+        return {
+            "phase": record.phase,
+            "blocks_total": record.blocks_total,
+            "blocks_done": record.blocks_done,
+            "tuples_total": record.tuples_total,
+            "tuples_done": record.tuples_done,
+        }
+
+    async def drop_vector_index(self, collection_name: str, concurrently: bool = False) -> bool:
+        index_name = self.default_index_name(collection_name=collection_name)
+        async with self.db_client() as session:
+            if concurrently:
+                connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+                await connection.execute(sql_text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+                await self.invalidate_collection_cache(session=connection, collection_name=collection_name)
+            else:
+                async with session.begin():
+                    await session.execute(sql_text(f"DROP INDEX IF EXISTS {index_name}"))
+                    await self.invalidate_collection_cache(session=session, collection_name=collection_name)
+
+        return True
     
     async def reset_vector_index(self, collection_name: str, 
-                                index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
+                                index_type: str = None) -> bool:
         
-        index_name = self.default_index_name(collection_name=collection_name)
-        async with self.db_client() as session:
-            async with session.begin():
-                drop_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
-                await session.execute(drop_sql)
+        _ = await self.drop_vector_index(collection_name=collection_name)
         
         return await self.create_vector_index(collection_name=collection_name,
                                             index_type=index_type)
 
+    async def migrate_collection_storage(self, collection_name: str,
+                                         progress_callback: Callable[[dict], Any] = None) -> bool:
+        """
+        Bring an existing collection to its configured storage and quantization.
+        A storage change rewrites the vector column in place (ALTER ... TYPE holds
+        an exclusive lock on the table while it runs), then the vector index is
+        rebuilt concurrently. Searches fall back to a sequential scan until the
+        new index is ready. Returns False when there is nothing to change.
+        """
+        layout = await self.get_collection_layout(collection_name=collection_name)
+        if layout is None:
+            self.logger.info(f"Can not migrate non-existed collection: {collection_name}")
+            return False
+
+        storage, quantization = self.get_storage_settings(collection_name=collection_name)
+        has_index = await self.is_index_existed(collection_name=collection_name)
+        if layout["storage"] == storage and (layout["quantization"] == quantization or not has_index):
+            return False
+
+        _ = await self.drop_vector_index(collection_name=collection_name, concurrently=True)
+
+        if layout["storage"] != storage:
+            table_name = f"{self.pgvector_table_prefix}{collection_name}"
+            vector_type = f"{storage}({int(layout['embedding_size'])})"
+            async with self.db_client() as session:
+                async with session.begin():
+                    self.logger.info(f"START: Converting collection '{collection_name}' to {vector_type}")
+                    await session.execute(sql_text(
+                        f'ALTER TABLE "{table_name}" '
+                        f'ALTER COLUMN {PgVectorTableSchemeEnums.VECTOR.value} TYPE {vector_type} '
+                        f'USING {PgVectorTableSchemeEnums.VECTOR.value}::{vector_type}'
+                    ))
+                    await self.invalidate_collection_cache(session=session, collection_name=collection_name)
+                    self.logger.info(f"END: Converted collection '{collection_name}' to {vector_type}")
+
+        _ = await self.create_vector_index(collection_name=collection_name,
+                                           concurrently=True,
+                                           progress_callback=progress_callback)
+        return True
+
+    async def begin_bulk_ingest(self, collection_name: str, drop_index: bool = True) -> bool:
+        """Stop maintaining the vector index while a bulk indexing run is in progress."""
+        self.bulk_ingest_collections.add(collection_name)
+
+        if drop_index:
+            _ = await self.drop_vector_index(collection_name=collection_name, concurrently=True)
+
+        self.logger.info(f"Bulk ingest started for collection: {collection_name}")
+        return True
+
+    async def end_bulk_ingest(self, collection_name: str, build_index: bool = True,
+                              progress_callback: Callable[[dict], Any] = None) -> bool:
+        """Build the vector index once, concurrently, after a bulk indexing run."""
+        self.bulk_ingest_collections.discard(collection_name)
+        self.logger.info(f"Bulk ingest ended for collection: {collection_name}")
+
+        # New records, let every process drop what it derived from this collection
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.invalidate_collection_cache(session=session, collection_name=collection_name)
+
+        if not build_index:
+            return False
+
+        return await self.create_vector_index(collection_name=collection_name,
+                                              concurrently=True,
+                                              progress_callback=progress_callback)
+
+    async def maybe_create_vector_index(self, collection_name: str) -> bool:
+        # Index is built once by end_bulk_ingest
+        if collection_name in self.bulk_ingest_collections:
+            return False
+
+        return await self.create_vector_index(collection_name=collection_name)
+
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list) -> int:
+        """Delete the vectors of the given chunk ids."""
+        if not record_ids or not await self.is_collection_exist(collection_name=collection_name):
+            return 0
+
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    sql_text(f'DELETE FROM "{table_name}" '
+                             f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)'),
+                    {"record_ids": list(record_ids)}
+                )
+                await self.invalidate_collection_cache(session=session, collection_name=collection_name)
+
+        return result.rowcount
 
     async def insert_one(self, collection_name: str, text: str, vector: Any,
                                 metadata: dict = None,
@@ -250,12 +779,12 @@ class PGVectorProvider(VectorDBInterface):
 
                 await session.execute(insert_sql, {
                     "text" : text,
-                    "vector" : "[" + ",".join([str(v) for v in vector]) +"]" ,
+                    "vector" : self.get_vector_literal(vector),
                     "metadata" : json.dumps(metadata) if metadata else '{}',
                     "chunk_id" : record_id
                 })
 
-                await self.create_vector_index(collection_name=collection_name)
+        await self.maybe_create_vector_index(collection_name=collection_name)
         return True
 
     async def insert_many(self, collection_name: str, texts: str, vectors: Any,
@@ -274,7 +803,30 @@ class PGVectorProvider(VectorDBInterface):
         
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
-        
+
+        if self.insert_mode == PgVectorInsertModeEnums.COPY.value:
+            try:
+                await self.copy_many(collection_name=collection_name, texts=texts,
+                                     vectors=vectors, metadata=metadata,
+                                     record_ids=record_ids)
+            except Exception as e:
+                self.logger.warning(f"COPY insert failed for collection: {collection_name}, "
+                                    f"falling back to INSERT: {str(e)}")
+                await self.insert_many_values(collection_name=collection_name, texts=texts,
+                                              vectors=vectors, metadata=metadata,
+                                              record_ids=record_ids, batch_size=batch_size)
+        else:
+            await self.insert_many_values(collection_name=collection_name, texts=texts,
+                                          vectors=vectors, metadata=metadata,
+                                          record_ids=record_ids, batch_size=batch_size)
+
+        await self.maybe_create_vector_index(collection_name=collection_name)
+
+        return True
+
+    async def insert_many_values(self, collection_name: str, texts: list, vectors: Any,
+                                 metadata: list, record_ids: list, batch_size: int = 50):
+        """Insert records through parameterized INSERT batches."""
         table_name = f"{self.pgvector_table_prefix}{collection_name}"
         async with self.db_client() as session:
             async with session.begin():
@@ -289,7 +841,7 @@ class PGVectorProvider(VectorDBInterface):
                     for _text, _vector, _metadata, _record_id in zip(batch_text, batch_vectors, batch_metadata, batch_record_ids):
                         values.append({
                             "text" : _text,
-                            "vector" : "[" + ",".join([str(v) for v in _vector]) +"]" ,
+                            "vector" : self.get_vector_literal(_vector),
                             "metadata" : json.dumps(_metadata) if _metadata else '{}',
                             "chunk_id" : _record_id
                         })
@@ -304,38 +856,321 @@ class PGVectorProvider(VectorDBInterface):
                         """
                     )
                     await session.execute(batch_insert_sql, values)
-        await self.create_vector_index(collection_name=collection_name)
 
         return True
 
+    async def get_copy_connection(self):
+        """The dedicated COPY connection, opened with the vector codecs on first use."""
+        if self.copy_connection is None or self.copy_connection.is_closed():
+            connection = await asyncpg.connect(self.get_dsn())
+            try:
+                await register_vector(connection)
+            except Exception:
+                await connection.close()
+                raise
+            self.copy_connection = connection
+
+        return self.copy_connection
+
+    async def copy_many(self, collection_name: str, texts: list, vectors: Any,
+                        metadata: list, record_ids: list):
+        """Stream records into the collection table with binary COPY."""
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+
+        async with self.copy_lock:
+            connection = await self.get_copy_connection()
+            try:
+                async with connection.transaction():
+                    await self.copy_records(connection=connection, table_name=table_name, columns=columns,
+                                            texts=texts, vectors=vectors, metadata=metadata,
+                                            record_ids=record_ids)
+            except Exception:
+                # Reconnect on the next call rather than reuse a connection in an unknown state
+                self.copy_connection = None
+                connection.terminate()
+                raise
+
+        return True
+
+    async def copy_records(self, connection, table_name: str, columns: list, texts: list, vectors: Any,
+                           metadata: list, record_ids: list):
+        for i in range(0, len(texts), self.copy_batch_size):
+            batch_end = i + self.copy_batch_size
+            records = [
+                (
+                    _text,
+                    np.asarray(_vector, dtype=np.float32),
+                    json.dumps(_metadata) if _metadata else '{}',
+                    _record_id
+                )
+                for _text, _vector, _metadata, _record_id in zip(
+                    texts[i:batch_end], vectors[i:batch_end],
+                    metadata[i:batch_end], record_ids[i:batch_end]
+                )
+            ]
+
+            await connection.copy_records_to_table(
+                table_name, records=records, columns=columns
+            )
+
+        return True
+
+    def get_vector_literal(self, vector: Any) -> str:
+        return "[" + ",".join([str(v) for v in vector]) + "]"
+
+    def get_score_expression(self, distance_expression: str) -> str:
+        """Convert the raw distance returned by the operator into a similarity score."""
+        if self.distance_method == PgVectorDistanceMethodEnums.VECTOR_COSINE_OPS.value:
+            return f"1 - ({distance_expression})"
+
+        if self.distance_method == PgVectorDistanceMethodEnums.VECTOR_IP_OPS.value:
+            # <#> returns the negative inner product
+            return f"({distance_expression}) * -1"
+
+        return f"1 / (1 + ({distance_expression}))"
+
+    def get_filter_sql(self, search_filter: Optional[VectorSearchFilter]):
+        """Condition (or "") and its bind parameters for the search filter."""
+        if search_filter is None or search_filter.is_empty():
+            return "", {}
+
+        chunk_id = PgVectorTableSchemeEnums.CHUNK_ID.value
+        metadata = PgVectorTableSchemeEnums.METADATA.value
+        conditions, params = [], {}
+
+        if search_filter.asset_ids is not None:
+            # Through the chunks table, so rows indexed before asset_id was in the metadata match too
+            conditions.append(f"{chunk_id} IN (SELECT chunk_id FROM chunks "
+                              f"WHERE chunk_asset_id = ANY(:filter_asset_ids))")
+            params["filter_asset_ids"] = list(search_filter.asset_ids)
+
+        if search_filter.metadata:
+            # Served by the jsonb_path_ops GIN index
+            conditions.append(f"{metadata} @> CAST(:filter_metadata AS jsonb)")
+            params["filter_metadata"] = json.dumps(search_filter.metadata)
+
+        for idx, (key, (range_min, range_max)) in enumerate(search_filter.metadata_ranges.items()):
+            value_expression = f"({metadata} ->> :filter_range_key_{idx})::numeric"
+            params[f"filter_range_key_{idx}"] = key
+            if range_min is not None:
+                conditions.append(f"{value_expression} >= :filter_range_min_{idx}")
+                params[f"filter_range_min_{idx}"] = range_min
+            if range_max is not None:
+                conditions.append(f"{value_expression} <= :filter_range_max_{idx}")
+                params[f"filter_range_max_{idx}"] = range_max
+
+        if search_filter.chunk_id_min is not None:
+            conditions.append(f"{chunk_id} >= :filter_chunk_id_min")
+            params["filter_chunk_id_min"] = search_filter.chunk_id_min
+        if search_filter.chunk_id_max is not None:
+            conditions.append(f"{chunk_id} <= :filter_chunk_id_max")
+            params["filter_chunk_id_max"] = search_filter.chunk_id_max
+
+        return " AND ".join(conditions), params
+
+    def get_query_vector_sql(self, layout: dict, query_vector: str = ":vector") -> str:
+        return f"CAST({query_vector} AS {layout['storage']})"
+
+    def get_rescore_params(self, layout: dict, limit: int) -> dict:
+        """Rows the ANN index has to return for limit results, and the matching bind parameters."""
+        if layout["quantization"] != PgVectorQuantizationEnums.BINARY.value:
+            return {}
+        return {"rescore_candidates": max(limit, self.binary_rescore_candidates)}
+
+    def get_nearest_sql(self, table_name: str, layout: dict, columns: str, query_vector: str,
+                        limit: str, filter_sql: str = "") -> str:
+        """
+        The limit rows nearest to query_vector as (columns, distance). ORDER BY
+        uses the raw distance operator (ascending) so Postgres can satisfy it
+        from the HNSW/IVFFlat index. With a binary quantized index the bit index
+        returns :rescore_candidates rows by hamming distance, which are then
+        re-ranked on the stored vectors.
+        """
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        distance_expression = f"{vector_column} {self.distance_operator} {query_vector}"
+        where_sql = f"WHERE {filter_sql}" if filter_sql else ""
+
+        if layout["quantization"] != PgVectorQuantizationEnums.BINARY.value:
+            return f"""
+                SELECT {columns}, {distance_expression} AS distance
+                FROM "{table_name}"
+                {where_sql}
+                ORDER BY {distance_expression}
+                LIMIT {limit}
+            """
+
+        return f"""
+            SELECT {columns}, {distance_expression} AS distance
+            FROM (
+                SELECT {PgVectorTableSchemeEnums.ID.value}, {PgVectorTableSchemeEnums.TEXT.value}, {vector_column}
+                FROM "{table_name}"
+                {where_sql}
+                ORDER BY {self.get_binary_expression(layout)} <~> binary_quantize({query_vector})
+                LIMIT :rescore_candidates
+            ) AS candidates
+            ORDER BY {distance_expression}
+            LIMIT {limit}
+        """
+
+    def get_search_sql(self, table_name: str, layout: dict, filter_sql: str = "") -> str:
+        nearest_sql = self.get_nearest_sql(table_name=table_name, layout=layout,
+                                           columns=PgVectorTableSchemeEnums.TEXT.value,
+                                           query_vector=self.get_query_vector_sql(layout),
+                                           limit=":limit", filter_sql=filter_sql)
+        # relaxed_order iterative scans may return rows slightly out of order, sort the top rows again
+        return f"""
+            SELECT nearest.text AS text, {self.get_score_expression("nearest.distance")} AS score
+            FROM ({nearest_sql}) AS nearest
+            ORDER BY nearest.distance
+        """
+
+    def get_search_many_sql(self, table_name: str, layout: dict, filter_sql: str = "") -> str:
+        """
+        Top-k for a batch of query vectors in one statement. The vectors are
+        unnested with their position and each drives its own LATERAL
+        ORDER BY ... LIMIT, which is served by the ANN index like a single search.
+        """
+        nearest_sql = self.get_nearest_sql(table_name=table_name, layout=layout,
+                                           columns=PgVectorTableSchemeEnums.TEXT.value,
+                                           query_vector="queries.query_vector",
+                                           limit=":limit", filter_sql=filter_sql)
+        return f"""
+            SELECT queries.query_idx, nearest.text,
+                   {self.get_score_expression("nearest.distance")} AS score
+            FROM (
+                SELECT {self.get_query_vector_sql(layout, "query_vector")} AS query_vector, query_idx
+                FROM unnest(CAST(:vectors AS text[])) WITH ORDINALITY AS query_vectors(query_vector, query_idx)
+            ) AS queries
+            CROSS JOIN LATERAL ({nearest_sql}) AS nearest
+            ORDER BY queries.query_idx, nearest.distance
+        """
+
+    def get_tsvector_expression(self) -> str:
+        # One tsvector per configuration, so English stems and Arabic stems both match
+        return " || ".join(
+            f"to_tsvector('{config}'::regconfig, coalesce({PgVectorTableSchemeEnums.TEXT.value}, ''))"
+            for config in self.text_search_configs
+        )
+
+    def get_tsquery_expression(self) -> str:
+        # plainto_tsquery ANDs every term, OR them instead so a question
+        # matches chunks that share any of its keywords
+        return " || ".join(
+            f"replace(plainto_tsquery('{config}'::regconfig, :query)::text, ' & ', ' | ')::tsquery"
+            for config in self.text_search_configs
+        )
+
+    def get_hybrid_search_sql(self, table_name: str, layout: dict, filter_sql: str = "") -> str:
+        """
+        Keyword and ANN candidates in one statement, fused with reciprocal rank
+        fusion: score = sum of 1 / (rrf_k + rank) over the lists a row is in.
+        Each side keeps its ORDER BY ... LIMIT so it is served by its own index.
+        """
+        record_id = PgVectorTableSchemeEnums.ID.value
+        text_search = PgVectorTableSchemeEnums.TEXT_SEARCH.value
+        nearest_sql = self.get_nearest_sql(table_name=table_name, layout=layout,
+                                           columns=f"{record_id} AS id",
+                                           query_vector=self.get_query_vector_sql(layout),
+                                           limit=":candidates", filter_sql=filter_sql)
+        return f"""
+            WITH semantic AS (
+                SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+                FROM ({nearest_sql}) AS nearest
+            ),
+            keyword AS (
+                SELECT id, ROW_NUMBER() OVER (ORDER BY keyword_rank DESC, id) AS rank
+                FROM (
+                    SELECT records.{record_id} AS id,
+                           ts_rank_cd(records.{text_search}, keyword_query.query) AS keyword_rank
+                    FROM "{table_name}" AS records,
+                         (SELECT {self.get_tsquery_expression()} AS query) AS keyword_query
+                    WHERE records.{text_search} @@ keyword_query.query
+                    {f"AND {filter_sql}" if filter_sql else ""}
+                    ORDER BY keyword_rank DESC
+                    LIMIT :candidates
+                ) AS matches
+            ),
+            fused AS (
+                SELECT COALESCE(semantic.id, keyword.id) AS id,
+                       (COALESCE(1.0 / (:rrf_k + semantic.rank), 0)
+                           + COALESCE(1.0 / (:rrf_k + keyword.rank), 0))::double precision AS score
+                FROM semantic FULL OUTER JOIN keyword ON semantic.id = keyword.id
+            )
+            SELECT records.{PgVectorTableSchemeEnums.TEXT.value} AS text, fused.score AS score
+            FROM fused JOIN "{table_name}" AS records ON records.{record_id} = fused.id
+            ORDER BY fused.score DESC
+            LIMIT :limit
+        """
+
+    async def set_search_params(self, session, limit: int,
+                                ef_search: int = None, probes: int = None,
+                                filtered: bool = False):
+        """Apply transaction-local ANN tuning (SET LOCAL equivalent)."""
+        ef_search = ef_search or self.hnsw_ef_search
+        probes = probes or self.ivfflat_probes
+
+        if filtered and self.supports_iterative_scan and self.iterative_scan != "off":
+            # Keep walking the index until limit rows pass the filter,
+            # ivfflat only has the relaxed mode
+            for name, value in (("hnsw.iterative_scan", self.iterative_scan),
+                                ("ivfflat.iterative_scan", "relaxed_order")):
+                await session.execute(
+                    sql_text("SELECT set_config(:name, :value, true)"),
+                    {"name": name, "value": value}
+                )
+
+        if ef_search or limit > self.HNSW_DEFAULT_EF_SEARCH:
+            # hnsw returns at most ef_search rows, re-scored binary searches ask for more than the default
+            await session.execute(
+                sql_text("SELECT set_config('hnsw.ef_search', :value, true)"),
+                {"value": str(max(ef_search or 0, limit))}
+            )
+
+        if probes:
+            await session.execute(
+                sql_text("SELECT set_config('ivfflat.probes', :value, true)"),
+                {"value": str(probes)}
+            )
+
     async def search_by_vector(self,collection_name: str,
                                     vector: Any,
-                                    limit: int) -> List[RetrievedDocument]:
+                                    limit: int,
+                                    ef_search: int = None,
+                                    probes: int = None,
+                                    search_filter: VectorSearchFilter = None) -> List[RetrievedDocument]:
         
         is_collection_exists = await self.is_collection_exist(collection_name=collection_name)
         if not is_collection_exists:
             self.logger.info(f"Can not search for records in a non-existed collection: {collection_name}")
             return False
         
-        vector = "[" + ",".join([str(v) for v in vector]) +"]"
+        vector = self.get_vector_literal(vector)
+        filter_sql, filter_params = self.get_filter_sql(search_filter)
+        layout = await self.get_search_layout(collection_name=collection_name)
+        rescore_params = self.get_rescore_params(layout=layout, limit=limit)
 
         table_name = f"{self.pgvector_table_prefix}{collection_name}"
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(
-                    f"""
-                    SELECT
-                        {PgVectorTableSchemeEnums.TEXT.value} AS text,
-                        1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) AS score
-                    FROM "{table_name}"
-                    ORDER BY score DESC
-                    LIMIT :limit
-                    """
-                )
+                await self.set_search_params(session=session,
+                                             limit=rescore_params.get("rescore_candidates", limit),
+                                             ef_search=ef_search, probes=probes,
+                                             filtered=bool(filter_sql))
+
+                search_sql = sql_text(self.get_search_sql(table_name=table_name, layout=layout,
+                                                          filter_sql=filter_sql))
 
                 results = await session.execute(search_sql, {
                     "vector" : vector,
-                     "limit": limit},
+                     "limit": limit,
+                     **rescore_params,
+                     **filter_params},
                 )
                 
                 records = results.fetchall()
@@ -347,6 +1182,151 @@ class PGVectorProvider(VectorDBInterface):
             )
             for record in records
         ]
-            
 
-        
+    async def search_many(self, collection_name: str, vectors: List[Any], limit: int,
+                          ef_search: int = None, probes: int = None,
+                          search_filter: VectorSearchFilter = None) -> List[List[RetrievedDocument]]:
+        results = [[] for _ in vectors]
+        if len(vectors) == 0 or not await self.is_collection_exist(collection_name=collection_name):
+            self.logger.info(f"Can not search for records in a non-existed collection: {collection_name}")
+            return results
+
+        filter_sql, filter_params = self.get_filter_sql(search_filter)
+        layout = await self.get_search_layout(collection_name=collection_name)
+        rescore_params = self.get_rescore_params(layout=layout, limit=limit)
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.set_search_params(session=session,
+                                             limit=rescore_params.get("rescore_candidates", limit),
+                                             ef_search=ef_search, probes=probes,
+                                             filtered=bool(filter_sql))
+
+                search_sql = sql_text(self.get_search_many_sql(table_name=table_name, layout=layout,
+                                                               filter_sql=filter_sql))
+                records = (await session.execute(search_sql, {
+                    "vectors": [self.get_vector_literal(vector) for vector in vectors],
+                    "limit": limit,
+                    **rescore_params,
+                    **filter_params
+                })).fetchall()
+
+        # WITH ORDINALITY counts from 1
+        for record in records:
+            results[record.query_idx - 1].append(RetrievedDocument(text=record.text, score=record.score))
+        return results
+
+    async def search_hybrid(self, collection_name: str, text: str, vector: Any, limit: int,
+                            ef_search: int = None, probes: int = None,
+                            search_filter: VectorSearchFilter = None) -> List[RetrievedDocument]:
+        if not await self.is_collection_exist(collection_name=collection_name):
+            self.logger.info(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        if not await self.is_text_search_enabled(collection_name=collection_name):
+            self.logger.warning(f"Collection '{collection_name}' has no full-text column, "
+                                f"falling back to vector search")
+            return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                               limit=limit, ef_search=ef_search, probes=probes,
+                                               search_filter=search_filter)
+
+        candidates = max(limit, self.hybrid_candidates)
+        filter_sql, filter_params = self.get_filter_sql(search_filter)
+        layout = await self.get_search_layout(collection_name=collection_name)
+        rescore_params = self.get_rescore_params(layout=layout, limit=candidates)
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.set_search_params(session=session,
+                                             limit=rescore_params.get("rescore_candidates", candidates),
+                                             ef_search=ef_search, probes=probes,
+                                             filtered=bool(filter_sql))
+
+                hybrid_sql = self.get_hybrid_search_sql(table_name=table_name, layout=layout,
+                                                        filter_sql=filter_sql)
+                results = await session.execute(sql_text(hybrid_sql), {
+                    "vector": self.get_vector_literal(vector),
+                    "query": text,
+                    "candidates": candidates,
+                    "rrf_k": self.hybrid_rrf_k,
+                    "limit": limit,
+                    **rescore_params,
+                    **filter_params
+                })
+                records = results.fetchall()
+
+        return [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score
+            )
+            for record in records
+        ]
+
+    def is_index_scan_plan(self, plan: dict, index_name: str) -> bool:
+        if plan.get("Node Type") in ("Index Scan", "Index Only Scan") \
+                and plan.get("Index Name") == index_name:
+            return True
+
+        return any(
+            self.is_index_scan_plan(plan=sub_plan, index_name=index_name)
+            for sub_plan in plan.get("Plans", [])
+        )
+
+    async def check_search_plan(self, collection_name: str, limit: int = 10) -> bool:
+        """Run EXPLAIN on the search query and check it is served by the vector index."""
+        table_name = f"{self.pgvector_table_prefix}{collection_name}"
+        index_name = self.default_index_name(collection_name=collection_name)
+
+        if not await self.is_index_existed(collection_name=collection_name):
+            self.logger.warning(
+                f"Collection '{collection_name}' has no vector index, searches will use a sequential scan"
+            )
+            return False
+
+        async with self.db_client() as session:
+            async with session.begin():
+                sample_sql = sql_text(
+                    f'SELECT {PgVectorTableSchemeEnums.VECTOR.value}::text FROM "{table_name}" LIMIT 1'
+                )
+                sample_vector = (await session.execute(sample_sql)).scalar_one_or_none()
+                if sample_vector is None:
+                    return True
+
+                layout = await self.get_search_layout(collection_name=collection_name)
+                rescore_params = self.get_rescore_params(layout=layout, limit=limit)
+                await self.set_search_params(session=session, limit=rescore_params.get("rescore_candidates", limit))
+                explain_sql = sql_text(
+                    f"EXPLAIN (FORMAT JSON) {self.get_search_sql(table_name=table_name, layout=layout)}"
+                )
+                result = await session.execute(explain_sql, {
+                    "vector": sample_vector,
+                    "limit": limit,
+                    **rescore_params
+                })
+                plan = result.scalar_one()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        if not self.is_index_scan_plan(plan=plan[0]["Plan"], index_name=index_name):
+            self.logger.warning(
+                f"Search plan for collection '{collection_name}' does not use index '{index_name}'"
+            )
+            return False
+
+        return True
+
+    async def check_search_plans(self) -> dict:
+        """Self-check all collections at startup, never raises."""
+        plans_status = {}
+        try:
+            for table_name in await self.list_all_collections():
+                collection_name = table_name[len(self.pgvector_table_prefix):]
+                plans_status[collection_name] = await self.check_search_plan(
+                    collection_name=collection_name
+                )
+        except Exception as e:
+            self.logger.warning(f"Search plan self-check failed: {str(e)}")
+
+        return plans_status
@@ -1,7 +1,9 @@
 from qdrant_client import QdrantClient, models
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionMetadataCache import CollectionMetadataCache
 from ..VectorDBEnums import DistanceMethodEnums
-from typing import List, Optional, Any
+from ..VectorSearchFilter import VectorSearchFilter
+from typing import List, Optional, Any, Callable
 import logging
 from models.db_schemas import RetrievedDocument
 
@@ -10,7 +12,8 @@ class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 786, 
                 distance_method: str = None,
-                index_threshold: int=100):
+                index_threshold: int=100,
+                collection_cache_ttl: float = 300):
         
         self.client: Optional[QdrantClient] = None
         self.db_client = db_client
@@ -18,6 +21,7 @@ class QdrantDBProvider(VectorDBInterface):
         self.index_threshold = index_threshold
         self.distance_method = None
         self.logger = logging.getLogger("uvicorn")
+        self.collection_cache = CollectionMetadataCache(ttl=collection_cache_ttl)
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
@@ -41,7 +45,12 @@ class QdrantDBProvider(VectorDBInterface):
     async def is_collection_exist(self, collection_name: str) -> bool:
         if self.client is None:
             raise RuntimeError("Client not connected.")
-        return self.client.collection_exists(collection_name=collection_name)
+
+        is_exist = self.collection_cache.get(collection_name, "exists")
+        if is_exist is None:
+            is_exist = self.client.collection_exists(collection_name=collection_name)
+            self.collection_cache.set(collection_name, exists=is_exist)
+        return is_exist
 
     async def list_all_collections(self) -> List:
         if self.client is None:
@@ -57,7 +66,9 @@ class QdrantDBProvider(VectorDBInterface):
         if self.client is None:
             raise RuntimeError("Client not connected.")
         if await self.is_collection_exist(collection_name=collection_name):
-            return self.client.delete_collection(collection_name=collection_name)
+            result = self.client.delete_collection(collection_name=collection_name)
+            await self.collection_cache.changed(collection_name=collection_name)
+            return result
         return None
 
     async def create_collection(
@@ -77,6 +88,8 @@ class QdrantDBProvider(VectorDBInterface):
                     size=embedding_size, distance=self.distance_method
                 ),
             )
+            await self.collection_cache.changed(collection_name=collection_name)
+            self.collection_cache.set(collection_name, exists=True, embedding_size=embedding_size)
             return True
         return False
 
@@ -101,7 +114,7 @@ class QdrantDBProvider(VectorDBInterface):
             record = models.Record(
                 id=record_id,
                 vector=vector,
-                payload={"text": text, "metadata": metadata},
+                payload={"text": text, "metadata": metadata, "chunk_id": record_id},
             )
             _ = self.client.upload_records(collection_name=collection_name, records=[record])
         except Exception as e:
@@ -145,7 +158,8 @@ class QdrantDBProvider(VectorDBInterface):
                 models.Record(
                     id=batch_record_ids[x],
                     vector=batch_vectors[x],
-                    payload={"text": batch_texts[x], "metadata": batch_metadata[x]},
+                    payload={"text": batch_texts[x], "metadata": batch_metadata[x],
+                             "chunk_id": batch_record_ids[x]},
                 )
                 for x in range(len(batch_texts))
             ]
@@ -159,7 +173,55 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
 
-    async def search_by_vector(self, collection_name: str, vector: Any, limit: int = 5):
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list) -> int:
+        if self.client is None:
+            raise RuntimeError("Client not connected.")
+
+        if not record_ids or not await self.is_collection_exist(collection_name=collection_name):
+            return 0
+
+        _ = self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids)),
+        )
+        await self.collection_cache.changed(collection_name=collection_name)
+        return len(record_ids)
+
+    async def begin_bulk_ingest(self, collection_name: str, drop_index: bool = True) -> bool:
+        # Local (embedded) Qdrant does exact search and has no index to defer
+        return True
+
+    async def end_bulk_ingest(self, collection_name: str, build_index: bool = True,
+                              progress_callback: Callable[[dict], Any] = None) -> bool:
+        await self.collection_cache.changed(collection_name=collection_name)
+        return True
+
+    def get_payload_filter(self, search_filter: Optional[VectorSearchFilter]) -> Optional[models.Filter]:
+        if search_filter is None or search_filter.is_empty():
+            return None
+
+        conditions = []
+        if search_filter.asset_ids is not None:
+            conditions.append(models.FieldCondition(key="metadata.asset_id",
+                                                    match=models.MatchAny(any=list(search_filter.asset_ids))))
+
+        for key, value in search_filter.metadata.items():
+            conditions.append(models.FieldCondition(key=f"metadata.{key}", match=models.MatchValue(value=value)))
+
+        for key, (range_min, range_max) in search_filter.metadata_ranges.items():
+            conditions.append(models.FieldCondition(key=f"metadata.{key}",
+                                                    range=models.Range(gte=range_min, lte=range_max)))
+
+        if search_filter.chunk_id_min is not None or search_filter.chunk_id_max is not None:
+            conditions.append(models.FieldCondition(key="chunk_id",
+                                                    range=models.Range(gte=search_filter.chunk_id_min,
+                                                                       lte=search_filter.chunk_id_max)))
+
+        return models.Filter(must=conditions)
+
+    async def search_by_vector(self, collection_name: str, vector: Any, limit: int = 5,
+                               ef_search: int = None, probes: int = None,
+                               search_filter: VectorSearchFilter = None):
         if self.client is None:
             raise RuntimeError("Client not connected.")
 
@@ -167,7 +229,12 @@ class QdrantDBProvider(VectorDBInterface):
             self.logger.error(f"Can not search non-existed collection {collection_name}")
             return []
 
-        results = self.client.search(collection_name=collection_name, query_vector=vector, limit=limit)
+        # probes only applies to pgvector IVFFlat indexes
+        search_params = models.SearchParams(hnsw_ef=ef_search) if ef_search else None
+
+        results = self.client.search(collection_name=collection_name, query_vector=vector, limit=limit,
+                                     search_params=search_params,
+                                     query_filter=self.get_payload_filter(search_filter))
 
         if not results or len(results) == 0 :
             return None
@@ -179,3 +246,44 @@ class QdrantDBProvider(VectorDBInterface):
             })
             for result in results
         ]
+
+    async def search_many(self, collection_name: str, vectors: List[Any], limit: int = 5,
+                          ef_search: int = None, probes: int = None,
+                          search_filter: VectorSearchFilter = None):
+        if self.client is None:
+            raise RuntimeError("Client not connected.")
+
+        if len(vectors) == 0 or not await self.is_collection_exist(collection_name=collection_name):
+            self.logger.error(f"Can not search non-existed collection {collection_name}")
+            return [[] for _ in vectors]
+
+        search_params = models.SearchParams(hnsw_ef=ef_search) if ef_search else None
+        query_filter = self.get_payload_filter(search_filter)
+
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(vector=list(vector), limit=limit, params=search_params,
+                                     filter=query_filter, with_payload=True)
+                for vector in vectors
+            ]
+        )
+
+        return [
+            [
+                RetrievedDocument(**{
+                    "score" : result.score,
+                    "text" : result.payload["text"]
+                })
+                for result in results
+            ]
+            for results in batch_results
+        ]
+
+    async def search_hybrid(self, collection_name: str, text: str, vector: Any, limit: int = 5,
+                            ef_search: int = None, probes: int = None,
+                            search_filter: VectorSearchFilter = None):
+        # No full-text index here, hybrid requests are served by the vector search
+        return await self.search_by_vector(collection_name=collection_name, vector=vector, limit=limit,
+                                           ef_search=ef_search, probes=probes,
+                                           search_filter=search_filter)
@@ -1,4 +1,4 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_setup_utils, run_async
 from helpers.config import get_settings
 import asyncio
 import logging
@@ -7,7 +7,7 @@ from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from models import ResponseSingnals
 from controllers import NLPController
-import inspect
+from typing import Any, Awaitable, Callable
 from tqdm.auto import tqdm
 
 
@@ -16,16 +16,118 @@ logger = logging.getLogger(__name__)
 @celery_app.task(name="tasks.data_indexing.index_data_content", bind=True,
                 autoretry_for=(Exception,),
                 retry_kwargs={'max_retries': 3, 'countdown': 60})
-def index_data_content(self, project_id: str, do_reset: int):
+def index_data_content(self, project_id: str, do_reset: int, resume_after_chunk_id: int = 0):
 
-    return asyncio.run(_index_data_content(self, 
-                                           project_id=project_id,
-                                           do_reset=do_reset)
-                    )
+    checkpoint = {"last_chunk_id": resume_after_chunk_id}
+    try:
+        return run_async(_index_data_content(self, 
+                                               project_id=project_id,
+                                               do_reset=do_reset,
+                                               checkpoint=checkpoint),
+                         task=self
+                        )
+    except Exception as e:
+        # Retry from the last indexed chunk instead of page 1, without resetting the collection
+        raise self.retry(exc=e, countdown=60, max_retries=3,
+                         kwargs={
+                             "project_id": project_id,
+                             "do_reset": 0 if checkpoint["last_chunk_id"] else do_reset,
+                             "resume_after_chunk_id": checkpoint["last_chunk_id"]
+                         })
+
+async def _run_indexing_pipeline(chunk_pages, embed_page: Callable[[list], Awaitable[list]],
+                                 write_page: Callable[[list, list], Awaitable[Any]],
+                                 checkpoint: dict, concurrency: int = 4, queue_size: int = 8) -> int:
+    """
+    Overlap chunk reads, embedding calls and vector DB writes.
+
+    A reader feeds pages into a bounded queue, `concurrency` embedders keep that
+    many embedding requests in flight, and a single writer inserts the results.
+    Embeddings finish out of order, the writer holds them back and writes pages
+    strictly in page order, so nothing past checkpoint["last_chunk_id"] is in the
+    vector DB and a resumed run does not insert a page twice. The pages read but
+    not yet written are bounded, which gives backpressure in both directions.
+    """
+    concurrency = max(1, concurrency)
+    embed_queue = asyncio.Queue(maxsize=queue_size)
+    write_queue = asyncio.Queue(maxsize=queue_size)
+    # The oldest page always holds a slot, so the writer can not wait on a page that is never read
+    pending_pages = asyncio.Semaphore(concurrency + 2 * queue_size)
+
+    embedded_pages = {}
+    next_page_no = 0
+    inserted_items_count = 0
+
+    async def read_pages():
+        page_no = 0
+        async for page_chunks in chunk_pages:
+            await pending_pages.acquire()
+            await embed_queue.put((page_no, page_chunks))
+            page_no += 1
+        for _ in range(concurrency):
+            await embed_queue.put(None)
+
+    async def embed_pages():
+        while True:
+            item = await embed_queue.get()
+            if item is None:
+                await write_queue.put(None)
+                return
+            page_no, page_chunks = item
+            vectors = await embed_page(page_chunks)
+            await write_queue.put((page_no, page_chunks, vectors))
+
+    async def write_pages():
+        nonlocal next_page_no, inserted_items_count
+        finished_embedders = 0
+        while finished_embedders < concurrency:
+            item = await write_queue.get()
+            if item is None:
+                finished_embedders += 1
+                continue
+
+            page_no, page_chunks, vectors = item
+            embedded_pages[page_no] = (page_chunks, vectors)
+            while next_page_no in embedded_pages:
+                page_chunks, vectors = embedded_pages.pop(next_page_no)
+                await write_page(page_chunks, vectors)
+                inserted_items_count += len(page_chunks)
+                checkpoint["last_chunk_id"] = page_chunks[-1].chunk_id
+                next_page_no += 1
+                pending_pages.release()
 
-async def _index_data_content(task_instance, project_id: str, do_reset: int):
+    tasks = [
+        asyncio.create_task(read_pages()),
+        asyncio.create_task(write_pages()),
+        *[asyncio.create_task(embed_pages()) for _ in range(concurrency)]
+    ]
 
-    db_client, vectordb_client = None, None
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return inserted_items_count
+
+async def _index_data_content(task_instance, project_id: str, do_reset: int,
+                              checkpoint: dict = None, until_chunk_id: int = None,
+                              manage_index: bool = True, bulk_ingest: bool = True,
+                              asset_ids: list = None):
+
+    # checkpoint["last_chunk_id"] is advanced after every inserted page.
+    # until_chunk_id bounds the indexed chunk range and asset_ids, if given,
+    # restricts it to those assets' chunks; with manage_index=False the
+    # vector index is neither dropped nor built, the caller owns it (fan-out workers).
+    # bulk_ingest=False keeps the existing index and updates it in place, cheaper
+    # than a rebuild for a small incremental delta
+    if checkpoint is None:
+        checkpoint = {"last_chunk_id": 0}
+    resume_after_chunk_id = checkpoint["last_chunk_id"] or 0
 
     try:
         (db_engine, db_client, llm_provider_factory,
@@ -53,10 +155,7 @@ async def _index_data_content(task_instance, project_id: str, do_reset: int):
             template_parser=template_parser
         )
 
-        has_records = True
-        page_no = 1
-        inserted_items_count = 0
-        idx = 0
+        settings = get_settings()
 
         # Create collection if not exist
         collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
@@ -67,55 +166,92 @@ async def _index_data_content(task_instance, project_id: str, do_reset: int):
         )
 
         # Setup batching and progress bar
-        total_chunk_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
+        total_chunk_count = await chunk_model.get_total_chunks_count(
+            project_id=project.project_id,
+            after_chunk_id=resume_after_chunk_id,
+            until_chunk_id=until_chunk_id,
+            asset_ids=asset_ids
+        )
         pbar = tqdm(total=total_chunk_count, desc="Vector Indexing", position=0)
 
-        try:
-            while has_records:
-                    page_chunks = await chunk_model.get_project_chunks(
-                        project_id=project.project_id, 
-                        page_no=page_no
-                    )
-
-                    if not page_chunks:
-                        has_records = False
-                        break
-                    
-                    page_no += 1
-                    # chunk_ids = list(range(idx, idx + len(page_chunks)))  # for Qdrant
-                    chunk_ids = [chunk.chunk_id for chunk in page_chunks]  # for PgVector
-
-                    # idx += len(page_chunks) # for qdrant
-
-                    result = await nlp_controller.index_into_vector_db(
-                        project=project,
-                        chunks=page_chunks,
-                        do_reset=do_reset,
-                        chunk_ids=chunk_ids
-                    )
-
-                    if inspect.isawaitable(result):
-                        is_inserted = await result
-                    else:
-                        is_inserted = result
-
-                    if not is_inserted:
-                        task_instance.update_state(
-                            state='FAILURE',
-                            meta={
-                                "signal": ResponseSingnals.INSERT_INTO_VECTORDB_ERROR.value
-                            }
-                        )
+        if resume_after_chunk_id:
+            logger.info(f"Resuming indexing of project {project_id} after chunk_id: {resume_after_chunk_id}")
 
-                        raise Exception(f"Error inserting into vector DB | project_id: {project_id}")
+        # Skip per-page index maintenance, the index is built once at the end
+        if bulk_ingest:
+            _ = await vectordb_client.begin_bulk_ingest(collection_name=collection_name,
+                                                        drop_index=manage_index)
 
-                    pbar.update(len(page_chunks))
-                    inserted_items_count += len(page_chunks)
+        async def write_page(page_chunks: list, vectors: list):
+            chunk_ids = [chunk.chunk_id for chunk in page_chunks]  # for PgVector
+
+            is_inserted = await nlp_controller.insert_into_vector_db(
+                project=project,
+                chunks=page_chunks,
+                vectors=vectors,
+                chunk_ids=chunk_ids
+            )
+
+            if not is_inserted:
+                task_instance.update_state(
+                    state='FAILURE',
+                    meta={
+                        "signal": ResponseSingnals.INSERT_INTO_VECTORDB_ERROR.value
+                    }
+                )
+
+                raise Exception(f"Error inserting into vector DB | project_id: {project_id}")
+
+            pbar.update(len(page_chunks))
+
+        try:
+            inserted_items_count = await _run_indexing_pipeline(
+                chunk_pages=chunk_model.iter_project_chunks(
+                    project_id=project.project_id,
+                    page_size=settings.INDEXING_PAGE_SIZE,
+                    after_chunk_id=resume_after_chunk_id,
+                    until_chunk_id=until_chunk_id,
+                    asset_ids=asset_ids
+                ),
+                embed_page=nlp_controller.embed_chunks,
+                write_page=write_page,
+                checkpoint=checkpoint,
+                concurrency=settings.INDEXING_EMBEDDING_CONCURRENCY,
+                queue_size=settings.INDEXING_QUEUE_SIZE
+            )
+        except Exception:
+            # begin_bulk_ingest dropped the index, rebuild it over what was inserted so far
+            # rather than leave searches on a sequential scan (a retry drops it again)
+            try:
+                _ = await vectordb_client.end_bulk_ingest(collection_name=collection_name,
+                                                          build_index=bulk_ingest and manage_index)
+            except Exception as e:
+                logger.error(f"Can not rebuild the vector index of {collection_name}: {str(e)}")
+            raise
         finally:
             pbar.close()
 
-        index_created = await vectordb_client.create_vector_index(
-            collection_name=collection_name
+        if not manage_index or not bulk_ingest:
+            _ = await vectordb_client.end_bulk_ingest(collection_name=collection_name,
+                                                      build_index=False)
+            return {
+                "signal": ResponseSingnals.INSERT_INTO_VECTORDB_SUCCESS.value,
+                "inserted_items_count": inserted_items_count
+            }
+
+        def report_index_progress(progress: dict):
+            task_instance.update_state(
+                state='PROGRESS',
+                meta={
+                    "signal": ResponseSingnals.VECTORDB_INDEX_BUILD_PROGRESS.value,
+                    "inserted_items_count": inserted_items_count,
+                    "index_build": progress
+                }
+            )
+
+        index_created = await vectordb_client.end_bulk_ingest(
+            collection_name=collection_name,
+            progress_callback=report_index_progress
         )
 
         # Log index creation result
@@ -141,13 +277,3 @@ async def _index_data_content(task_instance, project_id: str, do_reset: int):
     except Exception as e:
         logger.error(f"Error in processing project files: {str(e)}")
         raise
-    
-    finally:
-        try:
-            if db_engine:
-                await db_engine.dispose()
-
-            if vectordb_client:
-                await vectordb_client.disconnect()
-        except Exception as e:
-            logger.error(f"Error in closing resources: {str(e)}")
\ No newline at end of file
@@ -1,7 +1,10 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_setup_utils, run_async
 from helpers.config import get_settings
 import asyncio
-from controllers import NLPController, ProcessController
+import os
+from controllers import NLPController
+from controllers.ProcessController import (ProcessController, get_file_processing_executor,
+                                          load_and_split_file, iter_file_chunk_batches)
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from models.db_schemas import DataChunk
@@ -19,7 +22,7 @@ logger = logging.getLogger(__name__)
 def process_project_files(self, project_id: int,
                 file_id: int, overlap_size: int, chunk_size: int, do_reset: int):
 
-    return asyncio.run(
+    return run_async(
         _process_project_files(
             self,
             project_id=project_id,
@@ -27,7 +30,8 @@ def process_project_files(self, project_id: int,
             overlap_size=overlap_size,
             chunk_size=chunk_size,
             do_reset=do_reset
-        )
+        ),
+        task=self
     )
 
 
@@ -35,8 +39,6 @@ async def _process_project_files(task_instance, project_id: int,
                                  file_id: int, overlap_size: int,
                                  chunk_size: int, do_reset: int):
     
-    db_client, vectordb_client = None, None
-
     try: 
         (db_engine, db_client, llm_provider_factory,
             vectordb_provider_factory, generation_client, embedding_client,
@@ -112,7 +114,7 @@ async def _process_project_files(task_instance, project_id: int,
         asset_model = await AssetModel.create_instance(
             db_client=db_client)
         
-        project_files_ids = {}
+        project_assets = []
         if file_id:
             asset_record = await asset_model.get_asset_record(
                 asset_project_id=project.project_id,
@@ -138,22 +140,15 @@ async def _process_project_files(task_instance, project_id: int,
 
                 raise Exception(f"No assests for file_id: {file_id}")
 
-            project_files_ids = {
-                asset_record.asset_id : asset_record.asset_name
-            }
+            project_assets = [asset_record]
         else:
 
-            project_files = await asset_model.get_all_project_assets(
+            project_assets = await asset_model.get_all_project_assets(
                 asset_project_id=project.project_id,
                 asset_type=AssetTypeEnum.File.value
                 )
-
-            project_files_ids = {
-                record.asset_id : record.asset_name
-                for record in project_files
-            }
         
-        if len(project_files_ids) == 0:
+        if len(project_assets) == 0:
             task_instance.update_state(
                 state='FAILURE',
                 meta={
@@ -171,60 +166,41 @@ async def _process_project_files(task_instance, project_id: int,
 
             raise Exception(f"No files found for project_id: {project.project_id}")
 
-        process_controller = ProcessController(project_id=project_id)
-
-        no_of_records = 0
-        no_of_files = 0
-
         chunk_model = await ChunkModel.create_instance(
                 db_client=db_client
             )
 
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+
         if do_reset == 1:
             # delete associated vectors collection
-            collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
             _ = await vectordb_client.delete_collection(collection_name=collection_name)
             
             # delete associated chunks
             _ = await chunk_model.delete_chunks_by_project_id(
                     project_id=project.project_id ,
             )
-            
-        for asset_id, file_id in project_files_ids.items():
-
-            file_content = process_controller.get_file_content(file_id=file_id)
-
-            if file_content is None:
-                logger.error(f"Error while processing file: {file_id}")
-                continue
-
-            file_chunks = process_controller.process_file_content(
-                file_content=file_content,
-                file_id=file_id,
-                chunk_size=chunk_size,
-                chunk_overlap=overlap_size)
-            
-            if file_chunks is None or len(file_chunks) == 0:
-                logger.error(f"No chunks created for file: {file_id}")
-                pass
-            
-            file_chunks_records = [
-                DataChunk(
-                    chunk_text=chunk.page_content,
-                    chunk_metadata=chunk.metadata,
-                    chunk_order=i+1,
-                    chunk_project_id=project.project_id,
-                    chunk_asset_id=asset_id
-                )
-                for i, chunk in enumerate(file_chunks)
-            ]
 
+        # No chunks before this run means the vector index is built from scratch
+        index_after_chunk_id = await chunk_model.get_max_chunk_id(project_id=project.project_id)
             
+        processing_stats = await _process_assets(
+            project_id=project.project_id,
+            project_assets=project_assets,
+            chunk_model=chunk_model,
+            asset_model=asset_model,
+            vectordb_client=vectordb_client,
+            collection_name=collection_name,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            force=do_reset == 1
+        )
+        no_of_records = processing_stats["inserted_chunks"]
+        no_of_files = processing_stats["processed_files"]
+        failed_files = processing_stats["failed_files"]
 
-            no_of_records += await chunk_model.insert_many_chunks(
-                chunks=file_chunks_records
-            )
-            no_of_files += 1
+        if failed_files:
+            logger.warning(f"{len(failed_files)} of {len(project_assets)} files failed for project: {project_id}")
         
         task_instance.update_state(
             state='SUCCESS',
@@ -246,19 +222,230 @@ async def _process_project_files(task_instance, project_id: int,
                 "signal": ResponseSingnals.PROCESSING_SUCCESS.value,
                 "inserted_chunks" : no_of_records,
                 "processed_files" : no_of_files ,
+                "failed_files": failed_files,
+                "skipped_files": processing_stats["skipped_files"],
+                "removed_files": processing_stats["removed_files"],
+                "index_assets": processing_stats["index_assets"],
+                "index_after_chunk_id": index_after_chunk_id,
                 "project_id": project_id,
                 "do_reset": do_reset
             }
     except Exception as e:
         logger.error(f"Error in processing project files: {str(e)}")
         raise
-    
-    finally:
-        try:
-            if db_engine:
-                await db_engine.dispose()
 
-            if vectordb_client:
-                await vectordb_client.disconnect()
+
+def _get_asset_fingerprint(content_hash: str, chunk_size: int, overlap_size: int) -> dict:
+    return {
+        "content_hash": content_hash,
+        "chunk_size": chunk_size,
+        "overlap_size": overlap_size
+    }
+
+
+async def _process_assets(project_id: int, project_assets: list, chunk_model: ChunkModel,
+                          asset_model: AssetModel, vectordb_client, collection_name: str,
+                          chunk_size: int, overlap_size: int, force: bool = False):
+    """
+    Re-chunk only the assets whose content hash or chunking parameters changed
+    since they were last processed (every asset when force). The previous chunks
+    and vectors of a changed asset are dropped first, assets whose file is gone
+    are removed with theirs. Files are loaded+split in parallel and each file's
+    chunks are inserted as soon as it is done.
+
+    Returns processing stats with "index_assets", the [asset_id, fingerprint]
+    pairs whose chunks need indexing: the assets processed here plus unchanged
+    ones whose chunks were never indexed (their stale vectors are dropped).
+    Pass them to _mark_assets_indexed once indexed.
+    """
+    settings = get_settings()
+    process_controller = ProcessController(project_id=project_id)
+
+    changed_assets = {}
+    removed_asset_ids = []
+    skipped_files = []
+    unindexed_assets = []
+    for asset in project_assets:
+        asset_config = asset.asset_config or {}
+
+        if not os.path.exists(process_controller.get_file_path(file_id=asset.asset_name)):
+            removed_asset_ids.append(asset.asset_id)
+            continue
+
+        content_hash = asset_config.get("content_hash")
+        if content_hash is None:
+            # Uploaded before fingerprints were recorded
+            content_hash = await asyncio.to_thread(process_controller.get_file_hash,
+                                                   asset.asset_name)
+
+        fingerprint = _get_asset_fingerprint(content_hash, chunk_size, overlap_size)
+        if not force and asset_config.get("processed_fingerprint") == fingerprint:
+            skipped_files.append(asset.asset_name)
+            if asset_config.get("indexed_fingerprint") != fingerprint:
+                unindexed_assets.append([asset.asset_id, fingerprint])
+            continue
+
+        changed_assets[asset.asset_id] = (asset, fingerprint)
+
+    # Vectors reference their chunks, drop them first
+    stale_asset_ids = list(changed_assets) + removed_asset_ids
+    stale_chunk_ids = await chunk_model.get_asset_chunk_ids(project_id=project_id,
+                                                            asset_ids=stale_asset_ids)
+    if stale_chunk_ids:
+        _ = await vectordb_client.delete_by_record_ids(collection_name=collection_name,
+                                                       record_ids=stale_chunk_ids)
+        _ = await chunk_model.delete_chunks_by_asset_ids(project_id=project_id,
+                                                         asset_ids=stale_asset_ids)
+    if removed_asset_ids:
+        logger.warning(f"Removing {len(removed_asset_ids)} assets with missing files for project: {project_id}")
+        _ = await asset_model.delete_assets(asset_ids=removed_asset_ids)
+
+    # Chunks of an unchanged asset may be partly indexed by a failed run, re-index them whole
+    unindexed_chunk_ids = await chunk_model.get_asset_chunk_ids(
+        project_id=project_id,
+        asset_ids=[asset_id for asset_id, _ in unindexed_assets]
+    )
+    if unindexed_chunk_ids:
+        _ = await vectordb_client.delete_by_record_ids(collection_name=collection_name,
+                                                       record_ids=unindexed_chunk_ids)
+
+    logger.info(f"Project {project_id}: {len(changed_assets)} assets to process, "
+                f"{len(skipped_files)} unchanged ({len(unindexed_assets)} not indexed yet), "
+                f"{len(removed_asset_ids)} removed, {len(stale_chunk_ids)} stale chunks dropped")
+
+    executor = await asyncio.to_thread(get_file_processing_executor,
+                                       settings.FILE_PROCESSING_POOL_SIZE)
+    loop = asyncio.get_running_loop()
+
+    async def load_and_split(asset_id: int, file_id: str):
+        try:
+            file_chunks = await loop.run_in_executor(executor, load_and_split_file,
+                                                     project_id, file_id, chunk_size, overlap_size)
+            if file_chunks is None:
+                return asset_id, file_id, None, 0, Exception("file not found or not supported")
+            return asset_id, file_id, file_chunks, 0, None
         except Exception as e:
-            logger.error(f"Error in closing resources: {str(e)}")
\ No newline at end of file
+            return asset_id, file_id, None, 0, e
+
+    # Large files are streamed page by page one at a time instead of being
+    # materialized whole in a pool worker, each chunk batch goes straight to the DB
+    streaming_threshold = settings.FILE_STREAMING_THRESHOLD_MB * 1024 * 1024
+    streaming_slot = asyncio.Semaphore(1)
+
+    async def stream_and_insert(asset_id: int, file_id: str):
+        async with streaming_slot:
+            inserted_count = 0
+            try:
+                chunk_batches = iter_file_chunk_batches(project_id, file_id, chunk_size, overlap_size,
+                                                        settings.FILE_STREAMING_BATCH_SIZE)
+                while True:
+                    file_chunks = await asyncio.to_thread(next, chunk_batches, None)
+                    if file_chunks is None:
+                        break
+
+                    inserted_count += await chunk_model.insert_many_chunks(chunks=[
+                        {
+                            "chunk_text": chunk.page_content,
+                            "chunk_metadata": chunk.metadata,
+                            "chunk_order": inserted_count + i + 1,
+                            "chunk_project_id": project_id,
+                            "chunk_asset_id": asset_id
+                        }
+                        for i, chunk in enumerate(file_chunks)
+                    ])
+                return asset_id, file_id, None, inserted_count, None
+            except Exception as e:
+                # The asset's previous chunks are already gone, drop the batches inserted
+                # so far so a failed file leaves nothing behind to be indexed
+                if inserted_count:
+                    try:
+                        _ = await chunk_model.delete_chunks_by_asset_ids(project_id=project_id,
+                                                                         asset_ids=[asset_id])
+                    except Exception as delete_error:
+                        logger.error(f"Can not delete partial chunks of file: {file_id} | {str(delete_error)}")
+                return asset_id, file_id, None, 0, e
+
+    async def process_asset(asset_id: int, file_id: str):
+        try:
+            file_size = os.path.getsize(process_controller.get_file_path(file_id=file_id))
+        except OSError as e:
+            return asset_id, file_id, None, 0, e
+
+        if streaming_threshold and file_size >= streaming_threshold:
+            return await stream_and_insert(asset_id=asset_id, file_id=file_id)
+        return await load_and_split(asset_id=asset_id, file_id=file_id)
+
+    no_of_records = 0
+    no_of_files = 0
+    failed_files = []
+    index_assets = list(unindexed_assets)
+    for completed in asyncio.as_completed([
+        process_asset(asset_id=asset_id, file_id=asset.asset_name)
+        for asset_id, (asset, _) in changed_assets.items()
+    ]):
+        asset_id, file_id, file_chunks, inserted_count, error = await completed
+
+        if error is not None:
+            logger.error(f"Error while processing file: {file_id} | {str(error)}")
+            failed_files.append(file_id)
+            continue
+
+        if file_chunks is not None:
+            if len(file_chunks) == 0:
+                logger.error(f"No chunks created for file: {file_id}")
+
+            inserted_count = await chunk_model.insert_many_chunks(chunks=[
+                DataChunk(
+                    chunk_text=chunk.page_content,
+                    chunk_metadata=chunk.metadata,
+                    chunk_order=i+1,
+                    chunk_project_id=project_id,
+                    chunk_asset_id=asset_id
+                )
+                for i, chunk in enumerate(file_chunks)
+            ])
+        elif inserted_count == 0:
+            logger.error(f"No chunks created for file: {file_id}")
+
+        no_of_records += inserted_count
+        no_of_files += 1
+
+        # Only recorded once the chunks are in, a failed run re-processes the asset
+        asset, fingerprint = changed_assets[asset_id]
+        await asset_model.update_asset(
+            asset_id=asset_id,
+            asset_config={
+                **(asset.asset_config or {}),
+                "content_hash": fingerprint["content_hash"],
+                "processed_fingerprint": fingerprint
+            }
+        )
+        index_assets.append([asset_id, fingerprint])
+
+    return {
+        "inserted_chunks": no_of_records,
+        "processed_files": no_of_files,
+        "failed_files": failed_files,
+        "skipped_files": len(skipped_files),
+        "removed_files": len(removed_asset_ids),
+        "index_assets": index_assets
+    }
+
+
+async def _mark_assets_indexed(asset_model: AssetModel, project_id: int, index_assets: list):
+    """Record the fingerprint each asset's chunks were indexed with, see _process_assets."""
+    fingerprints = {asset_id: fingerprint for asset_id, fingerprint in index_assets}
+    if not fingerprints:
+        return
+
+    project_assets = await asset_model.get_assets_by_ids(asset_project_id=project_id,
+                                                        asset_ids=list(fingerprints))
+    for asset in project_assets:
+        asset_config = asset.asset_config or {}
+        if asset_config.get("processed_fingerprint") != fingerprints[asset.asset_id]:
+            # Re-processed since, its new chunks are not indexed yet
+            continue
+        await asset_model.update_asset(
+            asset_id=asset.asset_id,
+            asset_config={**asset_config, "indexed_fingerprint": fingerprints[asset.asset_id]}
+        )
@@ -1,4 +1,4 @@
-from celery_app import celery_app
+from celery_app import celery_app, run_async
 from helpers.config import get_settings, Settings
 import logging 
 import asyncio
@@ -11,7 +11,7 @@ logger = logging.getLogger("celery.task")
 def send_email_reports(self,mail_wait_seconds: int):
 
     # return await _send_email_reports(self, mail_wait_seconds=mail_wait_seconds)
-    return asyncio.run(_send_email_reports(self, mail_wait_seconds=mail_wait_seconds))
+    return run_async(_send_email_reports(self, mail_wait_seconds=mail_wait_seconds), task=self)
 
 async def _send_email_reports(task_instance, mail_wait_seconds: int):
     
@@ -1,8 +1,9 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_setup_utils, run_async
 from helpers.config import get_settings
-import asyncio
 import logging
 from utils.idempotency_manager import IdempotencyManager
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorTableSchemeEnums
+from stores.llm.EmbeddingCache import CachedEmbeddingClient
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +13,11 @@ logger = logging.getLogger(__name__)
 
 def clean_celery_executation_table(self):
     
-    return asyncio.run(_clean_celery_executation_table_async(self))
+    return run_async(_clean_celery_executation_table_async(self), task=self)
 
 
 async def _clean_celery_executation_table_async(task_instance):
 
-    db_client, vectordb_client = None, None
-
     try: 
         (db_engine, db_client, llm_provider_factory,
             vectordb_provider_factory, generation_client, embedding_client,
@@ -35,13 +34,88 @@ async def _clean_celery_executation_table_async(task_instance):
     except Exception as e:
         logger.error(f"Task failed: {str(e)}")
         raise
-    
-    finally:
-        try:
-            if db_engine:
-                await db_engine.dispose()
-
-            if vectordb_client:
-                await vectordb_client.disconnect()
-        except Exception as e:
-            logger.error(f"Error in closing resources: {str(e)}")
\ No newline at end of file
+
+
+@celery_app.task(name="tasks.maintenance.migrate_vector_storage", bind=True)
+def migrate_vector_storage(self, collection_names: list = None):
+
+    return run_async(_migrate_vector_storage_async(self, collection_names), task=self)
+
+
+async def _migrate_vector_storage_async(task_instance, collection_names: list = None):
+    """
+    Convert pgvector collections (all of them by default) to the storage and
+    quantization configured in VECTOR_DB_PGVEC_STORAGE / QUANTIZATION /
+    COLLECTION_STORAGE. Returns {collection_name: migrated}.
+    """
+    settings = get_settings()
+    if settings.VECTOR_DB_BACKEND != VectorDBEnums.PGVECTOR.value:
+        logger.info(f"Vector storage migration only applies to pgvector, backend is {settings.VECTOR_DB_BACKEND}")
+        return {}
+
+    try:
+        (db_engine, db_client, llm_provider_factory,
+            vectordb_provider_factory, generation_client, embedding_client,
+            vectordb_client, template_parser) = await get_setup_utils()
+
+        if collection_names is None:
+            prefix = PgVectorTableSchemeEnums._PREFIX.value
+            collection_names = [table_name[len(prefix):] for table_name in await vectordb_client.list_all_collections()]
+
+        migrated = {}
+        for collection_name in collection_names:
+
+            def report_index_progress(progress: dict):
+                task_instance.update_state(
+                    state='PROGRESS',
+                    meta={"collection_name": collection_name, "index_build": progress}
+                )
+
+            migrated[collection_name] = await vectordb_client.migrate_collection_storage(
+                collection_name=collection_name,
+                progress_callback=report_index_progress
+            )
+            logger.info(f"Vector storage migration for {collection_name}: "
+                        f"{'migrated' if migrated[collection_name] else 'already up to date'}")
+
+        return migrated
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
+
+
+@celery_app.task(name="tasks.maintenance.clean_embedding_cache", bind=True,
+                autoretry_for=(Exception,),
+                retry_kwargs={'max_retries': 3, 'countdown': 60})
+def clean_embedding_cache(self):
+
+    return run_async(_clean_embedding_cache_async(self), task=self)
+
+
+async def _clean_embedding_cache_async(task_instance):
+    """
+    Drop embedding cache entries of other embedding models and, when
+    EMBEDDING_CACHE_TTL_DAYS > 0, entries older than the TTL.
+    """
+    settings = get_settings()
+
+    try:
+        (db_engine, db_client, llm_provider_factory,
+            vectordb_provider_factory, generation_client, embedding_client,
+            vectordb_client, template_parser) = await get_setup_utils()
+
+        if not isinstance(embedding_client, CachedEmbeddingClient) or embedding_client.store is None:
+            return 0
+
+        deleted = await embedding_client.store.delete_expired(
+            model_id=embedding_client.embedding_model_id,
+            max_age_days=settings.EMBEDDING_CACHE_TTL_DAYS
+        )
+        logger.info(f"Removed {deleted} expired embedding cache entries")
+
+        return deleted
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
@@ -1,10 +1,16 @@
-from celery import chain # pyright: ignore[reportMissingImports]
-from celery_app import celery_app, get_setup_utils
+from celery import chain, chord, group # pyright: ignore[reportMissingImports]
+from celery_app import celery_app, get_setup_utils, run_async
 from helpers.config import get_settings
-import asyncio
 import logging
+from controllers import NLPController
+from models.ProjectModel import ProjectModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models import ResponseSingnals
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from utils.idempotency_manager import IdempotencyManager
 from tasks.data_indexing import index_data_content
-from tasks.file_processing import process_project_files
+from tasks.file_processing import process_project_files, _process_assets, _mark_assets_indexed
 from tasks.data_indexing import _index_data_content
 
 logger = logging.getLogger(__name__)
@@ -13,14 +19,31 @@ logger = logging.getLogger(__name__)
                 autoretry_for=(Exception,),
                 retry_kwargs={'max_retries': 3, 'countdown': 60})
 
-def push_after_process_task(self, prev_task_result):
+def push_after_process_task(self, prev_task_result, resume_after_chunk_id: int = 0):
     
     project_id = prev_task_result.get('project_id')
     do_reset = prev_task_result.get('do_reset')
 
-    task_results = asyncio.run(
-        _index_data_content(self, project_id, do_reset)
-    )
+    # Only the chunks of the assets processed by this run, or never indexed before
+    index_assets = prev_task_result.get('index_assets') or []
+    asset_ids = [asset_id for asset_id, _ in index_assets]
+
+    # A project with chunks already has an index, update it in place instead of rebuilding it
+    is_incremental = not do_reset and (prev_task_result.get('index_after_chunk_id') or 0) > 0
+
+    checkpoint = {"last_chunk_id": resume_after_chunk_id}
+    try:
+        task_results = run_async(
+            _index_data_content(self, project_id, do_reset if not resume_after_chunk_id else 0,
+                                checkpoint=checkpoint, bulk_ingest=not is_incremental,
+                                asset_ids=asset_ids),
+            task=self
+        )
+        run_async(_mark_project_assets_indexed(project_id, index_assets), task=self)
+    except Exception as e:
+        raise self.retry(exc=e, countdown=60, max_retries=3,
+                         args=(prev_task_result,),
+                         kwargs={"resume_after_chunk_id": checkpoint["last_chunk_id"]})
     
     return {
         "project_id" : project_id,
@@ -29,6 +52,14 @@ def push_after_process_task(self, prev_task_result):
     }
 
 
+async def _mark_project_assets_indexed(project_id: int, index_assets: list):
+    (db_engine, db_client, *_) = await get_setup_utils()
+
+    asset_model = await AssetModel.create_instance(db_client=db_client)
+    await _mark_assets_indexed(asset_model=asset_model, project_id=project_id,
+                               index_assets=index_assets)
+
+
 @celery_app.task(name="tasks.process_workflow.process_and_push_workflow", bind=True,
                 autoretry_for=(Exception,),
                 retry_kwargs={'max_retries': 3, 'countdown': 60})
@@ -57,3 +88,405 @@ def process_and_push_workflow(self, project_id: int,
         "tasks" : ["tasks.file_processing.process_project_files", 
                    "tasks.data_indexing.index_data_content"]
     }
+
+
+# ============================== Fan-out workflow =====================================
+# process_and_push_fanout_workflow
+#   -> chord(process_asset_batch per N assets)  on file_processing_queue
+#   -> dispatch_indexing
+#   -> chord(index_chunk_range per M chunks)     on data_indexing_queue
+#   -> finalize_workflow (single vector index build)
+# Progress of every subtask is merged into one CeleryTaskExecution record.
+
+FANOUT_WORKFLOW_TASK_NAME = "tasks.process_workflow.process_and_push_fanout_workflow"
+
+
+@celery_app.task(name="tasks.process_workflow.process_and_push_fanout_workflow", bind=True)
+def process_and_push_fanout_workflow(self, project_id: int,
+                                     overlap_size: int,
+                                     chunk_size: int,
+                                     do_reset: int):
+
+    return run_async(
+        _start_fanout_workflow(
+            self,
+            project_id=project_id,
+            overlap_size=overlap_size,
+            chunk_size=chunk_size,
+            do_reset=do_reset
+        ),
+        task=self
+    )
+
+
+async def _start_fanout_workflow(task_instance, project_id: int, overlap_size: int,
+                                 chunk_size: int, do_reset: int):
+
+    (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory, generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+    settings = get_settings()
+    idempotency_manager = IdempotencyManager(db_client=db_client, db_engine=db_engine)
+
+    workflow_record = await idempotency_manager.create_task_record(
+        task_name=FANOUT_WORKFLOW_TASK_NAME,
+        task_args={
+            "project_id": project_id,
+            "overlap_size": overlap_size,
+            "chunk_size": chunk_size,
+            "do_reset": do_reset
+        },
+        celery_task_id=task_instance.request.id
+    )
+    workflow_id = workflow_record.execution_id
+
+    try:
+        project_model = await ProjectModel.create_instance(db_client=db_client)
+        asset_model = await AssetModel.create_instance(db_client=db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=db_client)
+
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        project_files = await asset_model.get_all_project_assets(
+            asset_project_id=project.project_id,
+            asset_type=AssetTypeEnum.File.value
+        )
+        asset_ids = [record.asset_id for record in project_files]
+
+        if len(asset_ids) == 0:
+            await idempotency_manager.update_task_status(
+                execution_id=workflow_id,
+                status="FAILURE",
+                result={
+                    "signal": ResponseSingnals.NO_FILES_ERROR.value,
+                }
+            )
+            raise Exception(f"No files found for project_id: {project.project_id}")
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            embedding_client=embedding_client,
+            template_parser=template_parser
+        )
+        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+
+        if do_reset == 1:
+            _ = await vectordb_client.delete_collection(collection_name=collection_name)
+            _ = await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
+
+        # No chunks before this workflow means the vector index is built from scratch
+        index_after_chunk_id = await chunk_model.get_max_chunk_id(project_id=project.project_id)
+
+        _ = await vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=embedding_client.embedding_size,
+            do_reset=do_reset,
+        )
+
+        # Drop the vector index once here, the range workers leave it alone.
+        # An incremental run keeps it and lets the inserts update it in place
+        if do_reset == 1 or not index_after_chunk_id:
+            _ = await vectordb_client.begin_bulk_ingest(collection_name=collection_name)
+            _ = await vectordb_client.end_bulk_ingest(collection_name=collection_name,
+                                                      build_index=False)
+
+        batch_size = max(1, settings.WORKFLOW_FANOUT_ASSETS_PER_TASK)
+        asset_batches = [asset_ids[i:i + batch_size] for i in range(0, len(asset_ids), batch_size)]
+
+        await idempotency_manager.update_task_status(execution_id=workflow_id, status="STARTED")
+        await idempotency_manager.update_task_progress(
+            execution_id=workflow_id,
+            values={
+                "phase": "processing",
+                "project_id": project.project_id,
+                "total_files": len(asset_ids),
+                "total_batches": len(asset_batches),
+                "processed_batches": 0,
+                "processed_files": 0,
+                "processed_chunks": 0,
+                "skipped_files": 0,
+                "removed_files": 0,
+                "failed_files": [],
+                "total_index_ranges": 0,
+                "indexed_ranges": 0,
+                "indexed_chunks": 0,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error while starting fan-out workflow for project {project_id}: {str(e)}")
+        await idempotency_manager.update_task_status(execution_id=workflow_id, status="FAILURE")
+        await idempotency_manager.update_task_progress(
+            execution_id=workflow_id,
+            values={"phase": "failed", "error": str(e)}
+        )
+        raise
+
+    result = chord(
+        group(
+            process_asset_batch.s(workflow_id, project.project_id, batch, chunk_size, overlap_size,
+                                  do_reset)
+            for batch in asset_batches
+        ),
+        dispatch_indexing.s(workflow_id, project.project_id)
+    ).on_error(mark_workflow_failed.s(workflow_id, project.project_id)).apply_async()
+
+    return {
+        "signal": ResponseSingnals.PROCESS_AND_PUSH_WORKFLOW_STARTED.value,
+        "workflow_id": workflow_id,
+        "chord_id": result.id,
+        "total_batches": len(asset_batches)
+    }
+
+
+@celery_app.task(name="tasks.process_workflow.process_asset_batch", bind=True)
+def process_asset_batch(self, workflow_id: int, project_id: int, asset_ids: list,
+                        chunk_size: int, overlap_size: int, do_reset: int = 0):
+    # No autoretry, failed files are reported in the workflow status and picked
+    # up again by the next run since their fingerprint is not recorded
+    return run_async(
+        _process_asset_batch(workflow_id, project_id, asset_ids, chunk_size, overlap_size,
+                             do_reset),
+        task=self
+    )
+
+
+async def _process_asset_batch(workflow_id: int, project_id: int, asset_ids: list,
+                               chunk_size: int, overlap_size: int, do_reset: int):
+
+    (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory, generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+    idempotency_manager = IdempotencyManager(db_client=db_client, db_engine=db_engine)
+    asset_model = await AssetModel.create_instance(db_client=db_client)
+    chunk_model = await ChunkModel.create_instance(db_client=db_client)
+
+    nlp_controller = NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=generation_client,
+        embedding_client=embedding_client,
+        template_parser=template_parser
+    )
+
+    project_assets = await asset_model.get_assets_by_ids(
+        asset_project_id=project_id,
+        asset_ids=asset_ids
+    )
+
+    processing_stats = await _process_assets(
+        project_id=project_id,
+        project_assets=project_assets,
+        chunk_model=chunk_model,
+        asset_model=asset_model,
+        vectordb_client=vectordb_client,
+        collection_name=nlp_controller.create_collection_name(project_id=project_id),
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        force=do_reset == 1
+    )
+
+    await idempotency_manager.update_task_progress(
+        execution_id=workflow_id,
+        increments={
+            "processed_batches": 1,
+            "processed_files": processing_stats["processed_files"],
+            "processed_chunks": processing_stats["inserted_chunks"],
+            "skipped_files": processing_stats["skipped_files"],
+            "removed_files": processing_stats["removed_files"]
+        },
+        append={"failed_files": processing_stats["failed_files"]}
+    )
+
+    return processing_stats
+
+
+@celery_app.task(name="tasks.process_workflow.dispatch_indexing", bind=True)
+def dispatch_indexing(self, batch_results: list, workflow_id: int, project_id: int):
+    # Only the chunks of the assets processed by this workflow, or never indexed before
+    index_assets = [pair for batch_result in batch_results for pair in batch_result.get("index_assets", [])]
+    return run_async(
+        _dispatch_indexing(workflow_id, project_id, index_assets),
+        task=self
+    )
+
+
+async def _dispatch_indexing(workflow_id: int, project_id: int, index_assets: list):
+
+    (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory, generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+    settings = get_settings()
+    idempotency_manager = IdempotencyManager(db_client=db_client, db_engine=db_engine)
+    chunk_model = await ChunkModel.create_instance(db_client=db_client)
+
+    asset_ids = [asset_id for asset_id, _ in index_assets]
+    chunk_ranges = await chunk_model.get_chunk_id_ranges(
+        project_id=project_id,
+        range_size=settings.WORKFLOW_FANOUT_CHUNKS_PER_TASK,
+        asset_ids=asset_ids
+    )
+
+    await idempotency_manager.update_task_progress(
+        execution_id=workflow_id,
+        values={"phase": "indexing", "total_index_ranges": len(chunk_ranges)}
+    )
+
+    if not chunk_ranges:
+        finalize_workflow.delay([], workflow_id, project_id, index_assets)
+        return {"total_index_ranges": 0}
+
+    result = chord(
+        group(
+            index_chunk_range.s(workflow_id, project_id, after_chunk_id, until_chunk_id, asset_ids)
+            for after_chunk_id, until_chunk_id in chunk_ranges
+        ),
+        finalize_workflow.s(workflow_id, project_id, index_assets)
+    ).on_error(mark_workflow_failed.s(workflow_id, project_id)).apply_async()
+
+    return {
+        "chord_id": result.id,
+        "total_index_ranges": len(chunk_ranges)
+    }
+
+
+@celery_app.task(name="tasks.process_workflow.index_chunk_range", bind=True,
+                autoretry_for=(Exception,),
+                retry_kwargs={'max_retries': 3, 'countdown': 60})
+def index_chunk_range(self, workflow_id: int, project_id: int,
+                      after_chunk_id: int, until_chunk_id: int, asset_ids: list = None):
+
+    # Resumes inside the range on retry, like push_after_process_task
+    checkpoint = {"last_chunk_id": after_chunk_id}
+    try:
+        task_results = run_async(
+            _index_data_content(self, project_id, 0, checkpoint=checkpoint,
+                                until_chunk_id=until_chunk_id, manage_index=False,
+                                asset_ids=asset_ids),
+            task=self
+        )
+    except Exception as e:
+        raise self.retry(exc=e, countdown=60, max_retries=3,
+                         args=(workflow_id, project_id, checkpoint["last_chunk_id"], until_chunk_id,
+                               asset_ids))
+
+    run_async(
+        _report_range_indexed(workflow_id, task_results["inserted_items_count"]),
+        task=self
+    )
+
+    return task_results
+
+
+async def _report_range_indexed(workflow_id: int, inserted_items_count: int):
+    (db_engine, db_client, *_) = await get_setup_utils()
+
+    idempotency_manager = IdempotencyManager(db_client=db_client, db_engine=db_engine)
+    await idempotency_manager.update_task_progress(
+        execution_id=workflow_id,
+        increments={"indexed_ranges": 1, "indexed_chunks": inserted_items_count}
+    )
+
+
+@celery_app.task(name="tasks.process_workflow.finalize_workflow", bind=True,
+                autoretry_for=(Exception,),
+                retry_kwargs={'max_retries': 3, 'countdown': 60})
+def finalize_workflow(self, range_results: list, workflow_id: int, project_id: int,
+                      index_assets: list = None):
+    return run_async(
+        _finalize_workflow(self, workflow_id, project_id, index_assets or []),
+        task=self
+    )
+
+
+async def _finalize_workflow(task_instance, workflow_id: int, project_id: int, index_assets: list):
+
+    (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory, generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+    idempotency_manager = IdempotencyManager(db_client=db_client, db_engine=db_engine)
+
+    nlp_controller = NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=generation_client,
+        embedding_client=embedding_client,
+        template_parser=template_parser
+    )
+    collection_name = nlp_controller.create_collection_name(project_id=project_id)
+
+    await idempotency_manager.update_task_progress(
+        execution_id=workflow_id,
+        values={"phase": "index_build"}
+    )
+
+    def report_index_progress(progress: dict):
+        task_instance.update_state(
+            state='PROGRESS',
+            meta={
+                "signal": ResponseSingnals.VECTORDB_INDEX_BUILD_PROGRESS.value,
+                "workflow_id": workflow_id,
+                "index_build": progress
+            }
+        )
+
+    index_created = await vectordb_client.end_bulk_ingest(
+        collection_name=collection_name,
+        progress_callback=report_index_progress
+    )
+
+    if index_created:
+        logger.info(f"Vector index successfully created for: {collection_name}")
+    else:
+        logger.info(f"Vector index skipped (already exists or threshold not met) for: {collection_name}")
+
+    await _mark_assets_indexed(asset_model=await AssetModel.create_instance(db_client=db_client),
+                               project_id=project_id, index_assets=index_assets)
+
+    await idempotency_manager.update_task_progress(
+        execution_id=workflow_id,
+        values={"phase": "done", "signal": ResponseSingnals.INSERT_INTO_VECTORDB_SUCCESS.value}
+    )
+    task_record = await idempotency_manager.update_task_status(execution_id=workflow_id,
+                                                               status="SUCCESS")
+
+    return task_record.result if task_record else None
+
+
+@celery_app.task(name="tasks.process_workflow.mark_workflow_failed")
+def mark_workflow_failed(request, exc, traceback, workflow_id: int, project_id: int = None):
+    logger.error(f"Fan-out workflow {workflow_id} failed in task {request.id}: {exc}")
+    return run_async(_mark_workflow_failed(workflow_id, str(exc), project_id))
+
+
+async def _mark_workflow_failed(workflow_id: int, error: str, project_id: int = None):
+    (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory, generation_client, embedding_client,
+        vectordb_client, template_parser) = await get_setup_utils()
+
+    idempotency_manager = IdempotencyManager(db_client=db_client, db_engine=db_engine)
+    await idempotency_manager.update_task_status(execution_id=workflow_id, status="FAILURE")
+    await idempotency_manager.update_task_progress(
+        execution_id=workflow_id,
+        values={"phase": "failed", "error": error}
+    )
+
+    if project_id is None:
+        return
+
+    # The workflow dropped the vector index up front, rebuild it over the vectors inserted so far
+    nlp_controller = NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=generation_client,
+        embedding_client=embedding_client,
+        template_parser=template_parser
+    )
+    collection_name = nlp_controller.create_collection_name(project_id=project_id)
+    try:
+        if await vectordb_client.is_collection_exist(collection_name):
+            _ = await vectordb_client.end_bulk_ingest(collection_name=collection_name)
+    except Exception as e:
+        logger.error(f"Can not rebuild the vector index of {collection_name}: {str(e)}")
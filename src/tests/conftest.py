@@ -0,0 +1,17 @@
+import os
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tests import the app modules the same way main.py does, from src/
+sys.path.insert(0, SRC_DIR)
+
+# Celery and task modules read the settings at import, fall back to the documented example values
+try:
+    from dotenv import dotenv_values
+
+    for key, value in dotenv_values(os.path.join(SRC_DIR, ".env.example")).items():
+        if value is not None:
+            os.environ.setdefault(key, value)
+except ImportError:
+    pass
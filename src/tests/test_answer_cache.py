@@ -0,0 +1,96 @@
+"""
+AnswerCache keys: normalized query plus the retrieval params.
+"""
+import asyncio
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("prometheus_client")
+pytest.importorskip("fastapi")
+
+from utils.answer_cache import AnswerCache
+from stores.vectordb.CollectionMetadataCache import CollectionMetadataCache
+
+COLLECTION = "collection_4_1"
+HYBRID = (5, "hybrid", None, None, None)
+VECTOR = (5, "vector", None, None, None)
+RERANKED = (5, "vector", None, None, ("lexical", 5, 30))
+
+
+def test_exact_match_requires_same_params():
+    cache = AnswerCache()
+    cache.set(collection_name=COLLECTION, query="How do I reset?", params=VECTOR, answer="vector answer")
+
+    assert cache.get(collection_name=COLLECTION, query="  how do i RESET ", params=VECTOR)["answer"] == "vector answer"
+    assert cache.get(collection_name=COLLECTION, query="how do i reset", params=HYBRID) is None
+    assert cache.get(collection_name=COLLECTION, query="how do i reset", params=RERANKED) is None
+
+
+def test_semantic_match_stays_within_params():
+    cache = AnswerCache(similarity_threshold=0.9)
+    cache.set(collection_name=COLLECTION, query="reset password", params=VECTOR,
+              vector=[1.0, 0.0, 0.0], answer="vector answer")
+    cache.set(collection_name=COLLECTION, query="reset my password", params=RERANKED,
+              vector=[1.0, 0.05, 0.0], answer="reranked answer")
+
+    assert cache.get_similar(collection_name=COLLECTION, vector=[1.0, 0.01, 0.0],
+                             params=RERANKED)["answer"] == "reranked answer"
+    assert cache.get_similar(collection_name=COLLECTION, vector=[1.0, 0.04, 0.0],
+                             params=VECTOR)["answer"] == "vector answer"
+    assert cache.get_similar(collection_name=COLLECTION, vector=[1.0, 0.0, 0.0], params=HYBRID) is None
+
+
+class FakeGenerations:
+    def __init__(self):
+        self.counters = {}
+
+    async def bump(self, collection_name=None):
+        self.counters[collection_name] = self.counters.get(collection_name, 0) + 1
+
+    async def get(self, collection_name):
+        return (self.counters.get(collection_name, 0), self.counters.get(None, 0))
+
+
+def test_change_in_another_process_drops_answers():
+    generations = FakeGenerations()
+    cache = AnswerCache(generations=generations)
+
+    generation = asyncio.run(cache.check_generation(COLLECTION))
+    cache.set(collection_name=COLLECTION, query="q", params=VECTOR, generation=generation, answer="old")
+    assert asyncio.run(cache.check_generation(COLLECTION)) == generation
+    assert cache.get(collection_name=COLLECTION, query="q", params=VECTOR)["answer"] == "old"
+
+    # A worker re-indexes the collection
+    asyncio.run(generations.bump(COLLECTION))
+    asyncio.run(cache.check_generation(COLLECTION))
+    assert cache.get(collection_name=COLLECTION, query="q", params=VECTOR) is None
+
+    # An answer generated against the previous generation is not cached
+    cache.set(collection_name=COLLECTION, query="q", params=VECTOR, generation=generation, answer="stale")
+    assert cache.get(collection_name=COLLECTION, query="q", params=VECTOR) is None
+
+    # Resetting everything counts for every collection
+    cache.set(collection_name=COLLECTION, query="q", params=VECTOR, answer="new")
+    asyncio.run(generations.bump(None))
+    asyncio.run(cache.check_generation(COLLECTION))
+    assert cache.get(collection_name=COLLECTION, query="q", params=VECTOR) is None
+
+
+def test_only_local_changes_bump_the_generation():
+    generations = FakeGenerations()
+    cache = AnswerCache(generations=generations)
+    collection_cache = CollectionMetadataCache()
+    collection_cache.add_change_listener(generations.bump)
+    collection_cache.add_invalidation_listener(cache.invalidate)
+
+    # A change made by this process
+    cache.set(collection_name=COLLECTION, query="q", params=VECTOR, answer="old")
+    asyncio.run(collection_cache.changed(COLLECTION))
+    assert generations.counters == {COLLECTION: 1}
+    assert cache.get(collection_name=COLLECTION, query="q", params=VECTOR) is None
+
+    # The same change relayed by LISTEN/NOTIFY from another process is not counted again
+    cache.set(collection_name=COLLECTION, query="q", params=VECTOR, answer="new")
+    collection_cache.invalidate(COLLECTION)
+    assert generations.counters == {COLLECTION: 1}
+    assert cache.get(collection_name=COLLECTION, query="q", params=VECTOR) is None
@@ -0,0 +1,120 @@
+"""
+CachedEmbeddingClient tiers: query LRU, persistent store, provider.
+"""
+import asyncio
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("prometheus_client")
+pytest.importorskip("fastapi")
+
+from stores.llm.EmbeddingCache import CachedEmbeddingClient, SQLiteEmbeddingCacheStore
+from stores.llm.LLMEnums import DocumentTypeEnums
+
+QUERY = DocumentTypeEnums.QUERY.value
+DOCUMENT = DocumentTypeEnums.DOCUMENT.value
+
+
+class FakeEmbeddingClient:
+    embedding_model_id = "fake-embedding"
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self.calls = []
+
+    def get_embedding_input(self, text: str) -> str:
+        return text
+
+    def vector(self, text: str) -> list:
+        return [float(len(text))] + [0.5] * (self.size - 1)
+
+    async def aembed_text(self, text, document_type: str = None):
+        self.calls.append(list(text))
+        return [self.vector(t) for t in text]
+
+    def embed_text(self, text, document_type: str = None):
+        self.calls.append(list(text))
+        return [self.vector(t) for t in text]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteEmbeddingCacheStore(db_path=str(tmp_path / "embedding_cache.db"))
+
+
+def test_query_tiers_lru_then_store_then_provider(store):
+    provider = FakeEmbeddingClient()
+    client = CachedEmbeddingClient(embedding_client=provider, store=store)
+
+    first = asyncio.run(client.aembed_text(["hello", "world"], document_type=QUERY))
+    assert provider.calls == [["hello", "world"]]
+    assert first == [provider.vector("hello"), provider.vector("world")]
+
+    # Served from the LRU
+    assert asyncio.run(client.aembed_text("hello", document_type=QUERY)) == [provider.vector("hello")]
+    assert len(provider.calls) == 1
+
+    # A fresh process shares only the store
+    fresh_provider = FakeEmbeddingClient()
+    fresh = CachedEmbeddingClient(embedding_client=fresh_provider, store=store)
+    assert asyncio.run(fresh.aembed_text(["world", "new"], document_type=QUERY)) == [
+        provider.vector("world"), provider.vector("new")
+    ]
+    assert fresh_provider.calls == [["new"]]
+
+
+def test_documents_skip_the_lru(store):
+    provider = FakeEmbeddingClient()
+    client = CachedEmbeddingClient(embedding_client=provider, store=store)
+
+    asyncio.run(client.aembed_text(["chunk one", "chunk two"], document_type=DOCUMENT))
+    assert len(client.lru) == 0
+
+    # Still a store hit, no second provider call
+    asyncio.run(client.aembed_text(["chunk one"], document_type=DOCUMENT))
+    assert len(provider.calls) == 1
+
+
+def test_lru_is_bounded_in_bytes():
+    provider = FakeEmbeddingClient(size=4)
+    # Room for two float32 vectors of 4 dimensions
+    client = CachedEmbeddingClient(embedding_client=provider, lru_max_bytes=32)
+
+    for text in ["a", "bb", "ccc"]:
+        client.embed_text(text, document_type=QUERY)
+
+    assert len(client.lru) == 2
+    assert client.lru_bytes == 32
+    assert [key[2] for key in client.lru] == [client.get_cache_key(t, QUERY)[2] for t in ["bb", "ccc"]]
+
+    client.embed_text("a", document_type=QUERY)
+    assert len(provider.calls) == 4
+
+
+def test_store_cleanup_drops_other_models_and_expired(store):
+    asyncio.run(store.put_many("fake-embedding", QUERY, {"kept": [1.0, 2.0]}))
+    asyncio.run(store.put_many("old-model", QUERY, {"stale": [1.0, 2.0]}))
+    store.connection.execute("UPDATE embedding_cache SET created_at = 0 WHERE text_hash = 'kept'")
+    asyncio.run(store.put_many("fake-embedding", QUERY, {"recent": [3.0, 4.0]}))
+
+    assert asyncio.run(store.delete_expired(model_id="fake-embedding", max_age_days=30)) == 2
+    assert list(asyncio.run(store.get_many("fake-embedding", QUERY, ["kept", "recent"]))) == ["recent"]
+
+
+@pytest.mark.parametrize("provider_name", ["openai", "cohere"])
+def test_providers_bound_embedding_inputs_alike(provider_name):
+    pytest.importorskip(provider_name)
+    if provider_name == "openai":
+        from stores.llm.providers.OpenAIProvider import OpenAIProvider
+        provider = OpenAIProvider(api_key="test", default_input_max_characters=10)
+    else:
+        from stores.llm.providers.CohereProvider import CohereProvider
+        provider = CohereProvider(api_key="test", default_input_max_characters=10)
+
+    assert provider.get_embedding_input("short") == "short"
+    # The cache key hashes the same bounded text that is sent
+    assert provider.get_embedding_input("a long question " * 100) == "a long que"
+
+    if provider_name == "openai":
+        provider.embedding_model_id = "text-embedding-3-small"
+        assert provider.build_embedding_request("a long question " * 100)["input"] == ["a long que"]
@@ -0,0 +1,87 @@
+"""
+Indexing checkpoints: the pipeline writes pages in page order and advances
+checkpoint["last_chunk_id"] with them, a keyset read after it resumes with the rest.
+"""
+import asyncio
+import pytest
+
+pytest.importorskip("celery")
+pytest.importorskip("langchain_community")
+
+from tasks.data_indexing import _run_indexing_pipeline
+
+CHUNK_IDS = [2, 3, 5, 8, 9, 11, 12, 15, 20, 21]
+
+
+class FakeChunk:
+    def __init__(self, chunk_id: int):
+        self.chunk_id = chunk_id
+
+
+async def iter_chunks(after_chunk_id: int = 0, page_size: int = 2):
+    # Same keyset walk as ChunkModel.iter_project_chunks
+    last_chunk_id = after_chunk_id
+    while True:
+        page = [FakeChunk(chunk_id) for chunk_id in CHUNK_IDS if chunk_id > last_chunk_id][:page_size]
+        if not page:
+            return
+        yield page
+        last_chunk_id = page[-1].chunk_id
+
+
+def run_pipeline(checkpoint: dict, written: list, fail_on: int = None, slow_on: int = None,
+                 concurrency: int = 1):
+    async def embed_page(page_chunks):
+        if slow_on in [chunk.chunk_id for chunk in page_chunks]:
+            await asyncio.sleep(0.05)
+        return [[0.0] for _ in page_chunks]
+
+    async def write_page(page_chunks, vectors):
+        chunk_ids = [chunk.chunk_id for chunk in page_chunks]
+        if fail_on in chunk_ids:
+            raise RuntimeError("vector DB unavailable")
+        written.extend(chunk_ids)
+
+    return asyncio.run(_run_indexing_pipeline(
+        chunk_pages=iter_chunks(after_chunk_id=checkpoint["last_chunk_id"]),
+        embed_page=embed_page, write_page=write_page,
+        checkpoint=checkpoint, concurrency=concurrency
+    ))
+
+
+def test_resume_after_failure_indexes_only_the_rest():
+    checkpoint = {"last_chunk_id": 0}
+    written = []
+    with pytest.raises(RuntimeError):
+        run_pipeline(checkpoint, written, fail_on=12)
+
+    assert written == [2, 3, 5, 8, 9, 11]
+    assert checkpoint["last_chunk_id"] == 11
+
+    resumed = []
+    assert run_pipeline(checkpoint, resumed) == 4
+    assert resumed == [12, 15, 20, 21]
+    assert checkpoint["last_chunk_id"] == 21
+
+
+def test_pages_are_written_in_order_while_embedded_out_of_order():
+    # Later pages finish embedding first, they wait for the first page
+    checkpoint = {"last_chunk_id": 0}
+    written = []
+    assert run_pipeline(checkpoint, written, slow_on=2, concurrency=4) == len(CHUNK_IDS)
+    assert written == CHUNK_IDS
+    assert checkpoint["last_chunk_id"] == 21
+
+
+def test_retry_after_a_middle_page_fails_writes_every_chunk_once():
+    # Pages after the failed one are already embedded, none of them may be written before it
+    checkpoint = {"last_chunk_id": 0}
+    written = []
+    with pytest.raises(RuntimeError):
+        run_pipeline(checkpoint, written, fail_on=12, slow_on=2, concurrency=4)
+
+    assert written == [2, 3, 5, 8, 9, 11]
+    assert checkpoint["last_chunk_id"] == 11
+
+    run_pipeline(checkpoint, written, concurrency=4)
+    assert written == CHUNK_IDS
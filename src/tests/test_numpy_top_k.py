@@ -0,0 +1,70 @@
+"""
+NumpyCollection.top_k: block-wise exact search against a brute force sort.
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from stores.vectordb.providers.NumpyVectorProvider import NumpyCollection
+
+
+@pytest.fixture
+def collection(tmp_path):
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((50, 8), dtype=np.float32)
+    collection = NumpyCollection.create(str(tmp_path / "collection"), dim=8, distance_method="dot")
+    collection.append(record_ids=list(range(50)), texts=[str(row) for row in range(50)],
+                      vectors=vectors, metadata=[{"row": row} for row in range(50)])
+    return collection, vectors, rng.standard_normal((3, 8), dtype=np.float32)
+
+
+def brute_force(queries: np.ndarray, vectors: np.ndarray, k: int, mask: np.ndarray = None) -> np.ndarray:
+    scores = queries @ vectors.T
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+@pytest.mark.parametrize("block_rows", [7, 16, 1000])
+def test_top_k_matches_brute_force(collection, block_rows):
+    collection, vectors, queries = collection
+
+    rows, scores = collection.top_k(queries, k=5, block_rows=block_rows)
+
+    assert rows.tolist() == brute_force(queries, vectors, k=5).tolist()
+    assert np.allclose(scores, np.take_along_axis(queries @ vectors.T, rows, axis=1))
+
+
+@pytest.mark.parametrize("block_rows", [7, 1000])
+def test_top_k_only_returns_masked_rows(collection, block_rows):
+    collection, vectors, queries = collection
+    mask = np.zeros(50, dtype=bool)
+    mask[[3, 11, 12, 30, 44, 49]] = True
+
+    rows, _ = collection.top_k(queries, k=4, block_rows=block_rows, mask=mask)
+
+    assert rows.tolist() == brute_force(queries, vectors, k=4, mask=mask).tolist()
+    assert set(rows.ravel()) <= {3, 11, 12, 30, 44, 49}
+
+
+def test_top_k_is_capped_by_the_mask(collection):
+    collection, _, queries = collection
+    mask = np.zeros(50, dtype=bool)
+    mask[[5, 40]] = True
+
+    rows, scores = collection.top_k(queries, k=10, block_rows=16, mask=mask)
+    assert rows.shape == (3, 2)
+    assert np.isfinite(scores).all()
+    assert all(set(query_rows) == {5, 40} for query_rows in rows.tolist())
+
+    rows, _ = collection.top_k(queries, k=10, block_rows=16, mask=np.zeros(50, dtype=bool))
+    assert rows.shape == (3, 0)
+
+
+def test_mask_shorter_than_collection_ignores_newer_rows(collection):
+    # A mask built before a concurrent append does not cover the new rows
+    collection, vectors, queries = collection
+
+    rows, _ = collection.top_k(queries, k=5, block_rows=16, mask=np.ones(20, dtype=bool))
+    assert rows.tolist() == brute_force(queries, vectors[:20], k=5).tolist()
@@ -0,0 +1,82 @@
+"""
+search_many: one result list per query vector, in the order of the queries,
+each the same as a search_by_vector call for that vector.
+"""
+import asyncio
+import numpy as np
+import pytest
+
+from stores.vectordb.VectorSearchFilter import VectorSearchFilter
+
+DIM = 8
+
+
+def make_provider(backend: str, path: str):
+    if backend == "qdrant":
+        pytest.importorskip("qdrant_client")
+        from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+        return QdrantDBProvider(db_client=path, distance_method="cosine")
+
+    pytest.importorskip("sqlalchemy")
+    from stores.vectordb.providers.NumpyVectorProvider import NumpyVectorProvider
+    return NumpyVectorProvider(db_client=path, distance_method="cosine")
+
+
+@pytest.mark.parametrize("backend", ["numpy", "qdrant"])
+@pytest.mark.parametrize("search_filter", [None, VectorSearchFilter(metadata={"parity": "even"})])
+def test_search_many_keeps_query_order(tmp_path, backend, search_filter):
+    provider = make_provider(backend, str(tmp_path / backend))
+    rng = np.random.default_rng(11)
+    vectors = rng.standard_normal((40, DIM)).astype(np.float32)
+    # Near copies of scattered records, so every query has a different top hit
+    queries = vectors[[17, 2, 33, 2, 8]] + 0.01 * rng.standard_normal((5, DIM)).astype(np.float32)
+
+    async def run():
+        await provider.connect()
+        try:
+            await provider.create_collection(collection_name="batch", embedding_size=DIM)
+            await provider.insert_many(collection_name="batch",
+                                       texts=[str(row) for row in range(40)],
+                                       vectors=vectors.tolist(),
+                                       metadata=[{"parity": "even" if row % 2 == 0 else "odd"}
+                                                 for row in range(40)],
+                                       record_ids=list(range(1, 41)))
+            batched = await provider.search_many(collection_name="batch", vectors=queries.tolist(),
+                                                 limit=3, search_filter=search_filter)
+            sequential = [
+                await provider.search_by_vector(collection_name="batch", vector=query, limit=3,
+                                                search_filter=search_filter)
+                for query in queries.tolist()
+            ]
+            return batched, sequential
+        finally:
+            await provider.disconnect()
+
+    batched, sequential = asyncio.run(run())
+
+    assert len(batched) == len(queries)
+    assert [[doc.text for doc in docs] for docs in batched] == \
+        [[doc.text for doc in docs] for docs in sequential]
+    for docs, expected in zip(batched, sequential):
+        assert [doc.score for doc in docs] == pytest.approx([doc.score for doc in expected], abs=1e-5)
+
+    if search_filter is None:
+        assert [docs[0].text for docs in batched] == ["17", "2", "33", "2", "8"]
+    else:
+        assert all(int(doc.text) % 2 == 0 for docs in batched for doc in docs)
+        assert batched[1][0].text == "2" and batched[3][0].text == "2"
+
+
+@pytest.mark.parametrize("backend", ["numpy", "qdrant"])
+def test_search_many_empty_batch_and_missing_collection(tmp_path, backend):
+    provider = make_provider(backend, str(tmp_path / backend))
+
+    async def run():
+        await provider.connect()
+        try:
+            return (await provider.search_many(collection_name="missing", vectors=[[0.0] * DIM] * 2, limit=3),
+                    await provider.search_many(collection_name="missing", vectors=[], limit=3))
+        finally:
+            await provider.disconnect()
+
+    assert asyncio.run(run()) == ([[], []], [])
@@ -0,0 +1,36 @@
+"""
+TextSplitter: only oversized sentences are cut, the overlap is whole sentences.
+"""
+import pytest
+
+pytest.importorskip("langchain_community")
+pytest.importorskip("langchain_text_splitters")
+
+from controllers.TextSplitter import TextSplitter
+
+
+def test_sentences_are_kept_whole_and_overlap_is_whole_sentences():
+    splitter = TextSplitter(chunk_size=60, chunk_overlap=25)
+    text = "First sentence here. Second one is here. Third follows now. Fourth closes it."
+
+    chunks = [chunk for chunk, _ in splitter.split_text(text)]
+
+    assert chunks == [
+        "First sentence here. Second one is here. Third follows now.",
+        "Third follows now. Fourth closes it.",
+    ]
+
+
+def test_only_sentences_longer_than_chunk_size_are_cut():
+    splitter = TextSplitter(chunk_size=40, chunk_overlap=15)
+    long_sentence = " ".join(["word"] * 30) + "."
+    text = f"Short one. Another short. {long_sentence} Tail sentence."
+
+    chunks = [chunk for chunk, _ in splitter.split_text(text)]
+
+    assert chunks[0] == "Short one. Another short."
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    # Pieces of the long sentence fill the chunk size, not the overlap
+    assert chunks[1] == " ".join(["word"] * 8)
+    assert "".join(chunks[1:-1]).replace(" ", "") == long_sentence.replace(" ", "")
+    assert chunks[-1] == "Tail sentence."
@@ -0,0 +1,160 @@
+from utils.metrics import ANSWER_CACHE_LOOKUPS
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+import logging
+import re
+import time
+
+
+class AnswerCache:
+    """
+    In-process cache of RAG answers, scoped per vector DB collection.
+
+    Answers are keyed by the normalized query and `params`, a hashable tuple
+    of whatever else shapes the answer (limit, search mode, index parameters,
+    reranker). A lookup first tries the exact key, then the most similar
+    cached query embedding above `similarity_threshold` among entries with the
+    same params. Entries expire after
+    `ttl` seconds and each collection keeps at most `max_entries` answers,
+    evicting the least recently used. Hook `invalidate` to the vector DB
+    collection cache so a re-index or reset drops the collection's answers.
+    Changes made by other processes are caught by `check_generation` when
+    `generations` (shared per-collection change counters) is given.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 1000,
+                 similarity_threshold: float = 0.95, generations=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.generations = generations
+
+        self.collections: Dict[str, OrderedDict] = {}
+        self.matrices: Dict[str, tuple] = {}
+        self.seen_generations: Dict[str, tuple] = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        query = re.sub(r"\s+", " ", query.casefold()).strip()
+        return query.rstrip("?!.؟ ")
+
+    @staticmethod
+    def normalize_vector(vector: list) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def is_expired(self, entry: dict) -> bool:
+        return bool(self.ttl) and time.monotonic() - entry["cached_at"] > self.ttl
+
+    def get_entries(self, collection_name: str) -> OrderedDict:
+        entries = self.collections.get(collection_name)
+        if entries is None:
+            return OrderedDict()
+
+        expired = [key for key, entry in entries.items() if self.is_expired(entry)]
+        for key in expired:
+            del entries[key]
+        if expired:
+            self.matrices.pop(collection_name, None)
+
+        return entries
+
+    def get_matrix(self, collection_name: str, entries: OrderedDict):
+        # Stacked query vectors, rebuilt only after the collection's entries change
+        matrix = self.matrices.get(collection_name)
+        if matrix is None:
+            keys = [key for key, entry in entries.items() if entry["vector"] is not None]
+            vectors = np.stack([entries[key]["vector"] for key in keys]) if keys else None
+            matrix = (keys, vectors)
+            self.matrices[collection_name] = matrix
+        return matrix
+
+    async def check_generation(self, collection_name: str) -> Optional[tuple]:
+        """
+        Drop the collection's answers if it changed in any process since they
+        were cached. Returns the current generation, to pass to `set`, or None
+        without shared generations.
+        """
+        if self.generations is None:
+            return None
+
+        try:
+            generation = await self.generations.get(collection_name)
+        except Exception as e:
+            self.logger.warning(f"Can not read collection generation, relying on answer cache TTL: {str(e)}")
+            return None
+
+        if self.seen_generations.get(collection_name) != generation:
+            self.invalidate(collection_name=collection_name)
+            self.seen_generations[collection_name] = generation
+
+        return generation
+
+    def get(self, collection_name: str, query: str, params: tuple) -> Optional[dict]:
+        """Exact match on the normalized query and params."""
+        entries = self.get_entries(collection_name)
+        key = (self.normalize_query(query), params)
+
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        entries.move_to_end(key)
+        ANSWER_CACHE_LOOKUPS.labels(result="exact").inc()
+        return entry
+
+    def get_similar(self, collection_name: str, vector: list, params: tuple) -> Optional[dict]:
+        """Closest cached query with the same params by cosine similarity, if above the threshold."""
+        entries = self.get_entries(collection_name)
+        keys, vectors = self.get_matrix(collection_name, entries)
+
+        if vectors is not None:
+            query_vector = self.normalize_vector(vector)
+            if query_vector.shape[0] == vectors.shape[1]:
+                scores = vectors @ query_vector
+                for idx in np.argsort(-scores):
+                    if scores[idx] < self.similarity_threshold:
+                        break
+                    if keys[idx][1] == params:
+                        entries.move_to_end(keys[idx])
+                        ANSWER_CACHE_LOOKUPS.labels(result="semantic").inc()
+                        return entries[keys[idx]]
+
+        ANSWER_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def set(self, collection_name: str, query: str, params: tuple, vector: list = None,
+            generation: tuple = None, **values):
+        if generation is not None and generation != self.seen_generations.get(collection_name):
+            # The collection changed while this answer was being generated
+            return
+
+        entries = self.collections.setdefault(collection_name, OrderedDict())
+        key = (self.normalize_query(query), params)
+
+        entries[key] = {
+            **values,
+            "vector": self.normalize_vector(vector) if vector is not None else None,
+            "cached_at": time.monotonic()
+        }
+        entries.move_to_end(key)
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+        self.matrices.pop(collection_name, None)
+
+    def invalidate(self, collection_name: Optional[str] = None):
+        """Drop one collection (or everything when collection_name is None)."""
+        if collection_name is None:
+            self.collections.clear()
+            self.matrices.clear()
+        else:
+            self.collections.pop(collection_name, None)
+            self.matrices.pop(collection_name, None)
+
+        self.logger.debug(f"Answer cache invalidated for: {collection_name or 'all collections'}")
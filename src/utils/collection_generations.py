@@ -0,0 +1,46 @@
+from typing import Optional
+import logging
+import redis.asyncio as aioredis  # pyright: ignore[reportMissingImports]
+
+
+class RedisCollectionGenerations:
+    """
+    Per-collection change counters in Redis, shared by the API and the workers.
+
+    Every process bumps a collection's counter when it changes the collection
+    itself (hook `bump` as a change listener of the vector DB collection cache,
+    so changes relayed from other processes are not counted twice). Answer
+    caches read the counter on lookup and drop their answers once it moved, so
+    a re-index in a worker reaches every API process whatever the backend.
+    """
+
+    KEY_PREFIX = "answer_cache:generation:"
+    ALL_COLLECTIONS = "*"
+
+    def __init__(self, url: str, timeout: float = 0.5):
+        self.async_client = aioredis.Redis.from_url(url, socket_timeout=timeout,
+                                                    socket_connect_timeout=timeout)
+        self.logger = logging.getLogger(__name__)
+
+    def get_key(self, collection_name: Optional[str]) -> str:
+        return f"{self.KEY_PREFIX}{collection_name or self.ALL_COLLECTIONS}"
+
+    async def bump(self, collection_name: Optional[str] = None):
+        """Mark one collection (or every collection when collection_name is None) as changed."""
+        await self.async_client.incr(self.get_key(collection_name))
+
+    async def get(self, collection_name: str) -> tuple:
+        values = await self.async_client.mget(self.get_key(collection_name), self.get_key(None))
+        return tuple(int(value or 0) for value in values)
+
+    async def close(self):
+        await self.async_client.aclose()
+
+
+def get_collection_generations_url(settings) -> Optional[str]:
+    """ANSWER_CACHE_REDIS_URL, else the Celery result backend when that is Redis."""
+    if settings.ANSWER_CACHE_REDIS_URL:
+        return settings.ANSWER_CACHE_REDIS_URL
+    if settings.CELERY_RESULT_BACKEND and settings.CELERY_RESULT_BACKEND.startswith(("redis://", "rediss://")):
+        return settings.CELERY_RESULT_BACKEND
+    return None
@@ -3,6 +3,7 @@ import json
 from datetime import datetime, timedelta, timezone
 from models.db_schemas.minirag.schemes.celery_task_execution import CeleryTaskExecution
 from sqlalchemy import select, delete
+from sqlalchemy import text as sql_text
 
 class IdempotencyManager:
     
@@ -67,6 +68,62 @@ class IdempotencyManager:
         finally:
             await session.close()
 
+    async def get_task_record_by_celery_id(self, task_name: str, celery_task_id: str) -> CeleryTaskExecution:
+        session = self.db_client()
+        try:
+            result = await session.execute(
+                select(CeleryTaskExecution).where(
+                    CeleryTaskExecution.task_name == task_name,
+                    CeleryTaskExecution.celery_task_id == celery_task_id
+                ).order_by(CeleryTaskExecution.created_at.desc()).limit(1)
+            )
+            return result.scalar_one_or_none()
+        finally:
+            await session.close()
+
+    async def update_task_progress(self, execution_id: int, values: dict = None,
+                                   increments: dict = None, append: dict = None):
+        """
+        Atomically merge progress into the task result JSONB in a single UPDATE,
+        so concurrent subtasks of one workflow never overwrite each other.
+        values: keys to set, increments: integer keys to add to,
+        append: list keys to extend.
+        """
+        expression = "COALESCE(result, '{}'::jsonb)"
+        params = {"execution_id": execution_id}
+
+        for idx, (key, value) in enumerate((increments or {}).items()):
+            expression = (f"jsonb_set({expression}, ARRAY[:inc_key_{idx}], "
+                          f"to_jsonb(COALESCE((result->>:inc_key_{idx})::bigint, 0) + :inc_val_{idx}))")
+            params[f"inc_key_{idx}"] = key
+            params[f"inc_val_{idx}"] = value
+
+        for idx, (key, items) in enumerate((append or {}).items()):
+            expression = (f"jsonb_set({expression}, ARRAY[:app_key_{idx}], "
+                          f"COALESCE(result->:app_key_{idx}, '[]'::jsonb) || CAST(:app_val_{idx} AS jsonb))")
+            params[f"app_key_{idx}"] = key
+            params[f"app_val_{idx}"] = json.dumps(list(items), default=str)
+
+        if values:
+            expression = f"{expression} || CAST(:values AS jsonb)"
+            params["values"] = json.dumps(values, default=str)
+
+        session = self.db_client()
+        try:
+            result = await session.execute(
+                sql_text(f"""
+                    UPDATE celery_task_executions
+                    SET result = {expression}, updated_at = now()
+                    WHERE execution_id = :execution_id
+                    RETURNING result
+                """),
+                params
+            )
+            await session.commit()
+            return result.scalar_one_or_none()
+        finally:
+            await session.close()
+
     async def get_existing_task(self, task_name: str, 
                                 celery_task_id: str,
                                 task_args: dict) -> CeleryTaskExecution:
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
@@ -6,6 +6,19 @@ import time
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
 
+EMBEDDING_CACHE_LOOKUPS = Counter('embedding_cache_lookups_total', 'Embedding cache lookups', ['tier', 'result'])
+EMBEDDING_CACHE_HIT_RATIO = Gauge('embedding_cache_hit_ratio', 'Share of embedding lookups served from the cache')
+
+ANSWER_CACHE_LOOKUPS = Counter('answer_cache_lookups_total', 'RAG answer cache lookups', ['result'])
+
+LLM_TIME_TO_FIRST_TOKEN = Histogram('llm_time_to_first_token_seconds', 'Time from a streaming answer request to its first token',
+                                    ['cache_hit'], buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10))
+
+RERANK_LATENCY = Histogram('rerank_duration_seconds', 'Time spent reranking retrieved candidates', ['reranker'],
+                           buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+RAG_PROMPT_TOKENS = Histogram('rag_prompt_tokens', 'Tokens of the generation prompt of RAG answers', ['reranker'],
+                              buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000))
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         if request.url.path == "/TrhBVe_m5gg2002_E5VVqS":